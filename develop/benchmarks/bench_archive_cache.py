@@ -0,0 +1,28 @@
+import argparse
+from datetime import datetime, timedelta
+
+from benchmarks.bench_storage import make_logger, fill, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Repeated archive queries with and without the decoded-archive cache")
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--step', type=float, default=10.0)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    start = datetime(2025, 6, 1)
+    window = (start + timedelta(days=args.days - 4), start + timedelta(days=args.days - 1))
+    for cache_mb in (0, 64):
+        logger = make_logger('csv', rotate_after_lines=int(86400 / args.step) * 4, archive_cache_mb=cache_mb)
+        fill(logger, start, args.days, args.step)
+        times = []
+        for _ in range(args.repeats):
+            elapsed, rows = timed(lambda: sum(1 for _ in logger.read_logs(*window, 'temp_1')))
+            times.append(elapsed)
+        runs = '  '.join(f"{t * 1000:7.1f} ms" for t in times)
+        print(f"cache {cache_mb:3d} MiB  {rows:,} rows  {runs}  stats: {logger.stats()['archive_cache']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import logging
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_server_connections import wait_for_port
+from komunikacja_sieciowa.serwer.server import NetworkServer, _Session
+from komunikacja_sieciowa.siec.client import NetworkClient
+from komunikacja_sieciowa.siec.framing import LengthPrefixedFramer, LineFramer
+from symulacja_czujnikow.reading import Reading
+
+
+class NullServer(NetworkServer):
+    # Sam koszt dekodowania - przetwarzanie odczytów pominięte
+    def _process_data(self, data):
+        pass
+
+    def _process_batch(self, batch):
+        pass
+
+
+def decode_cost(readings, binary: bool) -> float:
+    # Strumień bajtów z prawdziwego klienta, dekodowany przez serwer bez sieci
+    client = NetworkClient('127.0.0.1', 1, window=len(readings), batch_size=64, binary=binary)
+    client.features = client.offered
+    stream = b''.join(client._enqueue(i, readings[i:i + 64]) for i in range(0, len(readings), 64))
+    server, session = NullServer(port=0), _Session()
+    session.features = client.features
+    framer = LengthPrefixedFramer(max_size=1 << 30) if binary else LineFramer(max_size=1 << 30)
+    start = time.perf_counter()
+    framer.feed(stream)
+    server._respond(session, framer.messages())
+    return (time.perf_counter() - start) / len(readings), len(stream) / len(readings)
+
+
+def run(port: int, readings, **options) -> float:
+    client = NetworkClient('127.0.0.1', port, **options)
+    client.connect()
+    start = time.perf_counter()
+    for reading in readings:
+        client.send(reading)
+    client.flush()
+    elapsed = time.perf_counter() - start
+    stats = client.stats()
+    client.close()
+    assert stats['failed'] == 0, stats
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NetworkClient: stop-and-wait vs pipelined vs batched frames")
+    parser.add_argument('--readings', type=int, default=20000)
+    parser.add_argument('--port', type=int, default=50700)
+    args = parser.parse_args()
+    # Logi INFO klienta (każdy ACK w trybie stop-and-wait) zafałszowałyby pomiar
+    logging.disable(logging.INFO)
+
+    readings = [Reading('press_1', 1013.25 + i % 100 / 10, 'hPa', 1749551400.0 + i) for i in range(args.readings)]
+    variants = [
+        ('stop-and-wait', {}),
+        ('pipelined, window 64', {'window': 64}),
+        ('batched 32, window 256', {'window': 256, 'batch_size': 32}),
+        ('batched 128, window 1024', {'window': 1024, 'batch_size': 128}),
+        ('binary 32, window 256', {'window': 256, 'batch_size': 32, 'binary': True}),
+    ]
+    for binary in (False, True):
+        seconds, size = decode_cost(readings, binary)
+        name = 'binary frames' if binary else 'JSON batch frames'
+        print(f"server decode, {name:18s} {seconds * 1e6:6.2f} us/reading, {size:6.1f} bytes/reading")
+    for mode in ('selectors', 'threads'):
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'komunikacja_sieciowa.serwer.server', '--port', str(args.port), '--mode', mode],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(args.port)
+            for name, options in variants:
+                elapsed = run(args.port, readings, **options)
+                print(f"{mode:9s} {name:25s} {len(readings) / elapsed:9,.0f} readings/s")
+        finally:
+            server.terminate()
+            server.wait()
+        args.port += 1
+
+
+if __name__ == "__main__":
+    main()
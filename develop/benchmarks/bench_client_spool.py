@@ -0,0 +1,60 @@
+import argparse
+import logging
+import os
+import socket
+import tempfile
+import time
+
+import numpy as np
+
+from komunikacja_sieciowa.siec.client import NetworkClient
+from symulacja_czujnikow.reading import Reading
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def latencies(client: NetworkClient, n: int) -> np.ndarray:
+    result = np.empty(n)
+    for i in range(n):
+        reading = Reading('press_1', 1013.25, 'hPa', 1749551400.0 + i)
+        start = time.perf_counter()
+        client.send(reading)
+        result[i] = time.perf_counter() - start
+    return result
+
+
+def report(name: str, samples: np.ndarray, client: NetworkClient) -> None:
+    stats = client.stats()
+    print(f"{name:32s} p50 {np.percentile(samples, 50) * 1e6:9.1f} us  p99 {np.percentile(samples, 99) * 1e6:9.1f} us  "
+          f"max {samples.max() * 1e6:11.1f} us  queued {stats['queue_depth']:,} spooled {stats['spooled']:,} "
+          f"dropped {stats['dropped']:,} failed {stats['failed']:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NetworkClient.send latency while the server is down")
+    parser.add_argument('--readings', type=int, default=50000)
+    parser.add_argument('--blocking-readings', type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    port = free_port()
+    client = NetworkClient('127.0.0.1', port)
+    report('stop-and-wait (connect retries)', latencies(client, args.blocking_readings), client)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        client = NetworkClient('127.0.0.1', port, window=256, batch_size=32, background=True, queue_size=10000,
+                               spool_path=os.path.join(temp_dir, 'bench.spool'))
+        report('background, queue 10k + spool', latencies(client, args.readings), client)
+        client.close()
+
+    client = NetworkClient('127.0.0.1', port, window=256, batch_size=32, background=True, queue_size=10000)
+    report('background, queue 10k, no spool', latencies(client, args.readings), client)
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import logging
+import threading
+import time
+
+from komunikacja_sieciowa.serwer.server import NetworkServer
+from komunikacja_sieciowa.siec.client import NetworkClient
+from komunikacja_sieciowa.siec.datagram import DatagramClient
+from symulacja_czujnikow.reading import Reading
+
+
+class NullServer(NetworkServer):
+    def _process_batch(self, batch, block=True):
+        return True
+
+
+def readings(count: int, sensors: int):
+    return [Reading(f'temp_{i % sensors}', 20.0 + (i % 100) / 10, 'C', 1749551400.0 + i) for i in range(count)]
+
+
+def measure(server: NetworkServer, data, make_client):
+    client = make_client(server.port)
+    client.connect()
+    start = time.perf_counter()
+    for reading in data:
+        client.send(reading)
+    client.flush()
+    elapsed = time.perf_counter() - start
+    stats = client.stats()
+    client.close()
+    return len(data) / elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Readings/s: UDP datagrams vs TCP pipelined vs stop-and-wait")
+    parser.add_argument('--readings', type=int, default=200000)
+    parser.add_argument('--sensors', type=int, default=8)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    server = NullServer(port=0, udp=True)
+    thread = threading.Thread(target=server.start, daemon=True)
+    thread.start()
+    while not server.port:
+        time.sleep(0.01)
+    time.sleep(0.1)
+
+    data = readings(args.readings, args.sensors)
+    variants = [
+        ('TCP stop-and-wait', lambda port: NetworkClient('127.0.0.1', port), args.readings // 50),
+        ('TCP pipelined binary', lambda port: NetworkClient('127.0.0.1', port, window=64, batch_size=256,
+                                                            binary=True), args.readings),
+        ('UDP datagrams', lambda port: DatagramClient('127.0.0.1', port), args.readings),
+    ]
+    for name, make_client, count in variants:
+        rate, stats = measure(server, data[:count], make_client)
+        extra = f"  {stats['readings_per_datagram']:.0f} readings/datagram" if 'readings_per_datagram' in stats else ''
+        print(f"{name:22s} {rate:10,.0f} readings/s{extra}")
+    time.sleep(0.5)
+    udp = server.stats()['udp']
+    print(f"server: {udp['datagrams']} datagrams, {udp['lost']} lost ({udp['loss_ratio']:.2%}), "
+          f"{udp['reordered']} reordered")
+    server.stop()
+    thread.join()
+
+
+if __name__ == "__main__":
+    main()
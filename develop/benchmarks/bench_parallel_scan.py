@@ -0,0 +1,36 @@
+import argparse
+import os
+from datetime import datetime, timedelta
+
+from benchmarks.bench_storage import make_logger, fill, timed
+
+
+def count(rows) -> int:
+    return sum(1 for _ in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive scan: sequential read_logs vs process pool")
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--step', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    start = datetime(2025, 6, 1)
+    end = start + timedelta(days=args.days)
+    # Jeden plik na dzień, po rotacji skompresowany do archive/*.zip
+    logger = make_logger('csv', rotate_after_lines=int(86400 / args.step) * 4)
+    fill(logger, start, args.days, args.step)
+
+    print(f"cores: {os.cpu_count()}")
+    elapsed, rows = timed(lambda: count(logger.read_logs(start, end, 'temp_1')))
+    print(f"sequential          {rows:,} rows in {elapsed:6.2f}s")
+    for workers in args.workers:
+        for ordered in (True, False):
+            elapsed, rows = timed(lambda: count(logger.read_logs_parallel(start, end, 'temp_1', workers, ordered)))
+            mode = 'ordered' if ordered else 'unordered'
+            print(f"{workers} workers {mode:9s} {rows:,} rows in {elapsed:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
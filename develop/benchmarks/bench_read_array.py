@@ -0,0 +1,42 @@
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from benchmarks.bench_storage import make_logger, fill, timed
+
+
+def via_generator(logger, start, end, sensor_id):
+    # Dotychczasowa ścieżka: słowniki z read_logs zamieniane na tablice przez wywołującego
+    timestamps, values = [], []
+    for row in logger.read_logs(start, end, sensor_id):
+        timestamps.append(row['timestamp'].timestamp())
+        values.append(row['value'])
+    return np.array(timestamps), np.array(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="read_logs generator vs read_logs_array on a ~1M-row log")
+    parser.add_argument('--days', type=float, default=30)
+    parser.add_argument('--step', type=float, default=10.0)
+    args = parser.parse_args()
+
+    start = datetime(2025, 6, 1)
+    end = start + timedelta(days=args.days)
+    layouts = {
+        'single csv': {},
+        'daily zips': {'rotate_after_lines': int(86400 / args.step) * 4, 'archive_cache_mb': 0},
+    }
+    for layout, options in layouts.items():
+        logger = make_logger('csv', **options)
+        rows = fill(logger, start, args.days, args.step)
+        for sensor_id in (None, 'temp_1'):
+            generator, _ = timed(lambda: via_generator(logger, start, end, sensor_id))
+            arrays, result = timed(lambda: logger.read_logs_array(start, end, sensor_id))
+            found = sum(len(ts) for ts, _ in result.values())
+            print(f"{layout:10s} {rows:,} rows, {sensor_id or 'all sensors':11s} -> {found:9,}: "
+                  f"generator {generator:6.2f}s  read_logs_array {arrays:6.2f}s  ({generator / arrays:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from symulacja_czujnikow.pressure_sensor import PressureSensor
+from logger.logger import Logger
+from komunikacja_sieciowa.siec.client import NetworkClient
+
+
+def make_logger(buffer_size: int) -> Logger:
+    tmp = tempfile.mkdtemp()
+    config_path = os.path.join(tmp, 'config.json')
+    with open(config_path, 'w') as f:
+        json.dump({'log_dir': os.path.join(tmp, 'logs'), 'buffer_size': buffer_size,
+                   'rotate_after_lines': None, 'max_size_mb': 1000}, f)
+    return Logger(config_path)
+
+
+def dict_path(sensor, logger, client, n):
+    for _ in range(n):
+        reading = sensor.get_reading()
+        now = datetime.now()
+        logger.log_reading(sensor.sensor_id, now, reading['value'], sensor.unit)
+        client._serialize({'sensor_id': sensor.sensor_id, 'value': float(reading['value']),
+                           'unit': sensor.unit, 'timestamp': now.isoformat()})
+
+
+def record_path(sensor, logger, client, n):
+    for _ in range(n):
+        reading = sensor.read()
+        logger.log(reading)
+        client._serialize(reading)
+
+
+def throughput(path, n: int) -> float:
+    sensor, logger, client = PressureSensor(), make_logger(200), NetworkClient('127.0.0.1', 1)
+    logger.start()
+    path(sensor, logger, client, 1000)
+    start = time.perf_counter()
+    path(sensor, logger, client, n)
+    elapsed = time.perf_counter() - start
+    logger.stop()
+    return n / elapsed
+
+
+def buffered_bytes(path, n: int) -> float:
+    # Bufor większy niż n: mierzymy pamięć zajmowaną przez jeden zbuforowany odczyt
+    sensor, logger, client = PressureSensor(), make_logger(10 ** 7), NetworkClient('127.0.0.1', 1)
+    logger.start()
+    path(sensor, logger, client, 1000)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    path(sensor, logger, client, n)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    logger.stop()
+    return (after - before) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-reading cost: dicts vs Reading records")
+    parser.add_argument('--readings', type=int, default=50000)
+    args = parser.parse_args()
+    for name, path in (('dict API', dict_path), ('Reading', record_path)):
+        rate = throughput(path, args.readings)
+        size = buffered_bytes(path, 10000)
+        print(f"{name:9s} {rate:10,.0f} readings/s  {size:6.0f} B buffered per reading")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import glob
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from benchmarks.bench_storage import make_logger, fill, timed
+
+
+def hourly_from_raw(logger, start, end, sensor_id):
+    sums = defaultdict(lambda: [0, 0.0])
+    for row in logger.read_logs(start, end, sensor_id):
+        bucket = sums[row['timestamp'].replace(minute=0, second=0, microsecond=0)]
+        bucket[0] += 1
+        bucket[1] += row['value']
+    return {hour: total / count for hour, (count, total) in sums.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hourly averages: raw scan vs rollups")
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--step', type=float, default=10.0)
+    args = parser.parse_args()
+
+    start = datetime(2025, 6, 1)
+    end = start + timedelta(days=args.days)
+    for storage in ('csv', 'columnar'):
+        # Jeden plik na dzień, tak jak przy domyślnej rotacji dobowej
+        logger = make_logger(storage, rotate_after_lines=int(86400 / args.step) * 4)
+        fill(logger, start, args.days, args.step)
+        raw, expected = timed(lambda: hourly_from_raw(logger, start, end, 'temp_1'))
+        rolled, rows = timed(lambda: logger.read_rollups(start, end, 'temp_1', 'hour'))
+        assert len(rows) == len(expected)
+        touched = sum(os.path.getsize(p) for p in glob.glob(os.path.join(logger.archive_dir, '*.hour.rollup')))
+        print(f"{storage:8s} {args.days} days hourly mean: raw {raw * 1000:8.1f} ms  "
+              f"rollups {rolled * 1000:6.1f} ms ({touched / 1024:.0f} KiB of rollup files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import glob
+import os
+import time
+
+from benchmarks.bench_storage import make_logger
+from symulacja_czujnikow.reading import Reading
+
+
+def run(compression, readings: int, rotate_after: int):
+    logger = make_logger('csv', compression=compression, rotate_after_lines=rotate_after, buffer_size=200)
+    logger.start()
+    worst = 0.0
+    started = time.perf_counter()
+    base = time.time()
+    for i in range(readings):
+        call = time.perf_counter()
+        logger.log(Reading('temp_1', float(i), 'C', base + i))
+        worst = max(worst, time.perf_counter() - call)
+    logger.stop()
+    elapsed = time.perf_counter() - started
+    archived = [p for p in glob.glob(os.path.join(logger.archive_dir, '*')) if p.endswith(('.zip', '.gz', '.xz'))]
+    size = sum(os.path.getsize(p) for p in archived)
+    return readings / elapsed, worst, len(archived), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rotation cost: zip after rotation vs compress-on-write")
+    parser.add_argument('--readings', type=int, default=400000)
+    parser.add_argument('--rotate-after', type=int, default=100000, help="rows per file (~5 MB of CSV)")
+    args = parser.parse_args()
+    for compression in (None, 'gzip', 'lzma'):
+        rate, worst, files, size = run(compression, args.readings, args.rotate_after)
+        print(f"{compression or 'zip':5s} {rate:9,.0f} readings/s  worst log() {worst * 1000:7.1f} ms  "
+              f"{files} archives, {size / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
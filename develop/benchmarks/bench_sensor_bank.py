@@ -0,0 +1,51 @@
+import argparse
+import time
+from datetime import datetime
+
+from symulacja_czujnikow.temperature_sensor import TemperatureSensor
+from symulacja_czujnikow.humidity_sensor import HumiditySensor
+from symulacja_czujnikow.pressure_sensor import PressureSensor
+from symulacja_czujnikow.light_sensor import LightSensor
+from symulacja_czujnikow.sensor_bank import SensorBank
+
+
+def build_fleet(size: int):
+    classes = [TemperatureSensor, HumiditySensor, PressureSensor, LightSensor]
+    return [classes[i % 4](sensor_id=f"s_{i}") for i in range(size)]
+
+
+def bench_scalar(sensors, ticks: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for sensor in sensors:
+            sensor.read_value()
+    return time.perf_counter() - start
+
+
+def bench_bank(bank: SensorBank, ticks: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ticks):
+        bank.read_values(datetime.now())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SensorBank vs per-sensor read_value()")
+    parser.add_argument('--sensors', type=int, default=5000)
+    parser.add_argument('--ticks', type=int, default=20)
+    args = parser.parse_args()
+
+    sensors = build_fleet(args.sensors)
+    bank = SensorBank(sensors)
+
+    scalar = bench_scalar(sensors, args.ticks)
+    vector = bench_bank(bank, args.ticks)
+    readings = args.sensors * args.ticks
+    print(f"sensors={args.sensors} ticks={args.ticks}")
+    print(f"scalar: {scalar:.3f}s  {readings / scalar:,.0f} readings/s")
+    print(f"bank:   {vector:.3f}s  {readings / vector:,.0f} readings/s")
+    print(f"speedup: {scalar / vector:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import json
+import selectors
+import socket
+import subprocess
+import sys
+import time
+
+from komunikacja_sieciowa.serwer.server import _raise_fd_limit
+
+
+def rss_mb(pid: int) -> float:
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+def run(mode: str, port: int, connections: int, rounds: int) -> None:
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'komunikacja_sieciowa.serwer.server', '--port', str(port), '--mode', mode],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        base_rss = rss_mb(server.pid)
+        start = time.perf_counter()
+        sockets = []
+        for _ in range(connections):
+            sock = socket.create_connection(('127.0.0.1', port), timeout=30)
+            sock.setblocking(False)
+            sockets.append(sock)
+        connect_time = time.perf_counter() - start
+
+        message = json.dumps({'sensor_id': 'temp_1', 'value': 21.5, 'unit': 'C',
+                              'timestamp': 1749551400.0}).encode('utf-8') + b'\n'
+        selector = selectors.DefaultSelector()
+        for sock in sockets:
+            selector.register(sock, selectors.EVENT_READ)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for sock in sockets:
+                sock.sendall(message)
+            waiting = len(sockets)
+            while waiting:
+                for key, _ in selector.select(timeout=30):
+                    if key.fileobj.recv(64) == b'ACK\n':
+                        waiting -= 1
+        elapsed = time.perf_counter() - start
+        messages = connections * rounds
+        print(f"{mode:9s} {connections:6,} conns: connect {connect_time:5.2f}s, "
+              f"{messages:,} msgs in {elapsed:5.2f}s ({messages / elapsed:8,.0f}/s), "
+              f"server rss {base_rss:5.1f} -> {rss_mb(server.pid):6.1f} MB, threads {thread_count(server.pid)}")
+        selector.close()
+        for sock in sockets:
+            sock.close()
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def thread_count(pid: int) -> int:
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('Threads:'):
+                return int(line.split()[1])
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent connections: thread-per-connection vs selectors loop")
+    parser.add_argument('--connections', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--modes', nargs='+', default=['threads', 'selectors'])
+    parser.add_argument('--port', type=int, default=50600)
+    args = parser.parse_args()
+
+    # Klient i serwer w osobnych procesach - każdy potrzebuje deskryptora na połączenie
+    _raise_fd_limit()
+    for connections in args.connections:
+        for i, mode in enumerate(args.modes):
+            run(mode, args.port + i, connections, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import logging
+import multiprocessing as mp
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_server_connections import wait_for_port
+from komunikacja_sieciowa.siec.client import NetworkClient
+from symulacja_czujnikow.reading import Reading
+
+
+def load(port: int, readings: int, start_event, results) -> None:
+    logging.disable(logging.CRITICAL)
+    client = NetworkClient('127.0.0.1', port, window=1024, batch_size=64, timeout=30)
+    client.connect()
+    batch = [Reading(f'press_{i % 8}', 1013.25 + i % 100 / 10, 'hPa', 1749551400.0 + i) for i in range(readings)]
+    start_event.wait()
+    for reading in batch:
+        client.send(reading)
+    client.flush()
+    results.put(client.stats()['acked'])
+    client.close()
+
+
+def run(port: int, workers: int, clients: int, readings: int) -> None:
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'komunikacja_sieciowa.serwer.server', '--port', str(port), '--workers', str(workers)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        time.sleep(0.5)
+        ctx = mp.get_context('fork')
+        start_event, results = ctx.Event(), ctx.Queue()
+        processes = [ctx.Process(target=load, args=(port, readings, start_event, results)) for _ in range(clients)]
+        for process in processes:
+            process.start()
+        time.sleep(0.5)
+        start = time.perf_counter()
+        start_event.set()
+        acked = sum(results.get() for _ in processes)
+        elapsed = time.perf_counter() - start
+        for process in processes:
+            process.join()
+        print(f"{workers:2d} workers, {clients} clients: {acked:,} readings in {elapsed:5.2f}s "
+              f"({acked / elapsed:9,.0f} readings/s)")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest throughput vs number of SO_REUSEPORT server processes")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--readings', type=int, default=20000, help="readings per client")
+    parser.add_argument('--port', type=int, default=50800)
+    args = parser.parse_args()
+    # JSON dekodowany w procesach serwera - skalowanie ograniczone liczbą rdzeni
+    print(f"{os.cpu_count()} CPU(s)")
+    for i, workers in enumerate(args.workers):
+        run(args.port + i, workers, args.clients, args.readings)
+
+
+if __name__ == "__main__":
+    main()
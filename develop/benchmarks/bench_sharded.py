@@ -0,0 +1,47 @@
+import argparse
+import os
+import time
+
+from symulacja_czujnikow.temperature_sensor import TemperatureSensor
+from symulacja_czujnikow.humidity_sensor import HumiditySensor
+from symulacja_czujnikow.pressure_sensor import PressureSensor
+from symulacja_czujnikow.light_sensor import LightSensor
+from symulacja_czujnikow.sharded import ShardedSimulation
+
+
+def build_configs(size: int):
+    classes = [TemperatureSensor, HumiditySensor, PressureSensor, LightSensor]
+    return [classes[i % 4](sensor_id=f"s_{i}").to_dict() for i in range(size)]
+
+
+def run(configs, workers: int, duration: float) -> float:
+    with ShardedSimulation(configs, workers=workers, interval=0.0) as sim:
+        time.sleep(0.5)
+        sim.drain()
+        start = time.perf_counter()
+        received = 0
+        while time.perf_counter() - start < duration:
+            received += len(sim.drain())
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+        dropped = sim.stats()['dropped']
+    return received / elapsed, dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ShardedSimulation throughput vs worker count")
+    parser.add_argument('--sensors', type=int, default=5000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--duration', type=float, default=3.0)
+    args = parser.parse_args()
+
+    configs = build_configs(args.sensors)
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        rate, dropped = run(configs, workers, args.duration)
+        baseline = baseline or rate
+        print(f"workers={workers}: {rate:,.0f} readings/s  (x{rate / baseline:.2f}, dropped={dropped})")
+
+
+if __name__ == "__main__":
+    main()
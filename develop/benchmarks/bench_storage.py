@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from logger.logger import Logger
+from logger.segment import Segment
+from symulacja_czujnikow.reading import reading_array
+
+SENSORS = np.array(['temp_1', 'hum_1', 'press_1', 'light_1'])
+UNITS = np.array(['C', '%', 'hPa', 'lx'])
+
+
+def make_logger(storage: str, **options) -> Logger:
+    tmp = tempfile.mkdtemp()
+    config_path = os.path.join(tmp, 'config.json')
+    config = {'log_dir': os.path.join(tmp, 'logs'), 'storage': storage, 'buffer_size': 1000,
+              'filename_pattern': 'sensors_%Y%m%d_%H%M%S_%f.csv',
+              'rotate_after_lines': None, 'max_size_mb': 10000}
+    config.update(options)
+    with open(config_path, 'w') as f:
+        json.dump(config, f)
+    return Logger(config_path)
+
+
+def fill(logger: Logger, start: datetime, days: float, step: float) -> int:
+    ticks = int(days * 86400 / step)
+    rng = np.random.default_rng(0)
+    logger.start()
+    chunk = 25000
+    for first in range(0, ticks, chunk):
+        tick = np.arange(first, min(first + chunk, ticks))
+        timestamps = np.repeat(start.timestamp() + tick * step, len(SENSORS))
+        kinds = np.tile(np.arange(len(SENSORS)), len(tick))
+        logger.log_readings(reading_array(SENSORS[kinds], rng.normal(size=len(kinds)), UNITS[kinds], timestamps))
+    logger.stop()
+    return ticks * len(SENSORS)
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Range scans: CSV vs columnar segments")
+    parser.add_argument('--days', type=float, default=30)
+    parser.add_argument('--step', type=float, default=10.0, help="seconds between ticks of 4 sensors")
+    args = parser.parse_args()
+
+    start = datetime(2025, 6, 1)
+    end = start + timedelta(days=args.days)
+    window = (start + timedelta(days=args.days / 2), start + timedelta(days=args.days / 2 + 1))
+    for storage in ('csv', 'columnar'):
+        logger = make_logger(storage)
+        write_time, rows = timed(lambda: fill(logger, start, args.days, args.step))
+        month, count = timed(lambda: sum(1 for _ in logger.read_logs(start, end)))
+        day, _ = timed(lambda: sum(1 for _ in logger.read_logs(*window, sensor_id='temp_1')))
+        print(f"{storage:8s} write {rows / write_time:10,.0f} rows/s  "
+              f"full scan {count:,} rows in {month:6.2f}s  1-day temp_1 in {day * 1000:7.1f} ms")
+        if storage == 'columnar':
+            def raw_scan():
+                total = 0
+                for path in logger._segment_dirs():
+                    total += len(Segment(path).read(start.timestamp(), end.timestamp()))
+                return total
+            raw, _ = timed(raw_scan)
+            print(f"{'':8s} full scan as arrays (no dicts) in {raw * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from komunikacja_sieciowa.serwer.server import NetworkServer, _Session
+from komunikacja_sieciowa.siec.client import NetworkClient
+from komunikacja_sieciowa.siec.framing import LengthPrefixedFramer, LineFramer
+from symulacja_czujnikow.reading import Reading
+
+
+class NullServer(NetworkServer):
+    def _process_batch(self, batch):
+        pass
+
+
+def telemetry(sensors: int, ticks: int, seed: int = 7):
+    # Stały okres próbkowania, wartości zmieniające się o dziesiąte części jednostki
+    rng = np.random.default_rng(seed)
+    levels = rng.uniform(990, 1030, sensors) + np.cumsum(rng.normal(0, 0.1, (ticks, sensors)), axis=0)
+    values = np.round(levels, 2)
+    readings = []
+    for tick in range(ticks):
+        timestamp = 1749551400.0 + tick
+        readings.extend(Reading(f'press_{i}', float(values[tick, i]), 'hPa', timestamp) for i in range(sensors))
+    return readings
+
+
+def measure(readings, batch_size: int, **options):
+    # Strumień bajtów z prawdziwego klienta i jego dekodowanie przez serwer, bez sieci
+    lines = options.pop('lines', False)
+    client = NetworkClient('127.0.0.1', 1, window=len(readings), batch_size=batch_size, **options)
+    client.features = frozenset() if lines else client.offered
+    start = time.process_time()
+    prepared = [client._prepare(r) for r in readings]
+    stream = b''.join(client._enqueue(i, prepared[i:i + batch_size]) for i in range(0, len(prepared), batch_size))
+    encode = time.process_time() - start
+
+    server, session = NullServer(port=0), _Session()
+    session.features = client.features
+    framer = LengthPrefixedFramer(max_size=1 << 30) if session.binary else LineFramer(max_size=1 << 30)
+    start = time.process_time()
+    framer.feed(stream)
+    server._respond(session, framer.messages())
+    decode = time.process_time() - start
+    n = len(readings)
+    return len(stream) / n, encode / n, decode / n, client.stats()['compression_ratio']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes and CPU per reading: JSON lines vs binary vs delta frames")
+    parser.add_argument('--sensors', type=int, default=8)
+    parser.add_argument('--ticks', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    readings = telemetry(args.sensors, args.ticks)
+    variants = [
+        ('JSON lines (v1)', {'lines': True}),
+        ('JSON batch frames', {}),
+        ('binary records', {'binary': True}),
+        ('delta, no zlib', {'delta': True, 'compression_level': 0}),
+        ('delta + zlib 1', {'delta': True, 'compression_level': 1}),
+        ('delta + zlib 6', {'delta': True, 'compression_level': 6}),
+    ]
+    print(f"{len(readings):,} readings, {args.sensors} sensors, {args.batch_size} readings per frame")
+    for name, options in variants:
+        size, encode, decode, ratio = measure(readings, args.batch_size, **options)
+        ratio = f"{ratio:5.2f}x" if ratio else '     -'
+        print(f"{name:20s} {size:6.2f} bytes/reading  encode {encode * 1e6:6.2f} us  "
+              f"decode {decode * 1e6:6.2f} us  ratio vs records {ratio}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+# Tyle ostatnich numerów pamiętanych jako brakujące - spóźniony datagram spoza okna
+# traktowany jest jak duplikat
+_WINDOW = 1024
+_MAX_STREAMS = 4096
+_FIELDS = ('datagrams', 'lost', 'reordered', 'duplicates')
+
+
+class SequenceTracker:
+    # Straty jednego strumienia: luka w numeracji liczona jako utrata, dopóki
+    # brakujący datagram nie dotrze później (wtedy jest przestawiony)
+    __slots__ = ('expected', 'missing', 'datagrams', 'lost', 'reordered', 'duplicates')
+
+    def __init__(self):
+        self.expected = None
+        self.missing = set()
+        self.datagrams = 0
+        self.lost = 0
+        self.reordered = 0
+        self.duplicates = 0
+
+    def update(self, seq: int) -> bool:
+        # False - duplikat, dane datagramu należy pominąć
+        if self.expected is None or seq >= self.expected:
+            if self.expected is not None and seq > self.expected:
+                self.lost += seq - self.expected
+                self.missing.update(range(max(self.expected, seq - _WINDOW), seq))
+            self.expected = seq + 1
+            if len(self.missing) > 2 * _WINDOW:
+                self.missing = {s for s in self.missing if s >= self.expected - _WINDOW}
+        elif seq in self.missing:
+            self.missing.discard(seq)
+            self.lost -= 1
+            self.reordered += 1
+        else:
+            self.duplicates += 1
+            return False
+        self.datagrams += 1
+        return True
+
+
+class DatagramStats:
+    # Statystyki wszystkich strumieni UDP; aktualizowane z jednego wątku serwera
+    def __init__(self):
+        self._streams: 'OrderedDict[Tuple, SequenceTracker]' = OrderedDict()
+        # Sumy strumieni usuniętych z pamięci (najdawniej aktywnych)
+        self._evicted = dict.fromkeys(_FIELDS, 0)
+        self.readings = 0
+        self.invalid = 0
+        # Odczyty odebrane, ale odrzucone przy pełnej kolejce odbiorców
+        self.dropped = 0
+
+    def record(self, source: Tuple, stream: int, seq: int, readings: int) -> bool:
+        key = (source, stream)
+        tracker = self._streams.get(key)
+        if tracker is None:
+            tracker = self._streams[key] = SequenceTracker()
+            if len(self._streams) > _MAX_STREAMS:
+                _, oldest = self._streams.popitem(last=False)
+                for field in _FIELDS:
+                    self._evicted[field] += getattr(oldest, field)
+        else:
+            self._streams.move_to_end(key)
+        if not tracker.update(seq):
+            return False
+        self.readings += readings
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        trackers = list(self._streams.values())
+        result = {field: self._evicted[field] + sum(getattr(t, field) for t in trackers) for field in _FIELDS}
+        total = result['datagrams'] + result['lost']
+        result.update({
+            'readings': self.readings,
+            'invalid': self.invalid,
+            'dropped': self.dropped,
+            'streams': len(trackers),
+            'loss_ratio': result['lost'] / total if total else 0.0
+        })
+        return result
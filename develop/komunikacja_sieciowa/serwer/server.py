@@ -1,87 +1,638 @@
 import socket
 import json
 import logging
-from typing import Dict, Any, Optional
+import selectors
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional
 from threading import Thread
+
+import numpy as np
+
+from komunikacja_sieciowa.serwer.datagram import DatagramStats
+from komunikacja_sieciowa.serwer.sinks import LatestValueStore, LoggerSink, Sink, SinkPipeline
+from komunikacja_sieciowa.siec.framing import Framer, LengthPrefixedFramer, LineFramer, FrameTooLong
+from komunikacja_sieciowa.siec.protocol import (
+    ACK, ERROR_FRAME, ERROR_JSON, ERROR_TOO_LONG, FEATURES, FRAME_DELTA, FRAME_READINGS, FRAME_SENSOR,
+    ack_message, decode_datagram, decode_delta_frame, decode_readings_frame, decode_sensor_frame, hello_message,
+    parse_frame, parse_hello
+)
+from symulacja_czujnikow.reading import READING_DTYPE, Reading, readings_from_array, readings_to_array
+
 logging.basicConfig(level=logging.INFO)
 
+MODES = ('selectors', 'threads')
+_ACCEPT_BATCH = 64
+_DATAGRAM_BATCH = 256
+_UDP_RECV_BUFFER = 4 << 20
+_MAX_OUTGOING = 1 << 20
+_WAKEUP = object()
+_DATAGRAM = object()
+
+
+def _raise_fd_limit() -> None:
+    # Każde połączenie to deskryptor - podniesienie miękkiego limitu do twardego
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard == resource.RLIM_INFINITY or soft < hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def _records_to_batch(sensor_ids: np.ndarray, units: np.ndarray, records: np.ndarray) -> np.ndarray:
+    # Rekordy binarne zamieniane kolumnowo na tablicę odczytów, bez obiektu na rekord
+    codes = records['sensor']
+    batch = np.empty(len(records), dtype=READING_DTYPE)
+    batch['timestamp'] = records['timestamp']
+    batch['value'] = records['value']
+    batch['sensor_id'] = sensor_ids[codes]
+    batch['unit'] = units[codes]
+    return batch
+
+
+class _Session:
+    # Stan protokołu jednego połączenia; bez powitania klient mówi w wersji 1
+    __slots__ = ('features', 'sensor_ids', 'units', '_labels')
+
+    def __init__(self):
+        self.features = frozenset()
+        # Słownik protokołu binarnego: indeks -> (sensor_id, jednostka)
+        self.sensor_ids: List[str] = []
+        self.units: List[str] = []
+        self._labels = None
+
+    @property
+    def binary(self) -> bool:
+        return 'binary' in self.features
+
+    def define(self, index: int, sensor_id: str, unit: str) -> None:
+        if index != len(self.sensor_ids):
+            raise ValueError(f"Unexpected sensor index {index}")
+        self.sensor_ids.append(sensor_id)
+        self.units.append(unit)
+        self._labels = None
+
+    def labels(self):
+        if self._labels is None:
+            # Słowniki jako tablice obiektów - indeksowanie kodami nie ucina długich nazw
+            self._labels = (np.array(self.sensor_ids, dtype=object), np.array(self.units, dtype=object))
+        return self._labels
+
+    def framer(self, current: Framer) -> Framer:
+        # Po wynegocjowaniu protokołu binarnego dalsze dane klienta to ramki z długością
+        if self.binary and not isinstance(current, LengthPrefixedFramer):
+            return LengthPrefixedFramer(max_size=current.max_size).take_over(current)
+        return current
+
+
+class _Connection:
+    __slots__ = ('sock', 'addr', 'framer', 'session', 'pending', 'outgoing', 'busy', 'eof', 'closed', 'events')
+
+    def __init__(self, sock: socket.socket, addr, max_message_size: int):
+        self.sock = sock
+        self.addr = addr
+        self.framer = LineFramer(max_size=max_message_size)
+        self.session = _Session()
+        self.pending: List[bytes] = []
+        self.outgoing = bytearray()
+        self.busy = False
+        self.eof = False
+        self.closed = False
+        self.events = 0
+
+
 class NetworkServer:
-    def __init__(self, port: int, logger: Optional[logging.Logger] = None):
+    def __init__(
+            self,
+            port: int,
+            logger: Optional[logging.Logger] = None,
+            mode: str = 'selectors',
+            worker_threads: int = 4,
+            max_message_size: int = 1 << 20,
+            max_pending: int = 1024,
+            backlog: int = socket.SOMAXCONN,
+            features: Iterable[str] = FEATURES,
+            reuse_port: bool = False,
+            udp: bool = False,
+            sinks: Iterable[Sink] = (),
+            window_seconds: float = 60.0,
+            sink_batch_size: int = 5000,
+            sink_latency_ms: float = 50,
+            sink_queue_size: int = 1000,
+            dump_messages: bool = False
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown server mode: {mode}")
         self.port = port
         self.logger = logger or logging.getLogger(__name__)
+        self.mode = mode
+        self.worker_threads = worker_threads
+        self.max_message_size = max_message_size
+        # Powyżej tylu nieprzetworzonych wiadomości (lub bajtów odpowiedzi) połączenie
+        # przestaje być czytane, dopóki pula nie nadrobi zaległości
+        self.max_pending = max_pending
+        self.backlog = backlog
+        # Kilka procesów nasłuchujących na tym samym porcie - jądro rozdziela między nie połączenia
+        if reuse_port and not hasattr(socket, 'SO_REUSEPORT'):
+            raise ValueError("SO_REUSEPORT is not supported on this platform")
+        self.reuse_port = reuse_port
+        self.accepted = 0
+        # udp=True - ten sam port przyjmuje też datagramy UDP (bez potwierdzeń, z licznikiem strat)
+        self.udp = udp
+        self.udp_socket: Optional[socket.socket] = None
+        self.datagram_stats = DatagramStats()
+        self._udp_thread = None
+        # Funkcje protokołu oferowane klientom; pusta lista - serwer zachowuje się jak wersja 1
+        self.features = frozenset(features)
+        # Odczyty trafiają do odbiorców w tle - potwierdzenie nie czeka na zapis
+        self.latest = LatestValueStore(window_seconds)
+        self.pipeline = SinkPipeline([self.latest, *sinks], max_batch_size=sink_batch_size,
+                                     max_latency_ms=sink_latency_ms, queue_size=sink_queue_size,
+                                     logger=self.logger)
+        # Pełny zrzut każdej wiadomości - tylko do diagnostyki, przy poziomie DEBUG
+        self.dump_messages = dump_messages
         self.socket: Optional[socket.socket] = None
         self.running = False
         self.handlers = []
+        self._clients = set()
+        self._clients_lock = threading.Lock()
+        self._connections = set()
+        self._done = deque()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._wakeup_r: Optional[socket.socket] = None
+        self._wakeup_w: Optional[socket.socket] = None
+        self._stopped = threading.Event()
+        self._stopped.set()
+        self._loop_thread = None
 
     def start(self) -> None:
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         self.socket.bind(('0.0.0.0', self.port))
-        self.socket.listen(5)
+        self.socket.listen(self.backlog)
+        # Port 0 - system przydziela wolny port, dostępny potem w self.port
+        self.port = self.socket.getsockname()[1]
+        if self.udp:
+            self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            if self.reuse_port:
+                self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            # Większy bufor odbiorczy - krótkie przestoje pętli nie gubią datagramów
+            self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _UDP_RECV_BUFFER)
+            self.udp_socket.bind(('0.0.0.0', self.port))
+            self.udp_socket.setblocking(False)
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._loop_thread = threading.current_thread()
+        self._stopped.clear()
         self.running = True
+        self.pipeline.start()
 
-        self.logger.info(f"Server started on port {self.port}")
+        self.logger.info(f"Server started on port {self.port} ({self.mode})")
 
         try:
-            while self.running:
-                try:
-                    client_socket, addr = self.socket.accept()
-                    self.logger.info(f"New connection from {addr}")
-                    handler = Thread(target=self._handle_client, args=(client_socket,))
-                    handler.start()
-                    self.handlers.append(handler)
-                except socket.timeout:
-                    continue
+            if self.mode == 'selectors':
+                self._serve_selectors()
+            else:
+                self._serve_threads()
         except KeyboardInterrupt:
             self.logger.info("Server shutting down...")
         finally:
-            self.stop()
+            self._shutdown()
 
     def stop(self) -> None:
+        self.running = False
+        self._wakeup()
+        # Wywołane z innego wątku - czeka, aż pętla serwera zamknie gniazda
+        if self._loop_thread is not None and self._loop_thread is not threading.current_thread():
+            self._stopped.wait(timeout=10)
+
+    def _shutdown(self) -> None:
         self.running = False
         if self.socket:
             self.socket.close()
+        if self._udp_thread is not None:
+            self._udp_thread.join()
+            self._udp_thread = None
+        if self.udp_socket:
+            self.udp_socket.close()
+            self.udp_socket = None
+        for conn in list(self._connections):
+            self._close(None, conn)
+        with self._clients_lock:
+            for client_socket in self._clients:
+                try:
+                    client_socket.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
         for handler in self.handlers:
             handler.join()
+        self.handlers = []
+        for sock in (self._wakeup_r, self._wakeup_w):
+            if sock:
+                sock.close()
+        self._wakeup_r = self._wakeup_w = None
+        self._loop_thread = None
+        # Potwierdzone odczyty są zapisywane przed zakończeniem
+        self.pipeline.close()
         self.logger.info("Server stopped")
+        self._stopped.set()
+
+    def _wakeup(self) -> None:
+        try:
+            self._wakeup_w.send(b'\0')
+        except (AttributeError, BlockingIOError, OSError):
+            pass
+
+    def _respond(self, session: _Session, messages: List[bytes]) -> bytes:
+        if session.binary:
+            return self._respond_binary(session, messages)
+        responses = []
+        readings = []
+        # Kolejne poprawne ramki potwierdzane są jednym zbiorczym "ACK <seq>"
+        ack = None
+        for message in messages:
+            try:
+                decoded = json.loads(message.decode('utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                decoded = frame = None
+            else:
+                frame = parse_frame(decoded) if 'batch' in session.features else None
+            if frame is not None:
+                seq, items = frame
+                for item in items:
+                    reading = self._process_data(item)
+                    if reading is not None:
+                        readings.append(reading)
+                ack = seq + len(items) - 1
+                continue
+            if ack is not None:
+                responses.append(ack_message(ack))
+                ack = None
+            if decoded is None:
+                responses.append(ERROR_JSON)
+                continue
+            hello = parse_hello(decoded) if self.features else None
+            if hello is not None:
+                version, features = hello
+                session.features = self.features.intersection(features) if version >= 2 else frozenset()
+                responses.append(hello_message(session.features))
+                continue
+            reading = self._process_data(decoded)
+            if reading is not None:
+                readings.append(reading)
+            responses.append(ACK)
+        if ack is not None:
+            responses.append(ack_message(ack))
+        if readings:
+            self._process_batch(readings_to_array(readings))
+        return b''.join(responses)
+
+    def _respond_binary(self, session: _Session, frames: List[bytes]) -> bytes:
+        responses = []
+        ack = None
+        for frame in frames:
+            kind = frame[0] if frame else None
+            if kind == FRAME_SENSOR:
+                session.define(*decode_sensor_frame(frame))
+                continue
+            if kind not in (FRAME_READINGS, FRAME_DELTA):
+                # Bez znajomości typu nie da się ustalić, czego dotyczy ramka - zerwanie połączenia
+                raise ValueError(f"Unknown frame type: {kind}")
+            try:
+                if kind == FRAME_DELTA:
+                    seq, records = decode_delta_frame(frame)
+                else:
+                    seq, records = decode_readings_frame(frame)
+                if len(records) and records['sensor'].max() >= len(session.sensor_ids):
+                    raise ValueError("Unknown sensor index")
+            except ValueError:
+                if ack is not None:
+                    responses.append(ack_message(ack))
+                    ack = None
+                responses.append(ERROR_FRAME)
+                continue
+            self._process_records(session, records)
+            ack = seq + len(records) - 1
+        if ack is not None:
+            responses.append(ack_message(ack))
+        return b''.join(responses)
+
+    def _process_records(self, session: _Session, records: np.ndarray) -> None:
+        self._process_batch(_records_to_batch(*session.labels(), records))
+
+    def _process_batch(self, batch: np.ndarray, block: bool = True) -> bool:
+        # Zrzut do logu tworzy słownik na odczyt - tylko na żądanie i przy poziomie DEBUG
+        if self.dump_messages and self.logger.isEnabledFor(logging.DEBUG):
+            for reading in readings_from_array(batch):
+                self.logger.debug(f"Received data:\n{json.dumps(reading.to_dict(), indent=2)}")
+        return self.pipeline.submit(batch, block=block)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'connections': len(self._connections) + len(self._clients),
+            'accepted': self.accepted,
+            'sensors': len(self.latest.latest()),
+            'readings': self.latest.readings,
+            'pipeline': self.pipeline.stats(),
+            'udp': self.datagram_stats.stats() if self.udp else None
+        }
+
+    # Datagramy UDP: odbierane bez potwierdzeń, zawsze w jednym wątku (statystyki strat
+    # nie wymagają blokady). W trybie selectors to wątek pętli zdarzeń - pełna kolejka
+    # odbiorców nie może go wstrzymać, więc nadmiar datagramów jest odrzucany i liczony
+
+    def _read_datagrams(self) -> None:
+        batches = []
+        for _ in range(_DATAGRAM_BATCH):
+            try:
+                data, addr = self.udp_socket.recvfrom(65535)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                self.logger.warning(f"Datagram receive error: {e}")
+                break
+            try:
+                stream, seq, sensor_ids, units, records = decode_datagram(data)
+            except ValueError:
+                self.datagram_stats.invalid += 1
+                continue
+            # Duplikat (np. powtórzony przez sieć) jest pomijany
+            if self.datagram_stats.record(addr, stream, seq, len(records)) and len(records):
+                batches.append(_records_to_batch(np.array(sensor_ids, dtype=object), np.array(units, dtype=object),
+                                                 records))
+        if batches:
+            batch = batches[0] if len(batches) == 1 else np.concatenate(batches)
+            if not self._process_batch(batch, block=False):
+                self.datagram_stats.dropped += len(batch)
+
+    def _serve_datagrams(self) -> None:
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.udp_socket, selectors.EVENT_READ)
+            while self.running:
+                if selector.select(timeout=0.5):
+                    self._read_datagrams()
+
+    # Tryb z wątkiem na połączenie
+
+    def _serve_threads(self) -> None:
+        if self.udp_socket is not None:
+            self._udp_thread = Thread(target=self._serve_datagrams, daemon=True)
+            self._udp_thread.start()
+        self.socket.settimeout(0.5)
+        while self.running:
+            try:
+                client_socket, addr = self.socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                if not self.running:
+                    break
+                raise
+            self.logger.info(f"New connection from {addr}")
+            self.accepted += 1
+            client_socket.settimeout(None)
+            handler = Thread(target=self._handle_client, args=(client_socket,), daemon=True)
+            handler.start()
+            # Zakończone wątki nie są przechowywane w nieskończoność
+            self.handlers = [h for h in self.handlers if h.is_alive()]
+            self.handlers.append(handler)
 
     def _handle_client(self, client_socket: socket.socket) -> None:
+        with self._clients_lock:
+            self._clients.add(client_socket)
         with client_socket:
             self.logger.info("Started handling client")
-            buffer = b''
-            while True:
+            framer = LineFramer(max_size=self.max_message_size)
+            session = _Session()
+            while self.running:
                 try:
-                    data = client_socket.recv(1024)
-                    if not data:
+                    if not framer.recv_from(client_socket):
                         self.logger.info("Client disconnected")
                         break
-                    buffer += data
-                    while b'\n' in buffer:
-                        message, _, buffer = buffer.partition(b'\n')
-                        try:
-                            decoded = json.loads(message.decode('utf-8'))
-                            self._process_data(decoded)
-                            client_socket.sendall(b"ACK\n")
-                        except json.JSONDecodeError:
-                            client_socket.sendall(b"ERROR: Invalid JSON\n")
+                    messages = framer.messages()
+                    if messages:
+                        response = self._respond(session, messages)
+                        framer = session.framer(framer)
+                        client_socket.sendall(response)
+                except FrameTooLong:
+                    client_socket.sendall(ERROR_TOO_LONG)
+                    break
                 except (ConnectionResetError, BrokenPipeError) as e:
                     self.logger.warning(f"Connection error: {e}")
                     break
                 except Exception as e:
                     self.logger.error(f"Error handling client: {e}")
                     break
+        with self._clients_lock:
+            self._clients.discard(client_socket)
+
+    # Tryb z pętlą zdarzeń: jeden wątek obsługuje wszystkie gniazda,
+    # dekodowanie i przetwarzanie wiadomości trafia do ograniczonej puli wątków
+
+    def _serve_selectors(self) -> None:
+        _raise_fd_limit()
+        self.socket.setblocking(False)
+        selector = selectors.DefaultSelector()
+        selector.register(self.socket, selectors.EVENT_READ, None)
+        selector.register(self._wakeup_r, selectors.EVENT_READ, _WAKEUP)
+        if self.udp_socket is not None:
+            selector.register(self.udp_socket, selectors.EVENT_READ, _DATAGRAM)
+        self._pool = ThreadPoolExecutor(max_workers=self.worker_threads, thread_name_prefix='server-worker')
+        try:
+            while self.running:
+                for key, events in selector.select():
+                    if key.data is None:
+                        self._accept(selector)
+                    elif key.data is _WAKEUP:
+                        self._drain_wakeup()
+                        self._complete(selector)
+                    elif key.data is _DATAGRAM:
+                        self._read_datagrams()
+                    else:
+                        conn = key.data
+                        if events & selectors.EVENT_READ:
+                            self._read(selector, conn)
+                        if events & selectors.EVENT_WRITE and not conn.closed:
+                            self._write(selector, conn)
+                            self._update(selector, conn)
+        finally:
+            for conn in list(self._connections):
+                self._close(selector, conn)
+            selector.close()
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _accept(self, selector: selectors.BaseSelector) -> None:
+        for _ in range(_ACCEPT_BATCH):
+            try:
+                client_socket, addr = self.socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                # Np. wyczerpany limit deskryptorów - kolejna próba przy następnym zdarzeniu
+                self.logger.error(f"Accept failed: {e}")
+                return
+            self.logger.info(f"New connection from {addr}")
+            self.accepted += 1
+            client_socket.setblocking(False)
+            conn = _Connection(client_socket, addr, self.max_message_size)
+            self._connections.add(conn)
+            self._update(selector, conn)
 
-    def _process_data(self, data: Dict[str, Any]) -> None:
+    def _drain_wakeup(self) -> None:
         try:
-            formatted = json.dumps(data, indent=2)
-            self.logger.info(f"Received data:\n{formatted}")
+            while self._wakeup_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
 
+    def _read(self, selector: selectors.BaseSelector, conn: _Connection) -> None:
+        try:
+            received = conn.framer.recv_from(conn.sock)
+            messages = conn.framer.messages() if received else None
+        except (BlockingIOError, InterruptedError):
+            return
+        except FrameTooLong:
+            # Odpowiedź o błędzie i zamknięcie po wysłaniu zaległych potwierdzeń
+            conn.pending.append(None)
+            conn.eof = True
+        except OSError as e:
+            self.logger.warning(f"Connection error: {e}")
+            self._close(selector, conn)
+            return
+        else:
+            if not received:
+                self.logger.info("Client disconnected")
+                conn.eof = True
+            else:
+                conn.pending.extend(messages)
+        self._dispatch(conn)
+        self._update(selector, conn)
+
+    def _dispatch(self, conn: _Connection) -> None:
+        # Najwyżej jedna partia na połączenie w puli - odpowiedzi zachowują kolejność wiadomości
+        if conn.busy or not conn.pending:
+            return
+        batch, conn.pending = conn.pending, []
+        conn.busy = True
+        self._pool.submit(self._run_batch, conn, batch)
 
+    def _run_batch(self, conn: _Connection, batch: List[Optional[bytes]]) -> None:
+        try:
+            if batch[-1] is None:
+                response = self._respond(conn.session, batch[:-1]) + ERROR_TOO_LONG
+            else:
+                response = self._respond(conn.session, batch)
         except Exception as e:
-            self.logger.error(f"Data processing error: {str(e)}")
+            self.logger.error(f"Error handling client: {e}")
+            response = None
+        self._done.append((conn, response))
+        self._wakeup()
+
+    def _complete(self, selector: selectors.BaseSelector) -> None:
+        while self._done:
+            conn, response = self._done.popleft()
+            conn.busy = False
+            if conn.closed:
+                continue
+            if response is None:
+                self._close(selector, conn)
+                continue
+            conn.outgoing += response
+            conn.framer = conn.session.framer(conn.framer)
+            self._dispatch(conn)
+            self._write(selector, conn)
+            self._update(selector, conn)
+
+    def _write(self, selector: selectors.BaseSelector, conn: _Connection) -> None:
+        if not conn.outgoing:
+            return
+        try:
+            sent = conn.sock.send(conn.outgoing)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            self.logger.warning(f"Connection error: {e}")
+            self._close(selector, conn)
+            return
+        del conn.outgoing[:sent]
+
+    def _update(self, selector: selectors.BaseSelector, conn: _Connection) -> None:
+        if conn.closed:
+            return
+        if conn.eof and not conn.busy and not conn.pending and not conn.outgoing:
+            self._close(selector, conn)
+            return
+        events = 0
+        if not conn.eof and len(conn.pending) < self.max_pending and len(conn.outgoing) < _MAX_OUTGOING:
+            events |= selectors.EVENT_READ
+        if conn.outgoing:
+            events |= selectors.EVENT_WRITE
+        if events == conn.events:
+            return
+        if not conn.events:
+            selector.register(conn.sock, events, conn)
+        elif not events:
+            selector.unregister(conn.sock)
+        else:
+            selector.modify(conn.sock, events, conn)
+        conn.events = events
+
+    def _close(self, selector: Optional[selectors.BaseSelector], conn: _Connection) -> None:
+        if conn.closed:
+            return
+        conn.closed = True
+        if conn.events and selector is not None:
+            selector.unregister(conn.sock)
+        conn.events = 0
+        conn.sock.close()
+        self._connections.discard(conn)
+
+    def _process_data(self, data: Dict[str, Any]) -> Optional[Reading]:
+        # Wiadomość niebędąca odczytem jest potwierdzana, ale nie trafia do odbiorców
+        try:
+            return Reading.from_dict(data)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            if self.dump_messages:
+                self.logger.debug(f"Ignored message {data!r}: {e}")
+            return None
 
 if __name__ == "__main__":
+    import argparse
     import logging
     logging.basicConfig(level=logging.INFO)
-    server = NetworkServer(port=5000)
-    server.start()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Sensor data server")
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--mode', choices=MODES, default='selectors')
+    parser.add_argument('--worker-threads', type=int, default=4)
+    parser.add_argument('--log-config', help="Logger config; readings are persisted through Logger when given")
+    parser.add_argument('--dump-messages', action='store_true', help="Log every received reading (DEBUG)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Server processes sharing the port via SO_REUSEPORT")
+    parser.add_argument('--udp', action='store_true', help="Also accept fire-and-forget UDP datagrams")
+    args = parser.parse_args()
+    if args.dump_messages:
+        logging.getLogger().setLevel(logging.DEBUG)
+    if args.workers > 1:
+        from komunikacja_sieciowa.serwer.workers import WorkerSupervisor
+        WorkerSupervisor(args.port, args.workers, log_config=args.log_config, mode=args.mode,
+                         worker_threads=args.worker_threads, dump_messages=args.dump_messages, udp=args.udp).run()
+        raise SystemExit(0)
+    data_logger = None
+    if args.log_config:
+        from logger.logger import Logger
+        data_logger = Logger(args.log_config)
+        data_logger.start()
+    server = NetworkServer(port=args.port, mode=args.mode, worker_threads=args.worker_threads,
+                           sinks=[LoggerSink(data_logger)] if data_logger else (),
+                           dump_messages=args.dump_messages, udp=args.udp)
+    try:
+        server.start()
+    finally:
+        if data_logger:
+            data_logger.stop()
@@ -0,0 +1,218 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from symulacja_czujnikow.reading import Reading
+from symulacja_czujnikow.reading_history import ReadingHistory
+
+_STOP = object()
+
+
+class Sink:
+    # Odbiorca odczytów zdekodowanych przez serwer; dostaje całe paczki READING_DTYPE
+    def write(self, batch: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+
+class LoggerSink(Sink):
+    # Paczka trafia do Logger.log_readings jednym wywołaniem zamiast odczytu po odczycie
+    def __init__(self, logger):
+        self.logger = logger
+
+    def write(self, batch: np.ndarray) -> None:
+        self.logger.log_readings(batch)
+
+    def flush(self) -> None:
+        self.logger.flush()
+
+
+class _SensorState:
+    __slots__ = ('latest', 'history')
+
+    def __init__(self, capacity: int):
+        self.latest: Optional[Reading] = None
+        self.history = ReadingHistory(capacity)
+
+
+class LatestValueStore(Sink):
+    # Ostatnia wartość każdego czujnika i krótkie okno ostatnich odczytów w pamięci
+    def __init__(self, window_seconds: float = 60.0, capacity: int = 1000):
+        if window_seconds <= 0:
+            raise ValueError("Window must be positive")
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+        self.readings = 0
+        self._sensors: Dict[str, _SensorState] = {}
+        self._lock = threading.Lock()
+
+    def write(self, batch: np.ndarray) -> None:
+        if not len(batch):
+            return
+        # Grupowanie po czujniku jednym sortowaniem; kolejność napływu w grupie zachowana
+        sensor_ids, inverse = np.unique(batch['sensor_id'], return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        groups = np.split(batch[order], np.cumsum(np.bincount(inverse))[:-1])
+        with self._lock:
+            for sensor_id, rows in zip(sensor_ids.tolist(), groups):
+                state = self._sensors.get(sensor_id)
+                if state is None:
+                    state = self._sensors[sensor_id] = _SensorState(self.capacity)
+                state.history.extend(rows['timestamp'], rows['value'])
+                last = rows[int(np.argmax(rows['timestamp']))]
+                if state.latest is None or last['timestamp'] >= state.latest.timestamp:
+                    state.latest = Reading(sensor_id, float(last['value']), str(last['unit']),
+                                           float(last['timestamp']))
+            self.readings += len(batch)
+
+    def latest(self) -> Dict[str, Reading]:
+        with self._lock:
+            return {sensor_id: state.latest for sensor_id, state in self._sensors.items()}
+
+    def window(self, sensor_id: str, seconds: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        # Odczyty nie starsze niż okno liczone od ostatniego znacznika czasu czujnika
+        with self._lock:
+            state = self._sensors.get(sensor_id)
+            if state is None:
+                return np.empty(0), np.empty(0)
+            timestamps, values = state.history.view()
+            mask = timestamps >= state.latest.timestamp - (seconds or self.window_seconds)
+            return timestamps[mask], values[mask]
+
+    def summary(self) -> Dict[str, Dict]:
+        result = {}
+        for sensor_id, reading in self.latest().items():
+            _, values = self.window(sensor_id)
+            result[sensor_id] = {
+                'value': reading.value,
+                'unit': reading.unit,
+                'timestamp': reading.timestamp,
+                'count': len(values),
+                'min': float(values.min()),
+                'max': float(values.max()),
+                'mean': float(values.mean())
+            }
+        return result
+
+
+class SinkPipeline:
+    # Serwer tylko wrzuca paczki do kolejki i od razu potwierdza; osobny wątek skleja
+    # je do max_batch_size odczytów lub max_latency_ms i zapisuje do wszystkich odbiorców
+    def __init__(self, sinks: Iterable[Sink], max_batch_size: int = 5000, max_latency_ms: float = 50,
+                 queue_size: int = 1000, queue_full_policy: str = 'block',
+                 logger: Optional[logging.Logger] = None):
+        if queue_full_policy not in ('block', 'drop'):
+            raise ValueError(f"Unknown queue_full_policy: {queue_full_policy}")
+        self.sinks = list(sinks)
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self.queue_full_policy = queue_full_policy
+        self.logger = logger or logging.getLogger(__name__)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self.batches = 0
+        self.rows = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='sink-pipeline', daemon=True)
+            self._thread.start()
+
+    def submit(self, batch: np.ndarray, block: bool = True) -> bool:
+        # block=False - bez czekania na miejsce w kolejce niezależnie od queue_full_policy
+        # (np. z pętli zdarzeń, której nie wolno wstrzymać); nadmiar liczony w dropped
+        if self._thread is None:
+            # Bez wątku (np. serwer nieuruchomiony) zapis odbywa się od razu
+            self._write(batch)
+            return True
+        if self.queue_full_policy == 'drop' or not block:
+            try:
+                self._queue.put_nowait(batch)
+            except queue.Full:
+                self.dropped += len(batch)
+                return False
+        else:
+            self._queue.put(batch)
+        return True
+
+    def flush(self) -> None:
+        self._queue.join()
+        self._flush_sinks()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        self._flush_sinks()
+
+    def stats(self) -> Dict:
+        return {
+            'queued': self._queue.qsize(),
+            'batches': self.batches,
+            'rows': self.rows,
+            'dropped': self.dropped,
+            'errors': self.errors
+        }
+
+    def _run(self) -> None:
+        max_latency = self.max_latency_ms / 1000
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            items = [item]
+            rows = len(item)
+            stopping = False
+            deadline = time.monotonic() + max_latency
+            while rows < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                items.append(item)
+                rows += len(item)
+            try:
+                self._write(items[0] if len(items) == 1 else np.concatenate(items))
+            finally:
+                for _ in range(len(items) + stopping):
+                    self._queue.task_done()
+            if stopping:
+                return
+
+    def _write(self, batch: np.ndarray) -> None:
+        # Błąd jednego odbiorcy nie blokuje pozostałych ani serwera
+        for sink in self.sinks:
+            try:
+                sink.write(batch)
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"Sink {type(sink).__name__} failed: {e}")
+        self.batches += 1
+        self.rows += len(batch)
+
+    def _flush_sinks(self) -> None:
+        for sink in self.sinks:
+            try:
+                sink.flush()
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"Sink {type(sink).__name__} flush failed: {e}")
@@ -0,0 +1,196 @@
+import json
+import logging
+import multiprocessing as mp
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from komunikacja_sieciowa.serwer.server import NetworkServer
+from komunikacja_sieciowa.serwer.sinks import LoggerSink
+
+# Liczniki każdego procesu w pamięci współdzielonej: proces roboczy nadpisuje swój wiersz,
+# rodzic tylko czyta
+COUNTERS = ('accepted', 'connections', 'readings', 'dropped', 'errors', 'datagrams', 'datagrams_lost')
+
+
+def _run_worker(index: int, port: int, options: Dict[str, Any], log_config: Optional[str],
+                counters, report_interval: float) -> None:
+    # Każdy proces ma własne gniazdo nasłuchujące (SO_REUSEPORT), pętlę i odbiorców
+    data_logger = None
+    if log_config:
+        from logger.logger import Logger
+        with open(log_config, 'r') as f:
+            log_dir = json.load(f).get('log_dir', './logs')
+        data_logger = Logger(log_config, log_dir=os.path.join(log_dir, f'worker_{index}'))
+        data_logger.start()
+    server = NetworkServer(port=port, reuse_port=True, sinks=[LoggerSink(data_logger)] if data_logger else (),
+                           **options)
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.stop())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    stopped = threading.Event()
+    offset = index * len(COUNTERS)
+
+    def report():
+        stats = server.stats()
+        pipeline = stats['pipeline']
+        udp = stats['udp'] or {'datagrams': 0, 'lost': 0}
+        values = (stats['accepted'], stats['connections'], stats['readings'], pipeline['dropped'],
+                  pipeline['errors'], udp['datagrams'], udp['lost'])
+        counters[offset:offset + len(COUNTERS)] = values
+
+    def reporter():
+        while not stopped.wait(report_interval):
+            report()
+
+    thread = threading.Thread(target=reporter, name='worker-stats', daemon=True)
+    thread.start()
+    try:
+        server.start()
+    finally:
+        stopped.set()
+        thread.join()
+        report()
+        if data_logger:
+            data_logger.stop()
+
+
+class WorkerSupervisor:
+    # Proces nadrzędny: uruchamia N procesów serwera na wspólnym porcie, wznawia te,
+    # które się zakończyły, i sumuje ich liczniki
+    def __init__(self, port: int, workers: int, log_config: Optional[str] = None,
+                 restart_delay: float = 1.0, report_interval: float = 1.0, log_interval: float = 60.0,
+                 logger: Optional[logging.Logger] = None, **server_options):
+        if workers < 1:
+            raise ValueError("At least one worker is required")
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            raise ValueError("SO_REUSEPORT is not supported on this platform")
+        self.port = port
+        self.workers = workers
+        self.log_config = log_config
+        self.restart_delay = restart_delay
+        self.report_interval = report_interval
+        self.log_interval = log_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self.server_options = server_options
+        self._ctx = mp.get_context('fork')
+        self._counters = self._ctx.RawArray('q', workers * len(COUNTERS))
+        # Liczniki zakończonych procesów - suma nie maleje po restarcie
+        self._retired = [[0] * len(COUNTERS) for _ in range(workers)]
+        self._processes: List[Optional[mp.Process]] = [None] * workers
+        self._started_at = [0.0] * workers
+        self.restarts = [0] * workers
+        self._reserved: Optional[socket.socket] = None
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        # Gniazdo rodzica rezerwuje port (także przy port=0) bez nasłuchiwania,
+        # więc jądro nie kieruje do niego połączeń
+        self._reserved = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._reserved.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._reserved.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self._reserved.bind(('0.0.0.0', self.port))
+        self.port = self._reserved.getsockname()[1]
+        self._stop.clear()
+        for index in range(self.workers):
+            self._spawn(index)
+        self.logger.info(f"Started {self.workers} server workers on port {self.port}")
+        self._monitor = threading.Thread(target=self._supervise, name='worker-supervisor', daemon=True)
+        self._monitor.start()
+
+    def run(self) -> None:
+        # Tryb z linii poleceń: działa do SIGTERM/SIGINT, potem zatrzymuje procesy robocze
+        previous = {sig: signal.signal(sig, lambda signum, frame: self._stop.set())
+                    for sig in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            self.start()
+            while self._monitor.is_alive():
+                self._monitor.join(timeout=0.5)
+        finally:
+            self.stop()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+        for process in self._processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+        if self._reserved is not None:
+            self._reserved.close()
+            self._reserved = None
+        self.logger.info("Server workers stopped")
+
+    def pids(self) -> List[Optional[int]]:
+        return [process.pid if process is not None else None for process in self._processes]
+
+    def stats(self) -> Dict[str, Any]:
+        workers = []
+        totals = dict.fromkeys(COUNTERS, 0)
+        for index, process in enumerate(self._processes):
+            offset = index * len(COUNTERS)
+            current = self._counters[offset:offset + len(COUNTERS)]
+            worker = {
+                'pid': process.pid if process is not None else None,
+                'alive': process is not None and process.is_alive(),
+                'restarts': self.restarts[index]
+            }
+            for name, value, retired in zip(COUNTERS, current, self._retired[index]):
+                worker[name] = value + retired
+                # Bieżące połączenia dotyczą tylko działającego procesu
+                if name == 'connections':
+                    worker[name] = value if worker['alive'] else 0
+                totals[name] += worker[name]
+            workers.append(worker)
+        return {'port': self.port, 'restarts': sum(self.restarts), **totals, 'workers': workers}
+
+    def _spawn(self, index: int) -> None:
+        offset = index * len(COUNTERS)
+        self._counters[offset:offset + len(COUNTERS)] = [0] * len(COUNTERS)
+        process = self._ctx.Process(
+            target=_run_worker,
+            args=(index, self.port, self.server_options, self.log_config, self._counters, self.report_interval),
+            name=f'server-worker-{index}',
+            daemon=True
+        )
+        process.start()
+        self._processes[index] = process
+        self._started_at[index] = time.monotonic()
+
+    def _supervise(self) -> None:
+        logged_at, logged_readings = time.monotonic(), 0
+        while not self._stop.wait(0.2):
+            now = time.monotonic()
+            if now - logged_at >= self.log_interval:
+                stats = self.stats()
+                rate = (stats['readings'] - logged_readings) / (now - logged_at)
+                self.logger.info(f"Workers: {stats['readings']} readings ({rate:.0f}/s), "
+                                 f"{stats['connections']} connections, {stats['restarts']} restarts")
+                logged_at, logged_readings = now, stats['readings']
+            for index, process in enumerate(self._processes):
+                if process.is_alive():
+                    continue
+                if time.monotonic() - self._started_at[index] < self.restart_delay:
+                    # Proces padający tuż po starcie nie jest wznawiany w pętli bez przerwy
+                    continue
+                offset = index * len(COUNTERS)
+                current = self._counters[offset:offset + len(COUNTERS)]
+                self._retired[index] = [r + c for r, c in zip(self._retired[index], current)]
+                self.restarts[index] += 1
+                self.logger.warning(f"Worker {index} (pid {process.pid}) exited with code {process.exitcode}, "
+                                    f"restarting")
+                self._spawn(index)
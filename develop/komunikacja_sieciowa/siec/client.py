@@ -1,10 +1,27 @@
 import socket
 import json
+import queue
+import threading
 import time
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Callable, Optional, Dict, Any, List, Union
 import logging
 from datetime import datetime
 
+import numpy as np
+
+from komunikacja_sieciowa.siec.framing import LineFramer
+from komunikacja_sieciowa.siec.protocol import (
+    FEATURES, MAX_SENSORS, RECORD, encode_delta_frame, encode_frame, encode_readings_frame, encode_sensor_frame,
+    hello_message, parse_ack, parse_hello
+)
+from komunikacja_sieciowa.siec.spool import Spool
+from symulacja_czujnikow.reading import Reading
+
+_MIN_BACKOFF = 0.1
+_MAX_BACKOFF = 5.0
+_LATENCY_SAMPLES = 1024
+
 
 class NetworkClient:
     def __init__(
@@ -13,7 +30,18 @@ class NetworkClient:
             port: int,
             timeout: float = 5.0,
             retries: int = 3,
-            logger: Optional[logging.Logger] = None
+            logger: Optional[logging.Logger] = None,
+            window: int = 1,
+            batch_size: int = 1,
+            max_batch_delay: float = 0.05,
+            binary: bool = False,
+            delta: bool = False,
+            compression_level: int = 6,
+            background: bool = False,
+            queue_size: int = 10000,
+            spool_path: Optional[str] = None,
+            spool_max_bytes: int = 64 * 1024 * 1024,
+            failover: Optional[Callable[[list], None]] = None
     ):
         self.host = host
         self.port = port
@@ -22,41 +50,121 @@ class NetworkClient:
         self.socket: Optional[socket.socket] = None
         self.logger = logger or logging.getLogger(__name__)
         self._connected = False
+        # window > 1 lub batch_size > 1 - tryb potokowy: send nie czeka na ACK,
+        # dopóki liczba niepotwierdzonych odczytów nie przekroczy okna
+        self.window = max(window, batch_size)
+        self.batch_size = batch_size
+        self.max_batch_delay = max_batch_delay
+        # binary=True - klient proponuje protokół binarny (tylko odczyty liczbowe);
+        # domyślnie pozostają linie JSON
+        self.binary = binary or delta
+        # delta=True - ramki binarne kodowane różnicowo per czujnik i (compression_level > 0)
+        # kompresowane zlib; serwer bez tej funkcji dostaje zwykłe ramki binarne
+        self.delta = delta
+        self.compression_level = compression_level
+        # background=True - send tylko wstawia odczyt do ograniczonej kolejki, a wysyłaniem
+        # (z ponawianiem połączenia) zajmuje się wątek w tle; po przepełnieniu kolejki
+        # odczyty trafiają do spoola na dysku i są odtwarzane po powrocie serwera
+        self.background = background
+        self.pipelined = self.window > 1 or self.binary or background
+        self.offered = frozenset(f for f in FEATURES
+                                 if (f != 'binary' or self.binary) and (f != 'delta' or delta))
+        self.features = frozenset()
+        self._sensor_index: Dict[tuple, int] = {}
+        self._framer = LineFramer()
+        self._batch: List[bytes] = []
+        self._batch_started = 0.0
+        # Ramki w locie: (numer ostatniego odczytu, zserializowane odczyty)
+        self._in_flight = deque()
+        self._unacked = 0
+        self._next_seq = 0
+        self.sent = 0
+        self.acked = 0
+        self.failed = 0
+        self.bytes_sent = 0
+        # Rozmiar odczytów jako rekordów stałej długości i faktyczny rozmiar ramek różnicowych
+        self.delta_raw_bytes = 0
+        self.delta_bytes = 0
+        self._queue = queue.Queue(maxsize=queue_size) if background else None
+        self._spool = Spool(spool_path, spool_max_bytes) if background and spool_path else None
+        self._spool_lock = self._spool.lock if self._spool else threading.Lock()
+        # Spool z poprzedniego uruchomienia - nowe odczyty ustawiają się za nim
+        self._spooling = self._spool is not None and self._spool.size > 0
+        self._redeliver: list = []
+        self._sender: Optional[threading.Thread] = None
+        self._closing = threading.Event()
+        # Odczyty przyjęte przez send, jeszcze niepotwierdzone przez serwer
+        self._pending = self._spool.count() if self._spool else 0
+        self.spooled = 0
+        self.replayed = 0
+        self.dropped = 0
+        # Odczyty, których nie udało się dostarczyć, trafiają do failover (np. puli klientów),
+        # która może je wysłać innym połączeniem
+        self.failover = failover
+        # Czas od wysłania do potwierdzenia: (numer ostatniego odczytu w wysyłce, czas wysłania)
+        self._sent_times = deque()
+        self._latencies = deque(maxlen=_LATENCY_SAMPLES)
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    @property
+    def outstanding(self) -> int:
+        # Odczyty przyjęte przez send, a jeszcze niepotwierdzone
+        return self._unacked + len(self._batch)
 
     def connect(self) -> bool:
+        if self.background:
+            # Połączeniem zajmuje się wątek wysyłający - wywołujący nie czeka
+            self._start_sender()
+            return self._connected
+        return self._connect(self.retries)
+
+    def _connect(self, attempts: int) -> bool:
         if self._connected:
             return True
 
-        for attempt in range(1, self.retries + 1):
+        for attempt in range(1, attempts + 1):
             try:
                 self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 self.socket.settimeout(self.timeout)
                 self.socket.connect((self.host, self.port))
+                if self.pipelined:
+                    self._negotiate()
                 self._connected = True
                 self.logger.info(f"Connected to {self.host}:{self.port}")
                 return True
             except (socket.timeout, ConnectionRefusedError, OSError) as e:
                 self.logger.warning(f"Connection attempt {attempt} failed: {str(e)}")
-                if attempt < self.retries:
-                    time.sleep(1)
+                # Przy długiej awarii serwera każda próba zostawiałaby otwarty deskryptor
+                self._disconnect()
+                if attempt < attempts:
+                    self._closing.wait(1)
 
-        self.logger.error(f"Failed to connect after {self.retries} attempts")
+        self.logger.error(f"Failed to connect after {attempts} attempts")
         return False
 
-    def send(self, data: Dict[str, Any]) -> bool:
-        if not self._connected and not self.connect():
-            return False
-
+    def send(self, data: Union[Dict[str, Any], Reading]) -> bool:
+        if self.background:
+            return self._submit(data)
+        if self.pipelined:
+            return self._send_pipelined(data)
         serialized = self._serialize(data)
         if not serialized:
             return False
+        if not self._connected and not self.connect():
+            self._give_up([serialized])
+            return False
 
         for attempt in range(1, self.retries + 1):
             try:
+                start = time.monotonic()
                 self.socket.sendall(serialized + b'\n')
 
                 ack = self.socket.recv(1024).decode().strip()
                 if ack == "ACK":
+                    self._latencies.append(time.monotonic() - start)
                     self.logger.info(f"Data sent and acknowledged: {data}")
                     return True
                 else:
@@ -67,11 +175,60 @@ class NetworkClient:
                     time.sleep(1)
                 continue
 
-        self.logger.error(f"Failed to send data after {self.retries} attempts")
-        self._connected = False
+        self._disconnect()
+        self._give_up([serialized])
         return False
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # Wysyła niepełną ramkę i czeka na potwierdzenie wszystkich odczytów w locie
+        if self.background:
+            return self._wait_idle(timeout)
+        if not self.pipelined:
+            return True
+        if not self._batch and not self._in_flight:
+            return True
+        return self._send_batch(wait_all=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'protocol': 2 if self.features else 1,
+            'features': sorted(self.features),
+            'sent': self.sent,
+            'acked': self.acked,
+            'failed': self.failed,
+            'in_flight': self._unacked,
+            'batched': len(self._batch),
+            'bytes_sent': self.bytes_sent,
+            'compression_ratio': self.delta_raw_bytes / self.delta_bytes if self.delta_bytes else None,
+            'connected': self._connected,
+            'pending': self._pending,
+            'queue_depth': self._queue.qsize() if self._queue else 0,
+            'queue_size': self._queue.maxsize if self._queue else 0,
+            'spool_bytes': self._spool.unacked if self._spool else 0,
+            'spooled': self.spooled,
+            'replayed': self.replayed,
+            'dropped': self.dropped,
+            'ack_latency_p50_ms': self._latency_ms(50),
+            'ack_latency_p99_ms': self._latency_ms(99)
+        }
+
+    def _latency_ms(self, percentile: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        return float(np.percentile(self._latencies, percentile)) * 1000
+
     def close(self) -> None:
+        if self.background:
+            if self._sender is not None:
+                # Przy niedostępnym serwerze nie ma na co czekać - zaległości trafiają do spoola
+                if self._connected:
+                    self.flush(self.timeout)
+                self._closing.set()
+                self._sender.join()
+                self._sender = None
+                self._persist_pending()
+        elif self.pipelined:
+            self.flush()
         if self.socket:
             try:
                 self.socket.close()
@@ -82,15 +239,334 @@ class NetworkClient:
                 self.socket = None
                 self._connected = False
 
-    def _serialize(self, data: Dict[str, Any]) -> Optional[bytes]:
+    def _serialize(self, data: Union[Dict[str, Any], Reading]) -> Optional[bytes]:
         try:
-            if 'timestamp' not in data:
+            if isinstance(data, Reading):
+                data = data.to_dict()
+            elif 'timestamp' not in data:
                 data['timestamp'] = datetime.now().isoformat()
             return json.dumps(data).encode('utf-8')
         except (TypeError, ValueError) as e:
             self.logger.error(f"Serialization error: {str(e)}")
             return None
 
+    def _negotiate(self) -> None:
+        # Powitanie wysyłane przed danymi; stary serwer potraktuje je jak zwykłą
+        # wiadomość i odpowie "ACK" - wtedy klient zostaje przy wersji 1
+        self.socket.sendall(hello_message(self.offered))
+        self._framer = LineFramer()
+        line = None
+        while line is None:
+            if not self._framer.recv_from(self.socket):
+                raise ConnectionError("Connection closed during handshake")
+            messages = self._framer.messages()
+            if messages:
+                line = messages[0]
+        try:
+            hello = parse_hello(json.loads(line.decode('utf-8')))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            hello = None
+        self.features = self.offered.intersection(hello[1]) if hello else frozenset()
+        # Słownik czujników protokołu binarnego obowiązuje w obrębie jednego połączenia
+        self._sensor_index = {}
+        self.logger.info(f"Negotiated protocol features: {sorted(self.features) or 'none (version 1)'}")
+
+    def _send_pipelined(self, data: Union[Dict[str, Any], Reading]) -> bool:
+        item = self._prepare(data)
+        if item is None:
+            return False
+        if not self._batch:
+            self._batch_started = time.monotonic()
+        self._batch.append(item)
+        if len(self._batch) >= self.batch_size or time.monotonic() - self._batch_started >= self.max_batch_delay:
+            return self._send_batch()
+        return True
+
+    def _prepare(self, data: Union[Dict[str, Any], Reading]):
+        if self.binary:
+            # Odczyt przechowywany jako Reading - kodowany binarnie albo do JSON
+            # zależnie od protokołu wynegocjowanego z danym serwerem
+            try:
+                item = data if isinstance(data, Reading) else Reading.from_dict(data)
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.error(f"Binary protocol accepts only sensor readings: {str(e)}")
+                return None
+            return item
+        return self._serialize(data) or None
+
+    def _send_batch(self, wait_all: bool = False) -> bool:
+        batch, self._batch = self._batch, []
+        seq = self._next_seq
+        self._next_seq += len(batch)
+        # Pełne okno (lub flush) - czekanie na potwierdzenia; poza tym tylko odbiór tego, co już przyszło
+        limit = 0 if wait_all else self.window - self.batch_size
+        for attempt in range(1, self.retries + 1):
+            try:
+                payload = b''
+                if not self._connected:
+                    if not self._connect(1 if self.background else self.retries):
+                        break
+                    payload = self._requeue()
+                if batch:
+                    payload += self._enqueue(seq, batch)
+                    self.sent += len(batch)
+                    batch = None
+                if payload:
+                    self.socket.sendall(payload)
+                    self.bytes_sent += len(payload)
+                    self._sent_times.append((self._next_seq - 1, time.monotonic()))
+                while self._in_flight and self._unacked > limit:
+                    self._receive_acks(block=True)
+                self._receive_acks(block=False)
+                return True
+            except (socket.timeout, ConnectionError, OSError) as e:
+                self.logger.warning(f"Send attempt {attempt} failed: {str(e)}")
+                self._disconnect()
+        self._give_up(batch)
+        return False
+
+    def _enqueue(self, seq: int, readings: list) -> bytes:
+        self._unacked += len(readings)
+        if 'binary' in self.features:
+            self._in_flight.append((seq + len(readings) - 1, readings))
+            return self._encode_binary(seq, readings)
+        texts = [r if isinstance(r, bytes) else self._serialize(r) for r in readings]
+        if 'batch' in self.features:
+            self._in_flight.append((seq + len(readings) - 1, readings))
+            return encode_frame(seq, texts)
+        # Stary serwer: każdy odczyt osobną linią z własnym ACK, ale nadal bez czekania
+        self._in_flight.extend((seq + i, [reading]) for i, reading in enumerate(readings))
+        return b'\n'.join(texts) + b'\n'
+
+    def _encode_binary(self, seq: int, readings: List[Reading]) -> bytes:
+        frames = []
+        codes = []
+        index = self._sensor_index
+        for reading in readings:
+            key = (reading.sensor_id, reading.unit)
+            code = index.get(key)
+            if code is None:
+                if len(index) >= MAX_SENSORS:
+                    raise ValueError("Too many sensors for one binary connection")
+                code = index[key] = len(index)
+                frames.append(encode_sensor_frame(code, reading.sensor_id, reading.unit))
+            codes.append(code)
+        if 'delta' in self.features:
+            timestamps = np.fromiter((r.timestamp for r in readings), dtype=np.float64, count=len(readings))
+            values = np.fromiter((r.value for r in readings), dtype=np.float64, count=len(readings))
+            frame = encode_delta_frame(seq, codes, timestamps, values, self.compression_level)
+            self.delta_raw_bytes += RECORD.size * len(readings)
+            self.delta_bytes += len(frame)
+            frames.append(frame)
+        else:
+            frames.append(encode_readings_frame(
+                seq, [RECORD.pack(code, r.timestamp, r.value) for code, r in zip(codes, readings)]))
+        return b''.join(frames)
+
+    def _requeue(self) -> bytes:
+        # Po ponownym połączeniu niepotwierdzone odczyty wysyłane są jeszcze raz, w tej samej
+        # kolejności i z tymi samymi numerami (dostarczenie co najmniej raz), zakodowane
+        # według funkcji wynegocjowanych z nowym połączeniem
+        entries = list(self._in_flight)
+        self._in_flight.clear()
+        self._sent_times.clear()
+        self._unacked = 0
+        return b''.join(self._enqueue(last - len(readings) + 1, readings) for last, readings in entries)
+
+    def _receive_acks(self, block: bool) -> None:
+        if not block:
+            # Gniazdo z timeoutem czeka na dane przed recv - na czas odczytu timeout 0
+            self.socket.settimeout(0.0)
+        try:
+            received = self._framer.recv_from(self.socket)
+        except (BlockingIOError, InterruptedError):
+            return
+        finally:
+            if not block:
+                self.socket.settimeout(self.timeout)
+        if not received:
+            raise ConnectionError("Connection closed by server")
+        for line in self._framer.messages():
+            self._handle_ack(line)
+
+    def _handle_ack(self, line: bytes) -> None:
+        if not self._in_flight:
+            self.logger.warning(f"Unexpected response: {line!r}")
+            return
+        seq = parse_ack(line)
+        if seq is None or seq == -1:
+            # Odpowiedź wersji 1 (lub błąd) dotyczy najstarszej ramki w locie
+            last, readings = self._in_flight.popleft()
+            self._unacked -= len(readings)
+            self._settle(len(readings))
+            self._record_latency(last)
+            if seq is None:
+                self.failed += len(readings)
+                self.logger.warning(f"Invalid ACK received: {line!r}")
+            else:
+                self.acked += len(readings)
+            return
+        while self._in_flight and self._in_flight[0][0] <= seq:
+            _, readings = self._in_flight.popleft()
+            self._unacked -= len(readings)
+            self._settle(len(readings))
+            self.acked += len(readings)
+        self._record_latency(seq)
+
+    def _record_latency(self, seq: int) -> None:
+        # Wysyłka jest potwierdzona, gdy potwierdzono jej ostatni odczyt
+        now = time.monotonic()
+        while self._sent_times and self._sent_times[0][0] <= seq:
+            self._latencies.append(now - self._sent_times.popleft()[1])
+
+    def _disconnect(self) -> None:
+        if self.socket:
+            try:
+                self.socket.close()
+            except OSError:
+                pass
+        self.socket = None
+        self._connected = False
+
+    def _give_up(self, batch) -> None:
+        in_flight = [reading for _, readings in self._in_flight for reading in readings]
+        self._in_flight.clear()
+        self._sent_times.clear()
+        self._unacked = 0
+        if self.background:
+            # Nic nie jest tracone - odczyty wracają na początek kolejki wątku wysyłającego
+            self.sent -= len(in_flight)
+            self._redeliver[:0] = in_flight + list(batch or [])
+            return
+        items = in_flight + list(batch or [])
+        self.failed += len(items)
+        self.logger.error(f"Dropped {len(items)} readings after {self.retries} attempts")
+        if self.failover is not None and items:
+            self.failover(items)
+
+    def _settle(self, count: int) -> None:
+        if self.background:
+            with self._spool_lock:
+                self._pending -= count
+
+    # Tryb z wątkiem wysyłającym
+
+    def _submit(self, data: Union[Dict[str, Any], Reading]) -> bool:
+        item = self._prepare(data)
+        if item is None:
+            return False
+        if self._sender is None:
+            self._start_sender()
+        with self._spool_lock:
+            if not self._spooling:
+                try:
+                    self._queue.put_nowait(item)
+                    self._pending += 1
+                    return True
+                except queue.Full:
+                    # Od tej chwili wszystko trafia do spoola, dopóki nie zostanie odtworzony
+                    self._spooling = self._spool is not None
+            if self._spool is not None and self._spool.append([self._spool_line(item)]):
+                self._pending += 1
+                self.spooled += 1
+                return True
+            self.dropped += 1
+        return False
+
+    def _start_sender(self) -> None:
+        if self._sender is not None and self._sender.is_alive():
+            return
+        self._closing.clear()
+        self._sender = threading.Thread(target=self._sender_loop, name='network-sender', daemon=True)
+        self._sender.start()
+
+    def _sender_loop(self) -> None:
+        backoff = _MIN_BACKOFF
+        while not self._closing.is_set():
+            if not self._connected and not self._connect(1):
+                # Serwer niedostępny - odczyty czekają w kolejce i spoolu, ponowienia z rosnącym odstępem
+                self._closing.wait(backoff)
+                backoff = min(backoff * 2, _MAX_BACKOFF)
+                continue
+            backoff = _MIN_BACKOFF
+            items, from_spool = self._take()
+            if items:
+                self._batch.extend(items)
+                # Odczyty ze spoola zatwierdzane dopiero po potwierdzeniu wszystkich wcześniejszych
+                if self._send_batch(wait_all=from_spool) and from_spool:
+                    self._spool.commit()
+                    self.replayed += len(items)
+            elif self._in_flight:
+                self._send_batch(wait_all=True)
+
+    def _take(self):
+        # Kolejność: odczyty do ponownego wysłania, kolejka w pamięci, spool
+        if self._redeliver:
+            items = self._redeliver[:self.batch_size]
+            del self._redeliver[:self.batch_size]
+            return items, False
+        items = []
+        try:
+            while len(items) < self.batch_size:
+                items.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if items:
+            return items, False
+        if self._spool is not None:
+            with self._spool_lock:
+                lines = self._spool.read(self.window)
+                if self._spool.size == 0:
+                    self._spooling = False
+            if lines:
+                return [self._from_spool(line) for line in lines], True
+        try:
+            items.append(self._queue.get(timeout=self.max_batch_delay))
+        except queue.Empty:
+            pass
+        return items, False
+
+    def _spool_line(self, item) -> bytes:
+        return item if isinstance(item, bytes) else self._serialize(item)
+
+    def _from_spool(self, line: bytes):
+        return Reading.from_dict(json.loads(line)) if self.binary else bytes(line)
+
+    def _wait_idle(self, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._pending > 0:
+            if self._sender is None or not self._sender.is_alive():
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def _persist_pending(self) -> None:
+        # Zaległości z pamięci w kolejności wysyłania: w locie, bieżąca partia, do ponowienia, kolejka
+        items = [reading for _, readings in self._in_flight for reading in readings]
+        items += self._batch + self._redeliver
+        self._in_flight.clear()
+        self._sent_times.clear()
+        self._unacked = 0
+        self._batch, self._redeliver = [], []
+        try:
+            while True:
+                items.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not items:
+            return
+        if self._spool is not None:
+            self._spool.prepend([self._spool_line(item) for item in items])
+            self._spooling = True
+            self.logger.info(f"Spooled {len(items)} pending readings on close")
+        else:
+            with self._spool_lock:
+                self._pending -= len(items)
+            self.dropped += len(items)
+            self.logger.warning(f"Dropped {len(items)} pending readings on close (no spool configured)")
+
     def __enter__(self):
         self.connect()
         return self
@@ -9,9 +9,11 @@ def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
         with open(config_path, 'r') as f:
             config = yaml.safe_load(f)
 
+        # Pojedynczy serwer (host i port) albo lista serwerów dla puli klientów
         required = ['host', 'port']
+        network = config.get('network', {})
         for field in required:
-            if field not in config.get('network', {}):
+            if field not in network and not network.get('endpoints'):
                 raise ValueError(f"Missing required config field: {field}")
 
         return config['network']
@@ -30,6 +32,18 @@ def get_client_config(config_path: str = "config.yaml") -> Dict[str, Any]:
     }
 
 
+def get_pool_config(config_path: str = "config.yaml") -> Dict[str, Any]:
+    config = load_config(config_path)
+    endpoints = config.get('endpoints') or [{'host': config['host'], 'port': config['port']}]
+    return {
+        'endpoints': endpoints,
+        'routing': config.get('routing', 'hash'),
+        'health_interval': config.get('health_interval', 5.0),
+        'timeout': config.get('timeout', 5.0),
+        'retries': config.get('retries', 3)
+    }
+
+
 def get_server_config(config_path: str = "config.yaml") -> Dict[str, Any]:
     config = load_config(config_path)
     return {
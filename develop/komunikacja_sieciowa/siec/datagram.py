@@ -0,0 +1,169 @@
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from komunikacja_sieciowa.siec.client import NetworkClient
+from komunikacja_sieciowa.siec.protocol import (
+    MAX_DATAGRAM, RECORD, datagram_overhead, encode_datagram, sensor_entry
+)
+from symulacja_czujnikow.reading import Reading
+
+
+class DatagramClient:
+    # Wysyłanie bez potwierdzeń: odczyty pakowane do datagramu UDP aż do max_datagram
+    # bajtów (domyślnie MTU Ethernetu) albo max_batch_delay sekund (pilnowane też przez
+    # wątek w tle, gdy kolejne odczyty nie nadchodzą); serwer liczy
+    # utracone i przestawione datagramy po ich numerach. Odczyty wymagające pewnego
+    # dostarczenia idą przez reliable (NetworkClient po TCP) - send(..., reliable=True)
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            max_datagram: int = MAX_DATAGRAM,
+            max_batch_delay: float = 0.05,
+            logger: Optional[logging.Logger] = None,
+            reliable: Optional[NetworkClient] = None
+    ):
+        if max_datagram < datagram_overhead() + RECORD.size + 2:
+            raise ValueError("Datagram size too small for a single reading")
+        self.host = host
+        self.port = port
+        self.max_datagram = max_datagram
+        self.max_batch_delay = max_batch_delay
+        self.logger = logger or logging.getLogger(__name__)
+        self.reliable = reliable
+        self.socket: Optional[socket.socket] = None
+        # Losowy identyfikator strumienia - po restarcie klienta numeracja zaczyna się od nowa
+        (self.stream,) = struct.unpack('<I', os.urandom(4))
+        self._seq = 0
+        self._codes: Dict[tuple, int] = {}
+        self._entries: List[bytes] = []
+        self._records: List[bytes] = []
+        self._size = datagram_overhead()
+        self._batch_started = 0.0
+        self._lock = threading.Lock()
+        self._closing = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        self.datagrams = 0
+        self.sent = 0
+        self.bytes_sent = 0
+        self.errors = 0
+        self.dropped = 0
+
+    def connect(self) -> bool:
+        if self.socket is None:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            # connect na gnieździe UDP tylko ustala adresata - bez wymiany z serwerem
+            self.socket.connect((self.host, self.port))
+        if self._timer is None and self.max_batch_delay > 0:
+            self._closing.clear()
+            self._timer = threading.Thread(target=self._flush_loop, name='datagram-flush', daemon=True)
+            self._timer.start()
+        if self.reliable is not None:
+            return self.reliable.connect()
+        return True
+
+    def send(self, data: Union[Dict[str, Any], Reading], reliable: bool = False) -> bool:
+        if reliable:
+            if self.reliable is None:
+                raise ValueError("No reliable client configured")
+            return self.reliable.send(data)
+        try:
+            reading = data if isinstance(data, Reading) else Reading.from_dict(data)
+            key = (reading.sensor_id, reading.unit)
+            entry = sensor_entry(*key)
+        except (KeyError, TypeError, ValueError) as e:
+            self.logger.error(f"Datagram transport accepts only sensor readings: {str(e)}")
+            return False
+        with self._lock:
+            code = self._codes.get(key)
+            # Nowy czujnik zajmuje też miejsce w tablicy czujników datagramu
+            needed = RECORD.size + (len(entry) if code is None else 0)
+            if self._size + needed > self.max_datagram:
+                self._flush()
+                code = None
+                needed = RECORD.size + len(entry)
+                if self._size + needed > self.max_datagram:
+                    self.logger.error(f"Reading of {reading.sensor_id} does not fit in a datagram")
+                    return False
+            if code is None:
+                code = self._codes[key] = len(self._entries)
+                self._entries.append(entry)
+                self._size += len(entry)
+            if not self._records:
+                self._batch_started = time.monotonic()
+            self._records.append(RECORD.pack(code, reading.timestamp, reading.value))
+            self._size += RECORD.size
+            if time.monotonic() - self._batch_started >= self.max_batch_delay:
+                self._flush()
+        return True
+
+    def flush(self) -> bool:
+        with self._lock:
+            return self._flush()
+
+    def _flush_loop(self) -> None:
+        # Niepełny datagram wysyłany po max_batch_delay także bez kolejnego send()
+        while not self._closing.wait(self.max_batch_delay / 2):
+            with self._lock:
+                if self._records and time.monotonic() - self._batch_started >= self.max_batch_delay:
+                    self._flush()
+
+    def _flush(self) -> bool:
+        if not self._records:
+            return True
+        datagram = encode_datagram(self.stream, self._seq, self._entries, self._records)
+        count = len(self._records)
+        self._seq += 1
+        self._codes, self._entries, self._records = {}, [], []
+        self._size = datagram_overhead()
+        try:
+            if self.socket is None:
+                self.connect()
+            self.socket.send(datagram)
+        except OSError as e:
+            # Np. ICMP "port unreachable" z poprzedniego datagramu - odczyty przepadają
+            self.errors += 1
+            self.dropped += count
+            self.logger.warning(f"Datagram send failed: {str(e)}")
+            return False
+        self.datagrams += 1
+        self.sent += count
+        self.bytes_sent += len(datagram)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'stream': self.stream,
+            'datagrams': self.datagrams,
+            'sent': self.sent,
+            'bytes_sent': self.bytes_sent,
+            'readings_per_datagram': self.sent / self.datagrams if self.datagrams else 0.0,
+            'batched': len(self._records),
+            'errors': self.errors,
+            'dropped': self.dropped,
+            'reliable': self.reliable.stats() if self.reliable is not None else None
+        }
+
+    def close(self) -> None:
+        self._closing.set()
+        if self._timer is not None:
+            self._timer.join()
+            self._timer = None
+        self.flush()
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+        if self.reliable is not None:
+            self.reliable.close()
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,105 @@
+import socket
+import struct
+from typing import List
+
+LENGTH_PREFIX = struct.Struct('<I')
+
+
+class FrameTooLong(Exception):
+    pass
+
+
+class Framer:
+    # Bufor odbiorczy wielokrotnego użytku: recv_into pisze bezpośrednio do bytearray,
+    # kopiowany jest tylko niedokończony ogon; podklasy wyznaczają granice wiadomości
+    def __init__(self, size: int = 4096, max_size: int = 1 << 20):
+        self.max_size = max_size
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.start = 0
+        self.end = 0
+        self.scan = 0
+
+    @property
+    def pending(self) -> int:
+        return self.end - self.start
+
+    def recv_from(self, sock: socket.socket) -> int:
+        if self.end == len(self.buffer):
+            self._make_room()
+        received = sock.recv_into(self.view[self.end:])
+        self.end += received
+        return received
+
+    def feed(self, data: bytes) -> None:
+        if len(self.buffer) - self.end < len(data):
+            self._make_room(len(data))
+        self.buffer[self.end:self.end + len(data)] = data
+        self.end += len(data)
+
+    def take_over(self, other: 'Framer') -> 'Framer':
+        # Zmiana protokołu w trakcie połączenia - nieprzetworzone bajty przechodzą do nowego framera
+        if other.pending:
+            self.feed(bytes(other.view[other.start:other.end]))
+        return self
+
+    def messages(self) -> List[bytes]:
+        raise NotImplementedError
+
+    def _consumed(self, pos: int) -> None:
+        self.start = pos
+        if self.start == self.end:
+            self.start = self.end = self.scan = 0
+
+    def _make_room(self, needed: int = 1) -> None:
+        pending = self.end - self.start
+        size = len(self.buffer)
+        if pending <= size // 2 and size - pending >= needed:
+            # Dość miejsca po przesunięciu ogona na początek bufora
+            self.buffer[:pending] = bytes(self.view[self.start:self.end])
+        else:
+            if pending + needed > self.max_size:
+                raise FrameTooLong(f"Message exceeds {self.max_size} bytes")
+            self.view.release()
+            buffer = bytearray(min(max(size * 2, pending + needed), self.max_size))
+            buffer[:pending] = self.buffer[self.start:self.end]
+            self.buffer = buffer
+            self.view = memoryview(buffer)
+        self.scan -= self.start
+        self.start, self.end = 0, pending
+
+
+class LineFramer(Framer):
+    # Protokół tekstowy: jedna wiadomość na linię
+    def messages(self) -> List[bytes]:
+        result = []
+        buffer, pos = self.buffer, self.start
+        while True:
+            newline = buffer.find(b'\n', self.scan, self.end)
+            if newline < 0:
+                break
+            result.append(buffer[pos:newline])
+            pos = self.scan = newline + 1
+        # Kolejne wyszukiwanie zaczyna się za już sprawdzonymi bajtami
+        self.scan = self.end
+        self._consumed(pos)
+        return result
+
+
+class LengthPrefixedFramer(Framer):
+    # Protokół binarny: każda ramka poprzedzona 4-bajtową długością (little-endian)
+    def messages(self) -> List[bytes]:
+        result = []
+        buffer, pos, end = self.buffer, self.start, self.end
+        while end - pos >= LENGTH_PREFIX.size:
+            (length,) = LENGTH_PREFIX.unpack_from(buffer, pos)
+            if length + LENGTH_PREFIX.size > self.max_size:
+                raise FrameTooLong(f"Frame exceeds {self.max_size} bytes")
+            if end - pos - LENGTH_PREFIX.size < length:
+                break
+            pos += LENGTH_PREFIX.size
+            result.append(buffer[pos:pos + length])
+            pos += length
+        self.scan = end
+        self._consumed(pos)
+        return result
@@ -0,0 +1,211 @@
+import json
+import logging
+import socket
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from komunikacja_sieciowa.siec.client import NetworkClient
+from symulacja_czujnikow.reading import Reading
+
+ROUTING = ('hash', 'least_outstanding')
+
+EndpointSpec = Union[str, Tuple[str, int], Dict[str, Any]]
+
+
+def parse_endpoint(spec: EndpointSpec) -> Tuple[str, int]:
+    # "host:port", (host, port) albo {"host": ..., "port": ...}
+    if isinstance(spec, str):
+        host, _, port = spec.rpartition(':')
+        if not host:
+            raise ValueError(f"Invalid endpoint: {spec}")
+        return host, int(port)
+    if isinstance(spec, dict):
+        return spec['host'], int(spec['port'])
+    host, port = spec
+    return host, int(port)
+
+
+class Endpoint:
+    __slots__ = ('host', 'port', 'client', 'healthy', 'routed', 'failed_over', 'started')
+
+    def __init__(self, host: str, port: int, client: NetworkClient):
+        self.host = host
+        self.port = port
+        self.client = client
+        self.healthy = True
+        self.routed = 0
+        self.failed_over = 0
+        self.started = time.monotonic()
+
+    @property
+    def name(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+class ClientPool:
+    # Trwałe połączenia do kilku serwerów: odczyt kierowany według skrótu sensor_id
+    # (ten sam czujnik zawsze do tego samego serwera) albo do połączenia z najmniejszą
+    # liczbą niepotwierdzonych odczytów; odczyty utracone przez jedno połączenie
+    # są przekazywane do pozostałych
+    def __init__(
+            self,
+            endpoints: Iterable[EndpointSpec],
+            routing: str = 'hash',
+            health_interval: float = 5.0,
+            logger: Optional[logging.Logger] = None,
+            **client_options
+    ):
+        if routing not in ROUTING:
+            raise ValueError(f"Unknown routing: {routing}")
+        if client_options.get('background'):
+            # Klient w tle trzyma odczyty w kolejce swojego serwera - nie da się ich przekierować
+            raise ValueError("ClientPool does not support background clients")
+        self.routing = routing
+        self.health_interval = health_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self.endpoints: List[Endpoint] = []
+        for spec in endpoints:
+            host, port = parse_endpoint(spec)
+            client = NetworkClient(host, port, logger=self.logger, **client_options)
+            endpoint = Endpoint(host, port, client)
+            client.failover = lambda items, endpoint=endpoint: self._failover(endpoint, items)
+            self.endpoints.append(endpoint)
+        if not self.endpoints:
+            raise ValueError("ClientPool needs at least one endpoint")
+        self.failed = 0
+        self.failovers = 0
+        self._routes: Dict[str, Endpoint] = {}
+        self._lock = threading.Lock()
+        self._handoff: Optional[bool] = None
+        self._closing = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config_path: str, **client_options) -> 'ClientPool':
+        from komunikacja_sieciowa.siec.config import get_pool_config
+        config = get_pool_config(config_path)
+        return cls(config.pop('endpoints'), **{**config, **client_options})
+
+    def connect(self) -> bool:
+        for endpoint in self.endpoints:
+            if not endpoint.client.connect():
+                self._set_health(endpoint, False)
+        if self._health_thread is None:
+            self._closing.clear()
+            self._health_thread = threading.Thread(target=self._health_loop, name='pool-health', daemon=True)
+            self._health_thread.start()
+        return any(endpoint.healthy for endpoint in self.endpoints)
+
+    def send(self, data: Union[Dict[str, Any], Reading]) -> bool:
+        endpoint = self._route(self._key(data))
+        if endpoint is None:
+            self.failed += 1
+            return False
+        self._handoff = None
+        if endpoint.client.send(data):
+            endpoint.routed += 1
+            return True
+        # Połączenie zawiodło - odczyt (i wszystkie niepotwierdzone) przekazany już innym serwerom;
+        # bez przekazania send klienta odrzucił sam odczyt (np. niepoprawny)
+        return bool(self._handoff)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # Przekierowanie w trakcie flush dokłada odczyty innym połączeniom - powtarzane do skutku
+        for _ in range(len(self.endpoints) + 1):
+            failovers = self.failovers
+            for endpoint in self.endpoints:
+                if endpoint.healthy:
+                    endpoint.client.flush(timeout)
+            if self.failovers == failovers:
+                return True
+        return False
+
+    def close(self) -> None:
+        self.flush()
+        self._closing.set()
+        if self._health_thread is not None:
+            self._health_thread.join()
+            self._health_thread = None
+        for endpoint in self.endpoints:
+            endpoint.client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        endpoints = {}
+        for endpoint in self.endpoints:
+            client = endpoint.client.stats()
+            elapsed = time.monotonic() - endpoint.started
+            endpoints[endpoint.name] = {
+                'healthy': endpoint.healthy,
+                'routed': endpoint.routed,
+                'failed_over': endpoint.failed_over,
+                'acked': client['acked'],
+                'in_flight': client['in_flight'],
+                'throughput': client['acked'] / elapsed if elapsed > 0 else 0.0,
+                'ack_latency_p50_ms': client['ack_latency_p50_ms'],
+                'ack_latency_p99_ms': client['ack_latency_p99_ms'],
+                'bytes_sent': client['bytes_sent']
+            }
+        return {
+            'routing': self.routing,
+            'healthy': sum(e.healthy for e in self.endpoints),
+            'failovers': self.failovers,
+            'failed': self.failed,
+            'endpoints': endpoints
+        }
+
+    def _key(self, data: Union[Dict[str, Any], Reading]) -> str:
+        if isinstance(data, Reading):
+            return data.sensor_id
+        return str(data.get('sensor_id', '')) if isinstance(data, dict) else ''
+
+    def _route(self, key: str) -> Optional[Endpoint]:
+        if self.routing == 'least_outstanding':
+            healthy = [e for e in self.endpoints if e.healthy]
+            if not healthy:
+                return None
+            return min(healthy, key=lambda e: (e.client.outstanding, e.routed))
+        endpoint = self._routes.get(key)
+        if endpoint is not None and endpoint.healthy:
+            return endpoint
+        # Haszowanie rendezvous: po awarii serwera przenoszą się tylko jego czujniki
+        with self._lock:
+            healthy = [e for e in self.endpoints if e.healthy]
+            if not healthy:
+                return None
+            endpoint = max(healthy, key=lambda e: zlib.crc32(f"{key}|{e.name}".encode('utf-8')))
+            self._routes[key] = endpoint
+        return endpoint
+
+    def _failover(self, endpoint: Endpoint, items: list) -> None:
+        self._set_health(endpoint, False)
+        endpoint.failed_over += len(items)
+        self.failovers += 1
+        self.logger.warning(f"Endpoint {endpoint.name} failed, rerouting {len(items)} readings")
+        delivered = False
+        for item in items:
+            data = item if isinstance(item, Reading) else json.loads(item)
+            delivered = self.send(data)
+        # Ostatni element to odczyt z bieżącego wywołania send
+        self._handoff = delivered
+
+    def _set_health(self, endpoint: Endpoint, healthy: bool) -> None:
+        with self._lock:
+            if endpoint.healthy == healthy:
+                return
+            endpoint.healthy = healthy
+            self._routes.clear()
+        self.logger.info(f"Endpoint {endpoint.name} is {'up' if healthy else 'down'}")
+
+    def _health_loop(self) -> None:
+        # Niedostępne serwery sprawdzane próbą połączenia; klient połączy się sam przy następnym send
+        while not self._closing.wait(self.health_interval):
+            for endpoint in self.endpoints:
+                if endpoint.healthy:
+                    continue
+                try:
+                    socket.create_connection((endpoint.host, endpoint.port), timeout=1).close()
+                except OSError:
+                    continue
+                self._set_health(endpoint, True)
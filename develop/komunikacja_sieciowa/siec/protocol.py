@@ -0,0 +1,270 @@
+import json
+import struct
+import zlib
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from komunikacja_sieciowa.siec.framing import LENGTH_PREFIX
+
+# Wersja 1: jedna wiadomość JSON na linię, odpowiedź "ACK" na każdą linię.
+# Wersja 2: po wymianie powitań klient wysyła ramki z wieloma odczytami
+# {"seq": <numer pierwszego odczytu>, "readings": [...]}, a serwer potwierdza
+# zbiorczo "ACK <seq>" - wszystkie odczyty do numeru seq włącznie.
+# Funkcja "binary": po powitaniu klient wysyła ramki binarne poprzedzone długością,
+# odpowiedzi serwera pozostają liniami tekstu.
+# Funkcja "delta" (razem z "binary"): odczyty wysyłane ramkami FRAME_DELTA
+PROTOCOL_VERSION = 2
+FEATURES = ('batch', 'binary', 'delta')
+
+ACK = b"ACK\n"
+ERROR_JSON = b"ERROR: Invalid JSON\n"
+ERROR_TOO_LONG = b"ERROR: Message too long\n"
+ERROR_FRAME = b"ERROR: Invalid frame\n"
+
+# Ramka binarna: [długość u32][typ u8][treść]
+# FRAME_SENSOR   - wpis słownika połączenia: indeks u16, sensor_id i jednostka w utf-8 rozdzielone \0
+# FRAME_READINGS - numer pierwszego odczytu u64, liczba rekordów u32, rekordy RECORD
+# FRAME_DELTA    - numer pierwszego odczytu u64, liczba odczytów u32, flagi u8, a dalej
+#                  (po zlib, jeśli ustawiona flaga DELTA_ZLIB) kolumny: indeksy czujników u16,
+#                  czasy jako delta-of-delta wzorców bitowych float64 i wartości jako XOR
+#                  z poprzednią wartością - obie liczone osobno dla każdego czujnika
+#                  i zapisane bajtami znaczącymi (najpierw wszystkie najstarsze bajty)
+FRAME_SENSOR = 1
+FRAME_READINGS = 2
+FRAME_DELTA = 3
+DELTA_ZLIB = 1
+MAX_SENSORS = 1 << 16
+_SENSOR_HEADER = struct.Struct('<BH')
+_READINGS_HEADER = struct.Struct('<BQI')
+_DELTA_HEADER = struct.Struct('<BQIB')
+
+# Datagram UDP (bez potwierdzeń): nagłówek [b'SD'][wersja u8][strumień u32][numer datagramu u64],
+# tablica czujników [liczba u16][długość u8 + sensor_id\0jednostka]... i rekordy [liczba u16][RECORD]...
+# Każdy datagram jest samodzielny - utrata jednego nie psuje dekodowania następnych
+DATAGRAM_MAGIC = b'SD'
+DATAGRAM_VERSION = 1
+DATAGRAM_HEADER = struct.Struct('<2sBIQ')
+_COUNT = struct.Struct('<H')
+# 1500 bajtów MTU Ethernetu minus nagłówki IPv4 i UDP
+MAX_DATAGRAM = 1472
+RECORD = struct.Struct('<Hdd')
+RECORD_DTYPE = np.dtype([('sensor', '<u2'), ('timestamp', '<f8'), ('value', '<f8')])
+
+
+def hello_message(features: Iterable[str]) -> bytes:
+    return json.dumps({'hello': {'version': PROTOCOL_VERSION, 'features': sorted(features)}}).encode('utf-8') + b'\n'
+
+
+def parse_hello(decoded: Any) -> Optional[Tuple[int, List[str]]]:
+    # Zwraca (wersja, funkcje) albo None, jeśli wiadomość nie jest powitaniem
+    if not isinstance(decoded, dict) or len(decoded) != 1 or not isinstance(decoded.get('hello'), dict):
+        return None
+    hello = decoded['hello']
+    features = hello.get('features', [])
+    return int(hello.get('version', 1)), [f for f in features if isinstance(f, str)]
+
+
+def encode_frame(seq: int, readings: List[bytes]) -> bytes:
+    # Odczyty są już zserializowane - ramka sklejana bez ponownego json.dumps
+    return b'{"seq": %d, "readings": [%s]}\n' % (seq, b', '.join(readings))
+
+
+def parse_frame(decoded: Any) -> Optional[Tuple[int, list]]:
+    if (isinstance(decoded, dict) and len(decoded) == 2 and isinstance(decoded.get('seq'), int)
+            and isinstance(decoded.get('readings'), list)):
+        return decoded['seq'], decoded['readings']
+    return None
+
+
+def ack_message(seq: int) -> bytes:
+    return b"ACK %d\n" % seq
+
+
+def parse_ack(line: bytes) -> Optional[int]:
+    # "ACK <seq>" -> seq; samo "ACK" (wersja 1) -> -1; cokolwiek innego -> None
+    parts = line.strip().split()
+    if not parts or parts[0] != b'ACK' or len(parts) > 2:
+        return None
+    if len(parts) == 1:
+        return -1
+    try:
+        return int(parts[1])
+    except ValueError:
+        return None
+
+
+def encode_sensor_frame(index: int, sensor_id: str, unit: str) -> bytes:
+    body = _SENSOR_HEADER.pack(FRAME_SENSOR, index) + f"{sensor_id}\0{unit}".encode('utf-8')
+    return LENGTH_PREFIX.pack(len(body)) + body
+
+
+def decode_sensor_frame(frame: bytes) -> Tuple[int, str, str]:
+    _, index = _SENSOR_HEADER.unpack_from(frame)
+    sensor_id, unit = bytes(frame[_SENSOR_HEADER.size:]).decode('utf-8').split('\0')
+    return index, sensor_id, unit
+
+
+def encode_readings_frame(seq: int, records: List[bytes]) -> bytes:
+    # records - rekordy już spakowane przez RECORD.pack
+    length = _READINGS_HEADER.size + RECORD.size * len(records)
+    return b''.join([LENGTH_PREFIX.pack(length), _READINGS_HEADER.pack(FRAME_READINGS, seq, len(records))] + records)
+
+
+def decode_readings_frame(frame: bytes) -> Tuple[int, np.ndarray]:
+    # Rekordy zwracane jako widok na bufor ramki - bez kopiowania i obiektów na rekord
+    _, seq, count = _READINGS_HEADER.unpack_from(frame)
+    if len(frame) != _READINGS_HEADER.size + count * RECORD.size:
+        raise ValueError("Readings frame length does not match record count")
+    return seq, np.frombuffer(frame, dtype=RECORD_DTYPE, count=count, offset=_READINGS_HEADER.size)
+
+
+def _group_starts(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Odczyty ułożone czujnikami (stabilnie) i maska początków grup
+    order = np.argsort(codes, kind='stable')
+    grouped = codes[order]
+    starts = np.ones(len(codes), dtype=bool)
+    starts[1:] = grouped[1:] != grouped[:-1]
+    return order, starts
+
+
+def _delta(x: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    # Różnica z poprzednim elementem segmentu; arytmetyka uint64 modulo 2^64 - bezstratnie
+    prev = np.empty_like(x)
+    prev[0] = 0
+    prev[1:] = x[:-1]
+    prev[starts] = 0
+    return x - prev
+
+
+def _undelta(d: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    total = np.cumsum(d, dtype=np.uint64)
+    index = np.flatnonzero(starts)
+    base = total[index] - d[index]
+    return total - base[np.cumsum(starts) - 1]
+
+
+def _xor(x: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    prev = np.empty_like(x)
+    prev[0] = 0
+    prev[1:] = x[:-1]
+    prev[starts] = 0
+    return x ^ prev
+
+
+def _unxor(d: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    total = np.bitwise_xor.accumulate(d)
+    index = np.flatnonzero(starts)
+    base = total[index] ^ d[index]
+    return total ^ base[np.cumsum(starts) - 1]
+
+
+def _second_starts(starts: np.ndarray) -> np.ndarray:
+    # Pierwsza różnica czujnika zapisywana wprost, jak w Gorilli - delta-of-delta od drugiej
+    result = starts.copy()
+    result[1:] |= starts[:-1]
+    return result
+
+
+def _shuffle(x: np.ndarray) -> bytes:
+    return x.view(np.uint8).reshape(-1, 8).T.tobytes()
+
+
+def _unshuffle(data, count: int) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint8, count=8 * count).reshape(8, count).T.copy().view('<u8').ravel()
+
+
+def encode_delta_frame(seq: int, codes: np.ndarray, timestamps: np.ndarray, values: np.ndarray,
+                       level: int = 6) -> bytes:
+    # level 0 - bez kompresji zlib, same kolumny różnicowe
+    codes = np.asarray(codes, dtype='<u2')
+    count = len(codes)
+    body = codes.tobytes()
+    if count:
+        order, starts = _group_starts(codes)
+        bits = np.asarray(timestamps, dtype='<f8').view('<u8')[order]
+        dod = _delta(_delta(bits, starts), _second_starts(starts))
+        xor = _xor(np.asarray(values, dtype='<f8').view('<u8')[order], starts)
+        body += _shuffle(dod) + _shuffle(xor)
+    flags = 0
+    if level:
+        body = zlib.compress(body, level)
+        flags |= DELTA_ZLIB
+    header = _DELTA_HEADER.pack(FRAME_DELTA, seq, count, flags)
+    return LENGTH_PREFIX.pack(len(header) + len(body)) + header + body
+
+
+def decode_delta_frame(frame: bytes) -> Tuple[int, np.ndarray]:
+    _, seq, count, flags = _DELTA_HEADER.unpack_from(frame)
+    expected = count * RECORD.size
+    body = frame[_DELTA_HEADER.size:]
+    if flags & DELTA_ZLIB:
+        # Rozmiar po dekompresji znany z nagłówka - ramka nie rozpakuje się ponad niego
+        decompressor = zlib.decompressobj()
+        try:
+            body = decompressor.decompress(body, expected + 1)
+        except zlib.error as e:
+            raise ValueError(f"Invalid compressed frame: {e}")
+        if not decompressor.eof:
+            raise ValueError("Compressed frame does not match record count")
+    if len(body) != expected:
+        raise ValueError("Delta frame length does not match record count")
+    records = np.empty(count, dtype=RECORD_DTYPE)
+    if count:
+        codes = np.frombuffer(body, dtype='<u2', count=count)
+        order, starts = _group_starts(codes)
+        offset = 2 * count
+        dod = _unshuffle(body[offset:], count)
+        xor = _unshuffle(body[offset + 8 * count:], count)
+        bits = _undelta(_undelta(dod, _second_starts(starts)), starts)
+        records['sensor'] = codes
+        records['timestamp'][order] = bits.view('<f8')
+        records['value'][order] = _unxor(xor, starts).view('<f8')
+    return seq, records
+
+
+def sensor_entry(sensor_id: str, unit: str) -> bytes:
+    # Wpis tablicy czujników datagramu, razem z bajtem długości
+    data = f"{sensor_id}\0{unit}".encode('utf-8')
+    if len(data) > 255:
+        raise ValueError("Sensor id and unit too long for a datagram")
+    return bytes((len(data),)) + data
+
+
+def datagram_overhead() -> int:
+    return DATAGRAM_HEADER.size + 2 * _COUNT.size
+
+
+def encode_datagram(stream: int, seq: int, entries: List[bytes], records: List[bytes]) -> bytes:
+    # entries - wyniki sensor_entry, records - rekordy spakowane przez RECORD.pack
+    return b''.join([DATAGRAM_HEADER.pack(DATAGRAM_MAGIC, DATAGRAM_VERSION, stream, seq),
+                     _COUNT.pack(len(entries))] + entries + [_COUNT.pack(len(records))] + records)
+
+
+def decode_datagram(data: bytes) -> Tuple[int, int, List[str], List[str], np.ndarray]:
+    if len(data) < datagram_overhead():
+        raise ValueError("Datagram too short")
+    magic, version, stream, seq = DATAGRAM_HEADER.unpack_from(data)
+    if magic != DATAGRAM_MAGIC or version != DATAGRAM_VERSION:
+        raise ValueError("Not a sensor datagram")
+    pos = DATAGRAM_HEADER.size
+    try:
+        (sensors,) = _COUNT.unpack_from(data, pos)
+        pos += _COUNT.size
+        sensor_ids, units = [], []
+        for _ in range(sensors):
+            length = data[pos]
+            sensor_id, unit = bytes(data[pos + 1:pos + 1 + length]).decode('utf-8').split('\0')
+            sensor_ids.append(sensor_id)
+            units.append(unit)
+            pos += 1 + length
+        (count,) = _COUNT.unpack_from(data, pos)
+    except (IndexError, struct.error):
+        raise ValueError("Truncated datagram")
+    pos += _COUNT.size
+    if len(data) - pos != count * RECORD.size:
+        raise ValueError("Datagram length does not match record count")
+    records = np.frombuffer(data, dtype=RECORD_DTYPE, count=count, offset=pos)
+    if count and records['sensor'].max() >= sensors:
+        raise ValueError("Unknown sensor index")
+    return stream, seq, sensor_ids, units, records
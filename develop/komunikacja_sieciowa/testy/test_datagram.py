@@ -0,0 +1,170 @@
+import socket
+import threading
+import time
+import unittest
+
+from komunikacja_sieciowa.serwer.datagram import DatagramStats, SequenceTracker
+from komunikacja_sieciowa.serwer.server import NetworkServer
+from komunikacja_sieciowa.siec.client import NetworkClient
+from komunikacja_sieciowa.siec.datagram import DatagramClient
+from komunikacja_sieciowa.siec.protocol import (
+    MAX_DATAGRAM, RECORD, decode_datagram, encode_datagram, sensor_entry
+)
+from komunikacja_sieciowa.testy.test_network import RecordingServer
+from komunikacja_sieciowa.testy.test_sinks import SlowSink
+from symulacja_czujnikow.reading import Reading
+
+
+def datagram(stream, seq, value=1.0):
+    return encode_datagram(stream, seq, [sensor_entry('temp_1', 'C')], [RECORD.pack(0, 1749551400.0 + seq, value)])
+
+
+class TestDatagramProtocol(unittest.TestCase):
+
+    def test_round_trip(self):
+        entries = [sensor_entry('temp_1', 'C'), sensor_entry('press_1', 'hPa')]
+        records = [RECORD.pack(i % 2, 1749551400.0 + i, float(i)) for i in range(10)]
+        stream, seq, sensor_ids, units, decoded = decode_datagram(encode_datagram(7, 42, entries, records))
+        self.assertEqual((stream, seq), (7, 42))
+        self.assertEqual(sensor_ids, ['temp_1', 'press_1'])
+        self.assertEqual(units, ['C', 'hPa'])
+        self.assertEqual(decoded['value'].tolist(), [float(i) for i in range(10)])
+        self.assertEqual(decoded['sensor'].tolist(), [i % 2 for i in range(10)])
+
+    def test_invalid_datagrams(self):
+        data = datagram(1, 0)
+        for invalid in (b'', b'XX' + data[2:], data[:-1], data[:20], data + b'\0'):
+            with self.assertRaises(ValueError):
+                decode_datagram(invalid)
+        unknown = encode_datagram(1, 0, [sensor_entry('temp_1', 'C')], [RECORD.pack(1, 0.0, 0.0)])
+        with self.assertRaises(ValueError):
+            decode_datagram(unknown)
+
+    def test_sensor_entry_too_long(self):
+        with self.assertRaises(ValueError):
+            sensor_entry('x' * 300, 'C')
+
+
+class TestSequenceTracker(unittest.TestCase):
+
+    def test_gap_reorder_and_duplicate(self):
+        tracker = SequenceTracker()
+        for seq in (0, 1, 4):
+            self.assertTrue(tracker.update(seq))
+        self.assertEqual(tracker.lost, 2)
+        # Spóźniony datagram z luki nie jest już liczony jako utracony
+        self.assertTrue(tracker.update(2))
+        self.assertEqual((tracker.lost, tracker.reordered), (1, 1))
+        self.assertFalse(tracker.update(2))
+        self.assertFalse(tracker.update(4))
+        self.assertEqual((tracker.datagrams, tracker.duplicates), (4, 2))
+
+    def test_streams_are_tracked_separately(self):
+        stats = DatagramStats()
+        # Ten sam numer w innym strumieniu (lub z innego adresu) nie jest duplikatem
+        for source, stream, seq in ((('a', 1), 1, 0), (('a', 1), 2, 0), (('b', 1), 1, 0), (('a', 1), 1, 3)):
+            self.assertTrue(stats.record(source, stream, seq, 10))
+        result = stats.stats()
+        self.assertEqual(result['streams'], 3)
+        self.assertEqual((result['datagrams'], result['lost'], result['duplicates']), (4, 2, 0))
+        self.assertEqual(result['readings'], 40)
+
+
+class TestDatagramTransport(unittest.TestCase):
+
+    def readings(self, n):
+        return [Reading(f'temp_{i % 3}', 20.0 + i / 10, 'C', 1749551400.0 + i) for i in range(n)]
+
+    def test_readings_are_packed_up_to_mtu(self):
+        with RecordingServer(udp=True) as server:
+            client = DatagramClient('127.0.0.1', server.port, max_batch_delay=10)
+            client.connect()
+            for reading in self.readings(1000):
+                self.assertTrue(client.send(reading))
+            client.close()
+            stats = client.stats()
+            self.assertLessEqual(stats['bytes_sent'] / stats['datagrams'], MAX_DATAGRAM)
+            self.assertGreater(stats['readings_per_datagram'], 60)
+            deadline = time.monotonic() + 5
+            while server.stats()['udp']['readings'] < 1000 and time.monotonic() < deadline:
+                time.sleep(0.02)
+        self.assertEqual(len(server.received), 1000)
+        self.assertEqual(server.received[5], self.readings(6)[5].to_dict())
+        udp = server.stats()['udp']
+        self.assertEqual(udp['datagrams'], stats['datagrams'])
+        self.assertEqual((udp['lost'], udp['invalid']), (0, 0))
+
+    def test_partial_datagram_is_sent_after_delay_without_next_send(self):
+        with RecordingServer(udp=True) as server:
+            client = DatagramClient('127.0.0.1', server.port, max_batch_delay=0.05)
+            client.connect()
+            self.assertTrue(client.send(Reading('temp_1', 21.5, 'C', 1749551400.0)))
+            deadline = time.monotonic() + 5
+            while server.stats()['udp']['readings'] < 1 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            self.assertEqual(client.stats()['datagrams'], 1)
+            self.assertEqual(server.stats()['udp']['readings'], 1)
+            client.close()
+
+    def test_full_sink_queue_drops_datagrams_without_blocking(self):
+        server = NetworkServer(port=0, udp=True, sinks=[SlowSink(0.5)], sink_queue_size=1, sink_latency_ms=0)
+        thread = threading.Thread(target=server.start, daemon=True)
+        thread.start()
+        while not server.port:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        started = time.monotonic()
+        for seq in range(20):
+            sock.sendto(datagram(3, seq), ('127.0.0.1', server.port))
+            time.sleep(0.005)
+        sock.close()
+        # Pętla zdarzeń nie czeka na odbiorców - wszystkie datagramy policzone od razu
+        while server.stats()['udp']['datagrams'] < 20 and time.monotonic() - started < 5:
+            time.sleep(0.01)
+        elapsed = time.monotonic() - started
+        udp = server.stats()['udp']
+        server.stop()
+        thread.join(timeout=5)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(udp['datagrams'], 20)
+        self.assertGreater(udp['dropped'], 0)
+        self.assertEqual(udp['dropped'], server.stats()['pipeline']['dropped'])
+
+    def test_server_counts_gaps_reordering_and_invalid(self):
+        with RecordingServer(udp=True) as server:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            for seq in (0, 1, 3, 5, 2, 2):
+                sock.sendto(datagram(9, seq), ('127.0.0.1', server.port))
+            sock.sendto(b'garbage', ('127.0.0.1', server.port))
+            deadline = time.monotonic() + 5
+            while server.stats()['udp']['invalid'] < 1 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            sock.close()
+        udp = server.stats()['udp']
+        self.assertEqual(udp['datagrams'], 5)
+        self.assertEqual((udp['lost'], udp['reordered'], udp['duplicates'], udp['invalid']), (1, 1, 1, 1))
+        self.assertAlmostEqual(udp['loss_ratio'], 1 / 6)
+        # Duplikat nie trafia do odbiorców
+        self.assertEqual(len(server.received), 5)
+
+    def test_reliable_readings_use_tcp(self):
+        with RecordingServer(udp=True, mode='threads') as server:
+            reliable = NetworkClient('127.0.0.1', server.port, timeout=2)
+            with DatagramClient('127.0.0.1', server.port, reliable=reliable) as client:
+                self.assertTrue(client.send(Reading('alarm_1', 1.0, 'bool', 1749551400.0), reliable=True))
+                self.assertTrue(client.send(Reading('temp_1', 21.5, 'C', 1749551401.0)))
+            deadline = time.monotonic() + 5
+            while server.stats()['udp']['readings'] < 1 and time.monotonic() < deadline:
+                time.sleep(0.02)
+        # Przez UDP poszedł tylko zwykły odczyt
+        self.assertEqual(client.stats()['sent'], 1)
+        self.assertEqual(sorted(r['sensor_id'] for r in server.received), ['alarm_1', 'temp_1'])
+
+    def test_without_udp_stats_are_none(self):
+        with RecordingServer() as server:
+            self.assertIsNone(server.stats()['udp'])
+
+
+if __name__ == '__main__':
+    unittest.main()
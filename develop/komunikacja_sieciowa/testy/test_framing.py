@@ -0,0 +1,79 @@
+import socket
+import unittest
+
+from komunikacja_sieciowa.siec.framing import LENGTH_PREFIX, LengthPrefixedFramer, LineFramer, FrameTooLong
+
+
+class TestLineFramer(unittest.TestCase):
+
+    def test_messages_across_feeds(self):
+        framer = LineFramer(size=16)
+        framer.feed(b'{"a": 1}\n{"b"')
+        self.assertEqual(framer.messages(), [b'{"a": 1}'])
+        framer.feed(b': 2}\n\n')
+        self.assertEqual(framer.messages(), [b'{"b": 2}', b''])
+        self.assertEqual(framer.pending, 0)
+
+    def test_buffer_grows_for_long_message(self):
+        framer = LineFramer(size=8, max_size=1024)
+        message = b'x' * 100
+        for i in range(0, len(message), 7):
+            framer.feed(message[i:i + 7])
+            self.assertEqual(framer.messages(), [])
+        framer.feed(b'\nrest')
+        self.assertEqual(framer.messages(), [message])
+        self.assertEqual(framer.pending, 4)
+
+    def test_message_too_long(self):
+        framer = LineFramer(size=8, max_size=64)
+        with self.assertRaises(FrameTooLong):
+            for _ in range(10):
+                framer.feed(b'x' * 10)
+
+    def test_recv_from_socket(self):
+        left, right = socket.socketpair()
+        with left, right:
+            framer = LineFramer(size=32)
+            lines = [b'%d' % i * 5 for i in range(100)]
+            left.sendall(b'\n'.join(lines) + b'\n')
+            left.shutdown(socket.SHUT_WR)
+            received = []
+            while framer.recv_from(right):
+                received.extend(framer.messages())
+            self.assertEqual(received, lines)
+
+
+
+class TestLengthPrefixedFramer(unittest.TestCase):
+
+    def frame(self, payload):
+        return LENGTH_PREFIX.pack(len(payload)) + payload
+
+    def test_frames_split_at_any_byte(self):
+        payloads = [b'', b'\n\x00binary', b'x' * 300]
+        data = b''.join(self.frame(p) for p in payloads)
+        framer = LengthPrefixedFramer(size=16)
+        received = []
+        for i in range(len(data)):
+            framer.feed(data[i:i + 1])
+            received.extend(framer.messages())
+        self.assertEqual(received, payloads)
+        self.assertEqual(framer.pending, 0)
+
+    def test_take_over_from_line_framer(self):
+        lines = LineFramer()
+        lines.feed(b'{"hello": {}}\n' + self.frame(b'abc')[:5])
+        self.assertEqual(lines.messages(), [b'{"hello": {}}'])
+        framer = LengthPrefixedFramer().take_over(lines)
+        framer.feed(self.frame(b'abc')[5:])
+        self.assertEqual(framer.messages(), [b'abc'])
+
+    def test_declared_length_too_long(self):
+        framer = LengthPrefixedFramer(max_size=64)
+        framer.feed(LENGTH_PREFIX.pack(1000))
+        with self.assertRaises(FrameTooLong):
+            framer.messages()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,24 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import socket
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
 
+import numpy as np
 
+from komunikacja_sieciowa.serwer.server import NetworkServer
+from komunikacja_sieciowa.serwer.sinks import Sink
 from komunikacja_sieciowa.siec.client import NetworkClient
+from komunikacja_sieciowa.siec.pool import ClientPool, parse_endpoint
+from komunikacja_sieciowa.siec.protocol import (
+    RECORD, decode_delta_frame, encode_delta_frame, encode_frame, encode_readings_frame, encode_sensor_frame,
+    parse_ack
+)
+from symulacja_czujnikow.reading import Reading, readings_from_array
 
 class TestNetworkClient(unittest.TestCase):
 
@@ -75,6 +90,21 @@ class TestNetworkClient(unittest.TestCase):
         result = client.send(data)
         self.assertFalse(result)
 
+    @patch('socket.socket')
+    def test_send_reading(self, mock_socket_class):
+        mock_socket = MagicMock()
+        mock_socket.recv.return_value = b'ACK\n'
+        mock_socket_class.return_value = mock_socket
+
+        client = NetworkClient(host='127.0.0.1', port=12345)
+        client._connected = True
+        client.socket = mock_socket
+
+        reading = Reading('press_1', 1013.25, 'hPa', 1749551400.5)
+        self.assertTrue(client.send(reading))
+        sent = mock_socket.sendall.call_args[0][0]
+        self.assertEqual(json.loads(sent), reading.to_dict())
+
     def test_close(self):
         client = NetworkClient(host='127.0.0.1', port=12345)
         mock_socket = MagicMock()
@@ -85,5 +115,345 @@ class TestNetworkClient(unittest.TestCase):
         mock_socket.close.assert_called()
         self.assertFalse(client._connected)
 
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class RecordingSink(Sink):
+    def __init__(self):
+        self.received = []
+
+    def write(self, batch):
+        self.received.extend(r.to_dict() for r in readings_from_array(batch))
+
+
+class RecordingServer(NetworkServer):
+    # Odczyty zapisywane przez potok odbiorców; komplet dostępny po zatrzymaniu serwera
+    def __init__(self, port=0, **kwargs):
+        self.sink = RecordingSink()
+        super().__init__(port=port, sinks=[self.sink], **kwargs)
+        self.received = self.sink.received
+        self.batches = 0
+        self._thread = threading.Thread(target=self.start, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        while not self.port:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        self._thread.join(timeout=5)
+
+    def _process_batch(self, batch, block=True):
+        self.batches += 1
+        return super()._process_batch(batch, block)
+
+
+class TestPipelinedClient(unittest.TestCase):
+
+    def readings(self, n):
+        return [Reading('temp_1', 20.0 + i / 10, 'C', 1749551400.0 + i) for i in range(n)]
+
+    def test_batched_frames(self):
+        with RecordingServer() as server:
+            client = NetworkClient('127.0.0.1', server.port, window=32, batch_size=8, max_batch_delay=60)
+            readings = self.readings(100)
+            for reading in readings:
+                self.assertTrue(client.send(reading))
+            self.assertLessEqual(client.stats()['in_flight'], 32)
+            self.assertTrue(client.flush())
+            stats = client.stats()
+            client.close()
+
+        self.assertEqual(stats['protocol'], 2)
+        self.assertEqual((stats['sent'], stats['acked'], stats['failed'], stats['in_flight']), (100, 100, 0, 0))
+        self.assertEqual(server.received, [r.to_dict() for r in readings])
+
+    def test_fallback_to_line_protocol(self):
+        # Serwer bez funkcji protokołu 2 zachowuje się jak stara wersja
+        with RecordingServer(features=()) as server:
+            client = NetworkClient('127.0.0.1', server.port, window=16, batch_size=4)
+            readings = self.readings(50)
+            for reading in readings:
+                self.assertTrue(client.send(reading))
+            self.assertTrue(client.flush())
+            stats = client.stats()
+            client.close()
+
+        self.assertEqual(stats['protocol'], 1)
+        self.assertEqual((stats['acked'], stats['failed']), (50, 0))
+        # Powitanie dociera do starego serwera jako zwykła wiadomość - potwierdzona, ale nie zapisana
+        self.assertEqual(server.received, [r.to_dict() for r in readings])
+
+    def test_close_flushes_partial_batch(self):
+        with RecordingServer() as server:
+            client = NetworkClient('127.0.0.1', server.port, window=64, batch_size=64, max_batch_delay=60)
+            for reading in self.readings(10):
+                client.send(reading)
+            self.assertEqual(client.stats()['batched'], 10)
+            client.close()
+            self.assertEqual(client.stats()['acked'], 10)
+        self.assertEqual(len(server.received), 10)
+
+    def test_server_cumulative_ack(self):
+        with RecordingServer() as server:
+            with socket.create_connection(('127.0.0.1', server.port), timeout=5) as sock:
+                sock.sendall(b'{"hello": {"version": 2, "features": ["batch"]}}\n')
+                hello = json.loads(sock.makefile('rb').readline())
+                self.assertEqual(hello['hello']['features'], ['batch'])
+                frames = [encode_frame(i * 3, [b'{"sensor_id": "temp_1", "value": %d}' % v for v in range(3)])
+                          for i in range(4)]
+                sock.sendall(b''.join(frames))
+                acks = []
+                while not acks or acks[-1] != 11:
+                    acks.extend(parse_ack(line) for line in sock.recv(1024).splitlines())
+                self.assertEqual(acks, sorted(acks))
+        self.assertEqual(len(server.received), 12)
+
+
+class TestBinaryProtocol(unittest.TestCase):
+
+    def readings(self, n):
+        return [Reading(f'sensor_{i % 3}', 1000.0 + i / 7, 'hPa' if i % 3 else 'C', 1749551400.0 + i)
+                for i in range(n)]
+
+    def send_all(self, port, readings, **options):
+        client = NetworkClient('127.0.0.1', port, window=64, batch_size=16, max_batch_delay=60, **options)
+        for reading in readings:
+            self.assertTrue(client.send(reading))
+        self.assertTrue(client.flush())
+        stats = client.stats()
+        client.close()
+        return stats
+
+    def test_binary_round_trip(self):
+        readings = self.readings(100)
+        with RecordingServer() as server:
+            stats = self.send_all(server.port, readings, binary=True)
+        self.assertEqual(stats['features'], ['batch', 'binary'])
+        self.assertEqual((stats['acked'], stats['failed']), (100, 0))
+        self.assertEqual(server.received, [r.to_dict() for r in readings])
+        self.assertGreater(server.batches, 1)
+
+    def test_binary_is_smaller_than_json(self):
+        readings = self.readings(160)
+        with RecordingServer() as server:
+            binary = self.send_all(server.port, readings, binary=True)
+            text = self.send_all(server.port, readings)
+        self.assertEqual(text['features'], ['batch'])
+        self.assertLess(binary['bytes_sent'] * 3, text['bytes_sent'])
+
+    def test_json_fallback_without_binary_support(self):
+        readings = self.readings(40)
+        with RecordingServer(features=('batch',)) as server:
+            stats = self.send_all(server.port, readings, binary=True)
+        self.assertEqual(stats['features'], ['batch'])
+        self.assertEqual(server.received, [r.to_dict() for r in readings])
+
+    def test_delta_round_trip_is_lossless(self):
+        codes = [0, 1, 0, 2, 1, 0, 0]
+        timestamps = [1749551400.0, 1749551400.1, 1749551401.0, -1.0, 1749551400.6, 1749551402.0, 1749551403.5]
+        values = [1013.25, float('nan'), 1013.5, -0.0, 1e300, 1013.0, float('inf')]
+        for level in (0, 6):
+            seq, records = decode_delta_frame(encode_delta_frame(42, codes, timestamps, values, level)[4:])
+            self.assertEqual(seq, 42)
+            self.assertEqual(records['sensor'].tolist(), codes)
+            self.assertEqual(records['timestamp'].tobytes(), np.array(timestamps).tobytes())
+            self.assertEqual(records['value'].tobytes(), np.array(values).tobytes())
+
+    def test_delta_frames(self):
+        readings = self.readings(300)
+        with RecordingServer() as server:
+            delta = self.send_all(server.port, readings, delta=True)
+            binary = self.send_all(server.port, readings, binary=True)
+        self.assertEqual(delta['features'], ['batch', 'binary', 'delta'])
+        self.assertEqual((delta['acked'], delta['failed']), (300, 0))
+        self.assertGreater(delta['compression_ratio'], 1.5)
+        self.assertLess(delta['bytes_sent'], binary['bytes_sent'])
+        self.assertIsNone(binary['compression_ratio'])
+        self.assertEqual(server.received, [r.to_dict() for r in readings] * 2)
+
+    def test_delta_falls_back_to_binary(self):
+        readings = self.readings(40)
+        with RecordingServer(features=('batch', 'binary')) as server:
+            stats = self.send_all(server.port, readings, delta=True)
+        self.assertEqual(stats['features'], ['batch', 'binary'])
+        self.assertEqual(server.received, [r.to_dict() for r in readings])
+
+    def test_binary_accepts_reading_dicts_only(self):
+        client = NetworkClient('127.0.0.1', 1, binary=True, batch_size=8)
+        self.assertTrue(client.send({'sensor_id': 'temp_1', 'value': 21.5, 'unit': 'C', 'timestamp': 1749551400.0}))
+        self.assertFalse(client.send({'sensor': 'light', 'value': 300}))
+        self.assertEqual(client.stats()['batched'], 1)
+
+    def test_unknown_sensor_index(self):
+        with RecordingServer() as server:
+            with socket.create_connection(('127.0.0.1', server.port), timeout=5) as sock:
+                sock.sendall(b'{"hello": {"version": 2, "features": ["binary"]}}\n')
+                self.assertIn(b'binary', sock.makefile('rb').readline())
+                sock.sendall(encode_sensor_frame(0, 'temp_1', 'C') +
+                             encode_readings_frame(0, [RECORD.pack(0, 1749551400.0, 21.5)]) +
+                             encode_readings_frame(1, [RECORD.pack(5, 1749551401.0, 22.5)]) +
+                             encode_readings_frame(2, [RECORD.pack(0, 1749551402.0, 23.5)]))
+                lines = []
+                while len(lines) < 3:
+                    lines.extend(sock.recv(1024).splitlines())
+        self.assertEqual(lines, [b'ACK 0', b'ERROR: Invalid frame', b'ACK 2'])
+        self.assertEqual([r['value'] for r in server.received], [21.5, 23.5])
+
+
+class TestBackgroundClient(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.spool_path = os.path.join(self.temp_dir, 'spool', 'readings.spool')
+        self.port = free_port()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def readings(self, n, start=0):
+        return [Reading('temp_1', float(i), 'C', 1749551400.0 + i) for i in range(start, start + n)]
+
+    def test_outage_spills_to_spool_and_replays_in_order(self):
+        client = NetworkClient('127.0.0.1', self.port, window=64, batch_size=16, background=True,
+                               queue_size=100, spool_path=self.spool_path)
+        readings = self.readings(1000)
+        start = time.perf_counter()
+        for reading in readings:
+            self.assertTrue(client.send(reading))
+        elapsed = time.perf_counter() - start
+        stats = client.stats()
+        # Serwer niedostępny, a send nie czeka na połączenie
+        self.assertLess(elapsed / len(readings), 0.001)
+        self.assertFalse(stats['connected'])
+        self.assertEqual(stats['queue_depth'], 100)
+        self.assertEqual(stats['spooled'], 900)
+        self.assertGreater(stats['spool_bytes'], 0)
+
+        with RecordingServer(port=self.port) as server:
+            self.assertTrue(client.flush(timeout=10))
+            stats = client.stats()
+            client.close()
+        self.assertEqual(server.received, [r.to_dict() for r in readings])
+        self.assertEqual((stats['acked'], stats['replayed'], stats['pending']), (1000, 900, 0))
+        self.assertEqual(stats['spool_bytes'], 0)
+
+    def test_queue_full_without_spool_drops(self):
+        client = NetworkClient('127.0.0.1', self.port, background=True, queue_size=10)
+        results = [client.send(reading) for reading in self.readings(15)]
+        self.assertEqual(results, [True] * 10 + [False] * 5)
+        self.assertEqual(client.stats()['dropped'], 5)
+        client.close()
+        self.assertEqual(client.stats()['dropped'], 15)
+
+    def test_pending_readings_survive_restart(self):
+        client = NetworkClient('127.0.0.1', self.port, window=8, batch_size=4, background=True,
+                               queue_size=50, spool_path=self.spool_path)
+        for reading in self.readings(80):
+            client.send(reading)
+        client.close()
+        self.assertEqual(client.stats()['spool_bytes'], os.path.getsize(self.spool_path))
+
+        client = NetworkClient('127.0.0.1', self.port, window=8, batch_size=4, background=True,
+                               queue_size=50, spool_path=self.spool_path)
+        self.assertEqual(client.stats()['pending'], 80)
+        for reading in self.readings(20, start=80):
+            client.send(reading)
+        with RecordingServer(port=self.port) as server:
+            self.assertTrue(client.flush(timeout=10))
+            client.close()
+        self.assertEqual(server.received, [r.to_dict() for r in self.readings(100)])
+
+
+class TestClientPool(unittest.TestCase):
+
+    def readings(self, n, sensors=6):
+        return [Reading(f'sensor_{i % sensors}', float(i), 'C', 1749551400.0 + i) for i in range(n)]
+
+    def test_parse_endpoint(self):
+        self.assertEqual(parse_endpoint('10.0.0.1:5000'), ('10.0.0.1', 5000))
+        self.assertEqual(parse_endpoint({'host': 'a', 'port': '5001'}), ('a', 5001))
+        self.assertEqual(parse_endpoint(('b', 5002)), ('b', 5002))
+        with self.assertRaises(ValueError):
+            parse_endpoint('5000')
+
+    def test_from_config(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'config.yaml')
+            with open(path, 'w') as f:
+                f.write("network:\n  routing: least_outstanding\n  retries: 1\n"
+                        "  endpoints:\n    - 127.0.0.1:5001\n    - {host: 127.0.0.2, port: 5002}\n")
+            pool = ClientPool.from_config(path, window=16)
+        finally:
+            shutil.rmtree(temp_dir)
+        self.assertEqual(pool.routing, 'least_outstanding')
+        self.assertEqual([e.name for e in pool.endpoints], ['127.0.0.1:5001', '127.0.0.2:5002'])
+        self.assertEqual((pool.endpoints[0].client.retries, pool.endpoints[0].client.window), (1, 16))
+
+    def test_hash_routing_keeps_sensor_on_one_endpoint(self):
+        readings = self.readings(120)
+        with RecordingServer() as first, RecordingServer() as second:
+            pool = ClientPool([f'127.0.0.1:{first.port}', ('127.0.0.1', second.port)], window=32, batch_size=8)
+            self.assertTrue(pool.connect())
+            for reading in readings:
+                self.assertTrue(pool.send(reading))
+            self.assertTrue(pool.flush())
+            stats = pool.stats()
+            pool.close()
+        first_ids = {r['sensor_id'] for r in first.received}
+        second_ids = {r['sensor_id'] for r in second.received}
+        self.assertTrue(first_ids and second_ids)
+        self.assertFalse(first_ids & second_ids)
+        self.assertEqual(len(first.received) + len(second.received), 120)
+        self.assertEqual(sum(e['acked'] for e in stats['endpoints'].values()), 120)
+        self.assertTrue(all(e['ack_latency_p50_ms'] is not None for e in stats['endpoints'].values()))
+
+    def test_least_outstanding_spreads_load(self):
+        with RecordingServer() as first, RecordingServer() as second:
+            pool = ClientPool([('127.0.0.1', first.port), ('127.0.0.1', second.port)],
+                              routing='least_outstanding')
+            pool.connect()
+            for reading in self.readings(20, sensors=1):
+                self.assertTrue(pool.send(reading))
+            pool.close()
+        self.assertEqual((len(first.received), len(second.received)), (10, 10))
+
+    def test_failover_and_recovery(self):
+        readings = self.readings(200)
+        port = free_port()
+        with RecordingServer() as backup:
+            pool = ClientPool([('127.0.0.1', port), ('127.0.0.1', backup.port)], window=32, batch_size=8,
+                              retries=1, health_interval=0.1)
+            with RecordingServer(port=port) as primary:
+                pool.connect()
+                for reading in readings[:100]:
+                    self.assertTrue(pool.send(reading))
+                self.assertTrue(pool.flush())
+            # Serwer zatrzymany - jego czujniki przechodzą na drugi, nic nie ginie
+            for reading in readings[100:]:
+                self.assertTrue(pool.send(reading))
+            self.assertTrue(pool.flush())
+            stats = pool.stats()
+            self.assertEqual(stats['healthy'], 1)
+            self.assertGreater(stats['failovers'], 0)
+
+            with RecordingServer(port=port):
+                deadline = time.monotonic() + 5
+                while not pool.stats()['endpoints'][f'127.0.0.1:{port}']['healthy']:
+                    self.assertLess(time.monotonic(), deadline)
+                    time.sleep(0.05)
+                pool.close()
+        delivered = {r['value'] for r in primary.received + backup.received}
+        self.assertEqual(delivered, {r.value for r in readings})
+        self.assertEqual(stats['failed'], 0)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -7,15 +7,26 @@ import time
 
 from komunikacja_sieciowa.serwer.server import NetworkServer
 
+def recv_lines(sock, count):
+    data = b''
+    while data.count(b'\n') < count:
+        chunk = sock.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode('utf-8').splitlines()
+
+
 class TestNetworkServer(unittest.TestCase):
+    mode = 'selectors'
 
     @classmethod
     def setUpClass(cls):
-        cls.port = 50007
-        cls.server = NetworkServer(port=cls.port)
+        cls.server = NetworkServer(port=0, mode=cls.mode)
         cls.server_thread = threading.Thread(target=cls.server.start, daemon=True)
         cls.server_thread.start()
         time.sleep(1)  
+        cls.port = cls.server.port
 
     @classmethod
     def tearDownClass(cls):
@@ -46,6 +57,54 @@ class TestNetworkServer(unittest.TestCase):
             response = sock.recv(1024).decode('utf-8').strip()
             self.assertTrue(response.startswith('ACK') or response.startswith('ERROR'))
 
+    def test_pipelined_messages_in_one_send(self):
+        with socket.create_connection(('127.0.0.1', self.port), timeout=5) as sock:
+            lines = [json.dumps({'sensor': 'temp', 'value': i}) for i in range(50)]
+            lines.insert(10, 'not json')
+            sock.sendall(('\n'.join(lines) + '\n').encode('utf-8'))
+            responses = recv_lines(sock, len(lines))
+
+            self.assertEqual(len(responses), len(lines))
+            self.assertTrue(responses[10].startswith('ERROR'))
+            self.assertEqual(responses[:10] + responses[11:], ['ACK'] * 50)
+
+    def test_message_split_across_sends(self):
+        with socket.create_connection(('127.0.0.1', self.port), timeout=5) as sock:
+            message = json.dumps({'sensor': 'press', 'value': 1013.25}).encode('utf-8') + b'\n'
+            for i in range(0, len(message), 3):
+                sock.sendall(message[i:i + 3])
+                time.sleep(0.001)
+            self.assertEqual(recv_lines(sock, 1), ['ACK'])
+
+    def test_many_concurrent_connections(self):
+        sockets = [socket.create_connection(('127.0.0.1', self.port), timeout=5) for _ in range(200)]
+        try:
+            for i, sock in enumerate(sockets):
+                sock.sendall(json.dumps({'sensor': 'light', 'value': i}).encode('utf-8') + b'\n')
+            for sock in sockets:
+                self.assertEqual(recv_lines(sock, 1), ['ACK'])
+        finally:
+            for sock in sockets:
+                sock.close()
+
+    def test_message_too_long(self):
+        server = NetworkServer(port=0, mode=self.mode, max_message_size=4096)
+        thread = threading.Thread(target=server.start, daemon=True)
+        thread.start()
+        time.sleep(0.3)
+        try:
+            with socket.create_connection(('127.0.0.1', server.port), timeout=5) as sock:
+                sock.sendall(b'{"sensor": "temp"}\n' + b'x' * 10000)
+                self.assertEqual(recv_lines(sock, 2), ['ACK', 'ERROR: Message too long'])
+        finally:
+            server.stop()
+            thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+
+
+class TestThreadedNetworkServer(TestNetworkServer):
+    mode = 'threads'
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+
+from komunikacja_sieciowa.serwer.server import NetworkServer
+from komunikacja_sieciowa.serwer.sinks import LatestValueStore, LoggerSink, Sink, SinkPipeline
+from komunikacja_sieciowa.siec.client import NetworkClient
+from logger.logger import Logger
+from symulacja_czujnikow.reading import reading_array
+
+
+class SlowSink(Sink):
+    def __init__(self, delay):
+        self.delay = delay
+        self.rows = 0
+
+    def write(self, batch):
+        time.sleep(self.delay)
+        self.rows += len(batch)
+
+
+class FailingSink(Sink):
+    def write(self, batch):
+        raise OSError("disk full")
+
+
+class TestLatestValueStore(unittest.TestCase):
+
+    def test_latest_and_window(self):
+        store = LatestValueStore(window_seconds=10)
+        store.write(reading_array(['a', 'b', 'a'], [1.0, 2.0, 3.0], ['C', 'hPa', 'C'], [100.0, 100.0, 105.0]))
+        store.write(reading_array('a', [4.0, 5.0], 'C', [112.0, 108.0]))
+        latest = store.latest()
+        self.assertEqual((latest['a'].value, latest['a'].timestamp), (4.0, 112.0))
+        self.assertEqual((latest['b'].value, latest['b'].unit), (2.0, 'hPa'))
+        timestamps, values = store.window('a')
+        self.assertEqual(values.tolist(), [3.0, 4.0, 5.0])
+        self.assertEqual(store.window('a', seconds=5)[1].tolist(), [4.0, 5.0])
+        summary = store.summary()['a']
+        self.assertEqual((summary['count'], summary['min'], summary['max']), (3, 3.0, 5.0))
+        self.assertEqual(store.readings, 5)
+        self.assertEqual(len(store.window('missing')[0]), 0)
+
+
+class TestSinkPipeline(unittest.TestCase):
+
+    def test_batches_are_merged_and_errors_isolated(self):
+        slow = SlowSink(0.05)
+        pipeline = SinkPipeline([FailingSink(), slow], max_latency_ms=20)
+        pipeline.start()
+        for i in range(50):
+            pipeline.submit(reading_array('a', [float(i)] * 10, 'C', [float(i)] * 10))
+        pipeline.close()
+        stats = pipeline.stats()
+        self.assertEqual((slow.rows, stats['rows']), (500, 500))
+        self.assertLess(stats['batches'], 50)
+        self.assertEqual(stats['errors'], stats['batches'])
+
+    def test_drop_policy(self):
+        pipeline = SinkPipeline([SlowSink(0.2)], queue_size=1, queue_full_policy='drop')
+        pipeline.start()
+        results = [pipeline.submit(reading_array('a', [1.0, 2.0], 'C', 0.0)) for _ in range(5)]
+        pipeline.close()
+        self.assertIn(False, results)
+        self.assertEqual(pipeline.stats()['dropped'], 2 * results.count(False))
+
+
+class TestServerSinks(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def run_server(self, server):
+        thread = threading.Thread(target=server.start, daemon=True)
+        thread.start()
+        while not server.port:
+            time.sleep(0.01)
+        return thread
+
+    def test_ack_does_not_wait_for_sinks(self):
+        slow = SlowSink(0.5)
+        server = NetworkServer(port=0, sinks=[slow], sink_latency_ms=0)
+        thread = self.run_server(server)
+        client = NetworkClient('127.0.0.1', server.port, window=16, batch_size=4, max_batch_delay=0)
+        start = time.perf_counter()
+        for i in range(40):
+            self.assertTrue(client.send({'sensor_id': 'temp_1', 'value': float(i), 'unit': 'C',
+                                         'timestamp': 1749551400.0 + i}))
+        self.assertTrue(client.flush())
+        elapsed = time.perf_counter() - start
+        client.close()
+        server.stop()
+        thread.join(timeout=5)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(slow.rows, 40)
+        self.assertEqual(server.latest.latest()['temp_1'].value, 39.0)
+        self.assertEqual(server.stats()['readings'], 40)
+
+    def test_readings_are_persisted_through_logger(self):
+        config_path = os.path.join(self.temp_dir, 'config.json')
+        with open(config_path, 'w') as f:
+            json.dump({'log_dir': os.path.join(self.temp_dir, 'logs')}, f)
+        data_logger = Logger(config_path)
+        server = NetworkServer(port=0, sinks=[LoggerSink(data_logger)])
+        thread = self.run_server(server)
+        client = NetworkClient('127.0.0.1', server.port, window=64, batch_size=16, binary=True)
+        for i in range(100):
+            client.send({'sensor_id': f'sensor_{i % 2}', 'value': float(i), 'unit': 'C',
+                         'timestamp': 1749551400.0 + i})
+        self.assertTrue(client.flush())
+        client.close()
+        server.stop()
+        thread.join(timeout=5)
+        data_logger.stop()
+
+        logs = data_logger.read_logs_array(datetime.fromtimestamp(1749551400.0),
+                                           datetime.fromtimestamp(1749551500.0))
+        self.assertEqual(logs['sensor_0'][1].tolist(), [float(i) for i in range(0, 100, 2)])
+        self.assertEqual(logs['sensor_1'][1].tolist(), [float(i) for i in range(1, 100, 2)])
+
+    def test_long_sensor_ids_reach_logger_and_latest_values(self):
+        long_id, long_unit = 'building_A/floor_3/room_301/temperature_north', 'readings/s'
+        config_path = os.path.join(self.temp_dir, 'config.json')
+        with open(config_path, 'w') as f:
+            json.dump({'log_dir': os.path.join(self.temp_dir, 'logs')}, f)
+        data_logger = Logger(config_path)
+        server = NetworkServer(port=0, sinks=[LoggerSink(data_logger)])
+        thread = self.run_server(server)
+        # Ścieżka JSON (wersja 1) i ramki binarne ze słownikiem czujników
+        for i, options in enumerate(({'window': 1}, {'window': 8, 'binary': True})):
+            client = NetworkClient('127.0.0.1', server.port, **options)
+            self.assertTrue(client.send({'sensor_id': f'{long_id}_{i}', 'value': float(i), 'unit': long_unit,
+                                         'timestamp': 1749551400.0 + i}))
+            self.assertTrue(client.flush())
+            client.close()
+        server.stop()
+        thread.join(timeout=5)
+        data_logger.stop()
+
+        self.assertEqual(sorted(server.latest.latest()), [f'{long_id}_0', f'{long_id}_1'])
+        self.assertEqual({r.unit for r in server.latest.latest().values()}, {long_unit})
+        rows = list(data_logger.read_logs(datetime.fromtimestamp(1749551400.0),
+                                          datetime.fromtimestamp(1749551410.0)))
+        self.assertEqual([(r['sensor_id'], r['unit']) for r in rows],
+                         [(f'{long_id}_0', long_unit), (f'{long_id}_1', long_unit)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from komunikacja_sieciowa.siec.spool import Spool
+
+
+class TestSpool(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'test.spool')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_read_commit_and_truncate(self):
+        spool = Spool(self.path)
+        with spool.lock:
+            spool.append([b'a', b'b', b'c'])
+            self.assertEqual(spool.read(2), [b'a', b'b'])
+        spool.commit()
+        self.assertEqual(spool.unacked, 2)
+        with spool.lock:
+            self.assertEqual(spool.read(10), [b'c'])
+        spool.commit()
+        self.assertEqual(os.path.getsize(self.path), 0)
+        spool.close()
+
+    def test_committed_offset_survives_reopen(self):
+        spool = Spool(self.path)
+        with spool.lock:
+            spool.append([b'1', b'2', b'3'])
+            spool.read(1)
+        spool.commit()
+        with spool.lock:
+            spool.read(1)
+        spool.close()
+
+        spool = Spool(self.path)
+        self.assertEqual(spool.count(), 2)
+        with spool.lock:
+            self.assertEqual(spool.read(10), [b'2', b'3'])
+        spool.close()
+
+    def test_max_bytes(self):
+        spool = Spool(self.path, max_bytes=10)
+        with spool.lock:
+            self.assertTrue(spool.append([b'1234']))
+            self.assertFalse(spool.append([b'123456']))
+        spool.close()
+
+    def test_prepend_keeps_order(self):
+        spool = Spool(self.path)
+        with spool.lock:
+            spool.append([b'c', b'd'])
+            spool.read(1)
+        spool.prepend([b'a', b'b', b'c'])
+        with spool.lock:
+            self.assertEqual(spool.read(10), [b'a', b'b', b'c', b'd'])
+        spool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
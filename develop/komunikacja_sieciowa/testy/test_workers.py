@@ -0,0 +1,60 @@
+import logging
+import os
+import signal
+import time
+import unittest
+
+from komunikacja_sieciowa.serwer.workers import WorkerSupervisor
+from komunikacja_sieciowa.siec.client import NetworkClient
+from symulacja_czujnikow.reading import Reading
+
+
+def wait_until(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.05)
+
+
+class TestWorkerSupervisor(unittest.TestCase):
+
+    def setUp(self):
+        self.supervisor = WorkerSupervisor(0, 2, restart_delay=0.2, report_interval=0.05,
+                                           logger=logging.getLogger('test-workers'))
+        self.supervisor.start()
+
+    def tearDown(self):
+        self.supervisor.stop()
+
+    def send(self, count, start=0):
+        # Każdy klient to osobne połączenie - jądro rozdziela je między procesy
+        for i in range(start, start + count, 10):
+            client = NetworkClient('127.0.0.1', self.supervisor.port, window=16, batch_size=5, timeout=2)
+            for j in range(i, i + 10):
+                self.assertTrue(client.send(Reading('temp_1', float(j), 'C', 1749551400.0 + j)))
+            self.assertTrue(client.flush())
+            client.close()
+
+    def test_workers_share_port_and_counters_are_aggregated(self):
+        self.send(200)
+        wait_until(lambda: self.supervisor.stats()['readings'] == 200)
+        stats = self.supervisor.stats()
+        self.assertEqual(stats['accepted'], 20)
+        self.assertEqual(len(set(self.supervisor.pids())), 2)
+        self.assertEqual(sum(w['readings'] for w in stats['workers']), 200)
+
+    def test_crashed_worker_is_restarted(self):
+        self.send(100)
+        wait_until(lambda: self.supervisor.stats()['readings'] == 100)
+        pid = self.supervisor.pids()[0]
+        os.kill(pid, signal.SIGKILL)
+        wait_until(lambda: self.supervisor.pids()[0] != pid and self.supervisor.stats()['workers'][0]['alive'])
+        self.send(100, start=100)
+        wait_until(lambda: self.supervisor.stats()['readings'] == 200)
+        stats = self.supervisor.stats()
+        self.assertEqual((stats['restarts'], stats['workers'][0]['restarts']), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from symulacja_czujnikow.reading import READING_DTYPE
+
+
+class DecodedArchive:
+    # Zawartość archiwum w postaci kolumn: czas i wartość jako float64,
+    # identyfikator czujnika i jednostka jako kody do słowników
+    def __init__(self, timestamps, sensor_ids, values, units):
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.values = np.asarray(values, dtype=np.float64)
+        labels, codes = np.unique(np.asarray(sensor_ids, dtype=str), return_inverse=True)
+        self.sensor_ids = labels.tolist()
+        self.sensor_codes = codes.reshape(-1).astype(np.int32)
+        labels, codes = np.unique(np.asarray(units, dtype=str), return_inverse=True)
+        self.units = labels.tolist()
+        self.unit_codes = codes.reshape(-1).astype(np.int32)
+        self.sorted = bool(np.all(self.timestamps[1:] >= self.timestamps[:-1]))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        labels = sum(len(s) for s in self.sensor_ids + self.units)
+        return (self.timestamps.nbytes + self.values.nbytes + self.sensor_codes.nbytes +
+                self.unit_codes.nbytes + labels)
+
+    def select_rows(self, start: float, end: float) -> np.ndarray:
+        if self.sorted:
+            lo = np.searchsorted(self.timestamps, start, side='left')
+            hi = np.searchsorted(self.timestamps, end, side='right')
+            return np.arange(lo, hi)
+        return np.flatnonzero((self.timestamps >= start) & (self.timestamps <= end))
+
+    def select(self, start: float, end: float, sensor_id: Optional[str] = None) -> np.ndarray:
+        if sensor_id is not None and sensor_id not in self.sensor_ids:
+            return np.empty(0, dtype=READING_DTYPE)
+        rows = self.select_rows(start, end)
+        if sensor_id is not None:
+            rows = rows[self.sensor_codes[rows] == self.sensor_ids.index(sensor_id)]
+        batch = np.empty(len(rows), dtype=READING_DTYPE)
+        if len(rows):
+            batch['timestamp'] = self.timestamps[rows]
+            batch['value'] = self.values[rows]
+            # Etykiety ze słowników jako obiekty - pełne nazwy, jak w aktywnym pliku CSV
+            batch['sensor_id'] = np.array(self.sensor_ids, dtype=object)[self.sensor_codes[rows]]
+            batch['unit'] = np.array(self.units, dtype=object)[self.unit_codes[rows]]
+        return batch
+
+
+class ArchiveCache:
+    # LRU zdekodowanych archiwów; klucz (ścieżka, mtime), więc podmieniony plik
+    # nie zostanie obsłużony z nieaktualnej kopii
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[tuple, DecodedArchive]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: str, loader: Callable[[str], DecodedArchive]) -> DecodedArchive:
+        key = (path, os.path.getmtime(path))
+        with self._lock:
+            archive = self._entries.get(key)
+            if archive is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return archive
+            self.misses += 1
+        # Dekodowanie poza blokadą - równoległe zapytania o inne pliki nie czekają na siebie
+        archive = loader(path)
+        size = archive.nbytes
+        if size > self.max_bytes:
+            return archive
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = archive
+                self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+        return archive
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.nbytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,56 @@
+import gzip
+import lzma
+import zlib
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'lzma': '.xz'}
+_CHUNK_SIZE = 64 * 1024
+
+
+def compression_of(file_path: str) -> Optional[str]:
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if file_path.endswith('.csv' + suffix):
+            return compression
+    return None
+
+
+def compress_block(data: bytes, compression: str, level: Optional[int] = None) -> bytes:
+    # Każdy blok to samodzielny człon gzip/strumień xz - można go zdekompresować
+    # bez wcześniejszej części pliku, a sklejenie członów jest nadal poprawnym plikiem
+    if compression == 'gzip':
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    if compression == 'lzma':
+        return lzma.compress(data, format=lzma.FORMAT_XZ, preset=level)
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def _decompressor(compression: str):
+    if compression == 'gzip':
+        return zlib.decompressobj(wbits=31)
+    return lzma.LZMADecompressor(format=lzma.FORMAT_XZ)
+
+
+def iter_blocks(f: BinaryIO, compression: str) -> Iterator[Tuple[int, int, bytes]]:
+    # Zwraca (początek bloku, koniec bloku, dane) od bieżącej pozycji pliku;
+    # niedokończony ostatni blok (przerwany zapis) jest pomijany
+    offset = f.tell()
+    pending = b''
+    while True:
+        if not pending:
+            pending = f.read(_CHUNK_SIZE)
+            if not pending:
+                return
+        decompressor = _decompressor(compression)
+        start = offset
+        parts = []
+        while True:
+            parts.append(decompressor.decompress(pending))
+            if decompressor.eof:
+                offset += len(pending) - len(decompressor.unused_data)
+                pending = decompressor.unused_data
+                break
+            offset += len(pending)
+            pending = f.read(_CHUNK_SIZE)
+            if not pending:
+                return
+        yield start, offset, b''.join(parts)
@@ -0,0 +1,161 @@
+import bisect
+import json
+import os
+import threading
+import zipfile
+from datetime import datetime
+from typing import Optional, Iterable, List, Tuple
+
+from logger.compression import compression_of, iter_blocks
+
+
+def index_path(file_path: str) -> str:
+    # Indeks jest wspólny dla pliku .csv i jego archiwum .zip o tej samej nazwie bazowej
+    return os.path.splitext(file_path)[0] + '.idx'
+
+
+class LogIndex:
+    def __init__(self, interval: int = 1000):
+        self.interval = interval
+        self.min_ts: Optional[float] = None
+        self.max_ts: Optional[float] = None
+        self.sensor_ids = set()
+        self.checkpoints: List[Tuple[float, int]] = []
+        self.rows = 0
+        self.size = 0
+        self.sorted = True
+        self._last_checkpoint_row = 0
+
+    def add_rows(self, offset: int, timestamps: List[float], sensor_ids: Iterable[str], end_offset: int) -> None:
+        if not timestamps:
+            return
+        if not self.checkpoints or self.rows - self._last_checkpoint_row >= self.interval:
+            self.checkpoints.append((timestamps[0], offset))
+            self._last_checkpoint_row = self.rows
+
+        batch_min = min(timestamps)
+        batch_max = max(timestamps)
+        if self.sorted:
+            if self.max_ts is not None and timestamps[0] < self.max_ts:
+                self.sorted = False
+            elif any(b < a for a, b in zip(timestamps, timestamps[1:])):
+                self.sorted = False
+        self.min_ts = batch_min if self.min_ts is None else min(self.min_ts, batch_min)
+        self.max_ts = batch_max if self.max_ts is None else max(self.max_ts, batch_max)
+        self.sensor_ids.update(sensor_ids)
+        self.rows += len(timestamps)
+        self.size = end_offset
+
+    def overlaps(self, start: float, end: float, sensor_id: Optional[str] = None) -> bool:
+        if self.rows == 0:
+            return False
+        if self.max_ts < start or self.min_ts > end:
+            return False
+        return sensor_id is None or sensor_id in self.sensor_ids
+
+    def seek_offset(self, start: float) -> int:
+        if not self.checkpoints:
+            return self.size
+        if not self.sorted:
+            return self.checkpoints[0][1]
+        # Ostatni punkt kontrolny ściśle przed `start` - wiersze z tym samym czasem
+        # mogą leżeć przed punktem o równym znaczniku
+        position = bisect.bisect_left([ts for ts, _ in self.checkpoints], start) - 1
+        return self.checkpoints[max(position, 0)][1]
+
+    def to_dict(self) -> dict:
+        return {
+            'interval': self.interval,
+            'min_ts': self.min_ts,
+            'max_ts': self.max_ts,
+            'sensor_ids': sorted(self.sensor_ids),
+            'checkpoints': self.checkpoints,
+            'rows': self.rows,
+            'size': self.size,
+            'sorted': self.sorted,
+            'last_checkpoint_row': self._last_checkpoint_row
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LogIndex':
+        index = cls(data.get('interval', 1000))
+        index.min_ts = data['min_ts']
+        index.max_ts = data['max_ts']
+        index.sensor_ids = set(data['sensor_ids'])
+        index.checkpoints = [tuple(cp) for cp in data['checkpoints']]
+        index.rows = data['rows']
+        index.size = data['size']
+        index.sorted = data['sorted']
+        index._last_checkpoint_row = data.get('last_checkpoint_row', 0)
+        return index
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['LogIndex']:
+        try:
+            with open(path, 'r') as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def build(cls, file_path: str, interval: int = 1000) -> 'LogIndex':
+        compression = compression_of(file_path)
+        if compression is not None:
+            with open(file_path, 'rb') as f:
+                return cls._scan_blocks(f, compression, interval)
+        if file_path.endswith('.zip'):
+            with zipfile.ZipFile(file_path, 'r') as zipf:
+                index = cls(interval)
+                for name in zipf.namelist()[:1]:
+                    with zipf.open(name) as f:
+                        index = cls._scan(f, interval)
+                return index
+        with open(file_path, 'rb') as f:
+            return cls._scan(f, interval)
+
+    @classmethod
+    def _scan_blocks(cls, f, compression: str, interval: int) -> 'LogIndex':
+        # Punkty kontrolne tylko na granicach bloków - tylko tam można zacząć dekompresję
+        index = cls(interval)
+        for start, end, data in iter_blocks(f, compression):
+            timestamps, sensor_ids = [], set()
+            for line in data.split(b'\n'):
+                fields = line.split(b',', 2)
+                try:
+                    timestamps.append(datetime.fromisoformat(fields[0].decode('utf-8')).timestamp())
+                except (ValueError, IndexError):
+                    continue
+                sensor_ids.add(fields[1].decode('utf-8'))
+            index.add_rows(start, timestamps, sensor_ids, end)
+            index.size = end
+        return index
+
+    @classmethod
+    def _scan(cls, f, interval: int) -> 'LogIndex':
+        index = cls(interval)
+        offset = len(f.readline())
+        batch_offset = offset
+        timestamps, sensor_ids = [], set()
+        for line in f:
+            fields = line.split(b',', 2)
+            try:
+                timestamp = datetime.fromisoformat(fields[0].decode('utf-8')).timestamp()
+            except (ValueError, IndexError):
+                offset += len(line)
+                continue
+            timestamps.append(timestamp)
+            sensor_ids.add(fields[1].decode('utf-8'))
+            offset += len(line)
+            if len(timestamps) >= interval:
+                index.add_rows(batch_offset, timestamps, sensor_ids, offset)
+                batch_offset = offset
+                timestamps, sensor_ids = [], set()
+        index.add_rows(batch_offset, timestamps, sensor_ids, offset)
+        index.size = offset
+        return index
@@ -1,24 +1,336 @@
 import os
 import json
+import codecs
 import csv
 import glob
+import heapq
+import io
+import itertools
+import logging
+import multiprocessing
+import operator
+import queue
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import zipfile
-from datetime import datetime, timedelta
-from typing import Optional, Iterator, Dict
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Iterator, Dict, Iterable, List, Tuple, Union
 import threading
 
+import numpy as np
+
+from symulacja_czujnikow.reading import Reading, reading_array, readings_from_array, readings_to_array
+from logger.log_index import LogIndex, index_path
+from logger.segment import Segment, SegmentWriter, SEGMENT_SUFFIX, segment_path
+from logger.rollup import Rollup, RESOLUTIONS, rollup_path
+from logger.compression import COMPRESSION_SUFFIXES, compression_of, compress_block, iter_blocks
+from logger.archive_cache import ArchiveCache, DecodedArchive
+
+_log = logging.getLogger(__name__)
+
+_STOP = object()
+_FIELDS = ['timestamp', 'sensor_id', 'value', 'unit']
+_CSV_SPECIAL = (',', '"', '\r', '\n')
+_READ_CHUNK = 1 << 21
+_HEADER_LINE = ','.join(_FIELDS)
+_COMMAS = operator.methodcaller('count', ',')
+
+
+def _utc_offset(timestamp: float) -> float:
+    local = datetime.fromtimestamp(timestamp)
+    utc = datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+    return (local - utc).total_seconds()
+
+
+def _format_rows(batch: np.ndarray) -> str:
+    timestamps = batch['timestamp']
+    offset = _utc_offset(float(timestamps.min()))
+    if offset == _utc_offset(float(timestamps.max())):
+        # Ten sam offset strefy czasowej w całej paczce: konwersja czasu lokalnego wektorowo
+        local_us = np.round((timestamps + offset) * 1e6).astype(np.int64)
+        iso = np.datetime_as_string(local_us.astype('datetime64[us]'), unit='us')
+        # Jak datetime.isoformat(): bez części ułamkowej dla pełnych sekund
+        whole = local_us % 1000000 == 0
+        if whole.any():
+            iso[whole] = np.datetime_as_string(local_us[whole].astype('datetime64[us]'), unit='s')
+        iso = iso.tolist()
+    else:
+        iso = [datetime.fromtimestamp(t).isoformat() for t in timestamps.tolist()]
+    sensor_ids = batch['sensor_id'].tolist()
+    units = batch['unit'].tolist()
+    labels = set(sensor_ids) | set(units)
+    if any(c in label for label in labels for c in _CSV_SPECIAL):
+        out = io.StringIO()
+        csv.writer(out).writerows(zip(iso, sensor_ids, batch['value'].tolist(), units))
+        return out.getvalue()
+    return ''.join(f"{t},{s},{v!r},{u}\r\n"
+                   for t, s, v, u in zip(iso, sensor_ids, batch['value'].tolist(), units))
+
+
+def _local_datetimes(timestamps: np.ndarray) -> list:
+    if len(timestamps) == 0:
+        return []
+    offset = _utc_offset(float(timestamps.min()))
+    if offset != _utc_offset(float(timestamps.max())):
+        return [datetime.fromtimestamp(t) for t in timestamps.tolist()]
+    return np.round((timestamps + offset) * 1e6).astype(np.int64).astype('datetime64[us]').tolist()
+
+
+def _parse_timestamps(values) -> np.ndarray:
+    # Czas lokalny z ISO wektorowo (datetime64), gdy offset strefy jest stały w całym zakresie;
+    # w przeciwnym razie (zmiana czasu, nietypowy format) parsowanie wiersz po wierszu
+    try:
+        local = np.array(values, dtype='datetime64[us]').astype(np.int64) / 1e6
+    except ValueError:
+        local = None
+    if local is not None and len(local):
+        offset = _utc_offset(float(local.min()))
+        probes = (float(local.min()) - offset, float(local.max()) - offset, float(local.max()))
+        if all(_utc_offset(t) == offset for t in probes):
+            return local - offset
+    parsed = []
+    for value in values:
+        try:
+            parsed.append(datetime.fromisoformat(value).timestamp())
+        except (TypeError, ValueError):
+            parsed.append(np.nan)
+    return np.array(parsed, dtype=np.float64)
+
+
+def _file_chunks(file_path: str, index: Optional[LogIndex] = None, start_ts: float = 0.0) -> Iterator[str]:
+    # Tekst pliku .csv/.zip/.csv.gz/.csv.xz porcjami (niekoniecznie na granicach linii); z indeksem -
+    # od punktu kontrolnego przed start_ts. Nagłówek zostaje w strumieniu i jest pomijany przy parsowaniu
+    if file_path.endswith('.zip'):
+        with zipfile.ZipFile(file_path, 'r') as zipf:
+            names = zipf.namelist()
+            for name in names:
+                with zipf.open(name) as f:
+                    if index is not None and len(names) == 1:
+                        f.seek(index.seek_offset(start_ts))
+                    decoder = codecs.getincrementaldecoder('utf-8')()
+                    for data in iter(lambda: f.read(_READ_CHUNK), b''):
+                        yield decoder.decode(data)
+                    yield decoder.decode(b'', final=True)
+        return
+    compression = compression_of(file_path)
+    try:
+        f = open(file_path, 'rb') if compression else open(file_path, 'r', newline='', encoding='utf-8')
+    except FileNotFoundError:
+        # Plik po rotacji mógł zostać w międzyczasie skompresowany do archiwum
+        zip_path = file_path[:-4] + '.zip'
+        if compression is None and os.path.exists(zip_path):
+            yield from _file_chunks(zip_path, index, start_ts)
+        return
+    with f:
+        if index is not None:
+            # Dla plików skompresowanych punkty kontrolne leżą na granicach bloków
+            f.seek(index.seek_offset(start_ts))
+        if compression:
+            for _, _, data in iter_blocks(f, compression):
+                yield data.decode('utf-8')
+        else:
+            yield from iter(lambda: f.read(_READ_CHUNK), '')
+
+
+def _file_lines(file_path: str, index: Optional[LogIndex] = None, start_ts: float = 0.0) -> Iterator[str]:
+    carry = ''
+    for chunk in _file_chunks(file_path, index, start_ts):
+        lines = (carry + chunk).splitlines(keepends=True)
+        carry = lines.pop() if lines and not lines[-1].endswith('\n') else ''
+        yield from lines
+    if carry:
+        yield carry
+
+
+def _decode_archive(file_path: str) -> DecodedArchive:
+    rows = [row for row in csv.reader(_file_lines(file_path)) if len(row) == 4 and row != _FIELDS]
+    if not rows:
+        return DecodedArchive([], [], [], [])
+    timestamps, sensor_ids, values, units = zip(*rows)
+    timestamps = _parse_timestamps(timestamps)
+    valid = ~np.isnan(timestamps)
+    values = np.array(values, dtype=np.float64)
+    sensor_ids, units = np.array(sensor_ids), np.array(units)
+    if not valid.all():
+        timestamps, sensor_ids, values, units = timestamps[valid], sensor_ids[valid], values[valid], units[valid]
+    return DecodedArchive(timestamps, sensor_ids, values, units)
+
+
+def _array_rows(batch: np.ndarray) -> Iterator[Dict]:
+    for timestamp, (_, sensor, value, unit) in zip(_local_datetimes(batch['timestamp']), batch.tolist()):
+        yield {'timestamp': timestamp, 'sensor_id': sensor, 'value': value, 'unit': unit}
+
+
+def _timed_rows(future) -> Iterator[Tuple[float, Dict]]:
+    batch = future.result()
+    yield from zip(batch['timestamp'].tolist(), _array_rows(batch))
+
+
+def _overlapping_groups(tasks: list, futures: list) -> Iterator[list]:
+    # Kolejne pliki (posortowane po min_ts), których zakresy czasu się nakładają, scalane razem;
+    # plik zaczynający się po końcu poprzednich oddawany w całości bez scalania
+    group, group_end = [], float('-inf')
+    for (_, index), future in zip(tasks, futures):
+        if group and index is not None and index.min_ts > group_end:
+            yield group
+            group, group_end = [], float('-inf')
+        group.append(future)
+        group_end = max(group_end, index.max_ts if index is not None else float('inf'))
+    if group:
+        yield group
+
+
+def _iter_rows(reader, start: datetime, end: datetime, sensor_id: Optional[str],
+               sorted_rows: bool) -> Iterator[Dict]:
+    for row in reader:
+        try:
+            timestamp = datetime.fromisoformat(row['timestamp'])
+        except Exception:
+            continue
+        if timestamp > end:
+            if sorted_rows:
+                return
+            continue
+        if timestamp < start:
+            continue
+        if sensor_id is None or row['sensor_id'] == sensor_id:
+            yield {
+                'timestamp': timestamp,
+                'sensor_id': row['sensor_id'],
+                'value': float(row['value']),
+                'unit': row['unit']
+            }
+
+
+def _read_segment(path: str, start: datetime, end: datetime, sensor_id: Optional[str]) -> Iterator[Dict]:
+    try:
+        batch = Segment(path).read(start.timestamp(), end.timestamp(), sensor_id)
+    except FileNotFoundError:
+        # Segment przeniesiony do archiwum w trakcie odczytu
+        return
+    yield from _array_rows(batch)
+
+
+def _read_file(file_path: str, start: datetime, end: datetime, sensor_id: Optional[str],
+               index: Optional[LogIndex] = None) -> Iterator[Dict]:
+    if file_path.endswith(SEGMENT_SUFFIX):
+        yield from _read_segment(file_path, start, end, sensor_id)
+        return
+    start_ts = start.timestamp() if index is not None else 0.0
+    reader = csv.DictReader(_file_lines(file_path, index, start_ts), fieldnames=_FIELDS)
+    yield from _iter_rows(reader, start, end, sensor_id, index is not None and index.sorted)
+
+
+def _split_columns(block: str) -> Optional[Tuple[list, list, list]]:
+    for header in (_HEADER_LINE + '\r\n', _HEADER_LINE + '\n'):
+        block = block.replace(header, '')
+    if '"' not in block:
+        # Szybka ścieżka bez cudzysłowów: jeden podział całego bloku, kolumny jako wycinki co 4 pola
+        lines = block.splitlines()
+        # Wycinki są poprawne tylko, gdy każda linia ma dokładnie 4 pola (linie z 3 i 5 polami
+        # przesunęłyby kolumny bez błędu) - inaczej csv.reader pomija złe wiersze
+        if set(map(_COMMAS, lines)) <= {3}:
+            fields = ','.join(lines).split(',')
+            return (fields[0::4], fields[1::4], fields[2::4]) if lines else None
+    rows = [row for row in csv.reader(io.StringIO(block)) if len(row) == 4]
+    if not rows:
+        return None
+    timestamps, sensor_ids, values, _ = zip(*rows)
+    return list(timestamps), list(sensor_ids), list(values)
+
+
+def _text_columns(chunks: Iterable[str], start_ts: float, end_ts: float, sorted_rows: bool,
+                  wanted: Optional[set] = None) -> Iterator[Tuple[np.ndarray, np.ndarray, List[str], np.ndarray]]:
+    # Parsowanie blokami po ~_READ_CHUNK znaków ucięty na ostatniej pełnej linii; konwersja czasu
+    # i wartości odbywa się na całych kolumnach. Wynik: (czas, kody czujników, słownik, wartości)
+    pending, size, carry = [], 0, ''
+    for chunk in itertools.chain(chunks, [None]):
+        if chunk is not None:
+            pending.append(chunk)
+            size += len(chunk)
+            if size < _READ_CHUNK:
+                continue
+        block = carry + ''.join(pending)
+        pending, size = [], 0
+        if chunk is not None:
+            cut = block.rfind('\n') + 1
+            block, carry = block[:cut], block[cut:]
+        columns = _split_columns(block)
+        if columns is None:
+            continue
+        timestamps, sensor_ids, values = columns
+        timestamps = _parse_timestamps(timestamps)
+        labels = list(set(sensor_ids))
+        codes_by_label = {label: code for code, label in enumerate(labels)}
+        codes = np.fromiter(map(codes_by_label.__getitem__, sensor_ids), dtype=np.int32, count=len(sensor_ids))
+        mask = (timestamps >= start_ts) & (timestamps <= end_ts)
+        if wanted is not None:
+            mask &= np.isin(codes, [code for label, code in codes_by_label.items() if label in wanted])
+        # Konwersja wartości (najdroższa) tylko dla wierszy, które przeszły filtr
+        if mask.all():
+            values = np.array(values, dtype=np.float64)
+        else:
+            values = np.array(list(itertools.compress(values, mask.tolist())), dtype=np.float64)
+        yield timestamps[mask], codes[mask], labels, values
+        if sorted_rows and timestamps[-1] > end_ts:
+            return
+
+
+def _scan_file(file_path: str, start: datetime, end: datetime, sensor_id: Optional[str],
+               index: Optional[LogIndex]) -> np.ndarray:
+    # Uruchamiane w procesie roboczym: wynik wraca jako tablica posortowana po czasie,
+    # która jest tańsza w serializacji niż lista słowników
+    if file_path.endswith(SEGMENT_SUFFIX):
+        try:
+            batch = Segment(file_path).read(start.timestamp(), end.timestamp(), sensor_id)
+        except FileNotFoundError:
+            batch = reading_array([], [], [], [])
+    else:
+        # Etykiety przechodzą jako obiekty str w pełnej długości, bez tablic '<U' po drodze
+        batch = readings_to_array(Reading(r['sensor_id'], r['value'], r['unit'], r['timestamp'].timestamp())
+                                  for r in _read_file(file_path, start, end, sensor_id, index))
+    return batch[np.argsort(batch['timestamp'], kind='stable')]
+
+
 class Logger:
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: str, log_dir: Optional[str] = None):
         with open(config_path, 'r') as f:
             config = json.load(f)
         
-        self.log_dir = config.get('log_dir', './logs')
+        # log_dir podany wprost (np. osobny katalog dla każdego procesu serwera) ma pierwszeństwo
+        self.log_dir = log_dir or config.get('log_dir', './logs')
         self.filename_pattern = config.get('filename_pattern', 'sensors_%Y%m%d_%H%M%S.csv')
         self.buffer_size = config.get('buffer_size', 200)
         self.rotate_every_hours = config.get('rotate_every_hours', 24)
         self.max_size_mb = config.get('max_size_mb', 10)
         self.rotate_after_lines = config.get('rotate_after_lines', None)
         self.retention_days = config.get('retention_days', 30)
+        self.async_writer = config.get('async_writer', False)
+        self.max_batch_size = config.get('max_batch_size', 1000)
+        self.max_latency_ms = config.get('max_latency_ms', 100)
+        self.queue_size = config.get('queue_size', 100000)
+        self.queue_full_policy = config.get('queue_full_policy', 'block')
+        self.fsync_policy = config.get('fsync_policy', 'never')
+        self.index_interval = config.get('index_interval', 1000)
+        # Co ile zapisów bloku indeks aktywnego pliku trafia na dysk (oraz zawsze przy rotacji i stop)
+        self.index_save_interval = config.get('index_save_interval', 50)
+        self.storage = config.get('storage', 'csv')
+        self.rollup_save_interval = config.get('rollup_save_interval', 10)
+        self.compression = config.get('compression', None)
+        self.compression_level = config.get('compression_level', None)
+        self.archive_cache_mb = config.get('archive_cache_mb', 64)
+        self.max_write_retries = config.get('max_write_retries', 3)
+        if self.queue_full_policy not in ('block', 'drop'):
+            raise ValueError(f"Unknown queue_full_policy: {self.queue_full_policy}")
+        if self.fsync_policy not in ('never', 'batch', 'flush'):
+            raise ValueError(f"Unknown fsync_policy: {self.fsync_policy}")
+        if self.storage not in ('csv', 'columnar'):
+            raise ValueError(f"Unknown storage: {self.storage}")
+        if self.compression is not None and self.compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unknown compression: {self.compression}")
+        if self.compression is not None and self.storage != 'csv':
+            raise ValueError("Compression is only supported for csv storage")
         
         self._buffer = []
         self._lock = threading.Lock()
@@ -34,6 +346,28 @@ class Logger:
 
         self._file = None 
         self._csv_writer = None
+        self._bytes_written = 0
+        self._rows_written = 0
+        self._index = None
+        self._index_unsaved = 0
+        self._segment = None
+        self._rollups: Dict[str, Rollup] = {}
+        self._rollups_saved_at = 0.0
+        self._archive_threads = []
+        # Pula procesów dla read_logs_parallel tworzona przy pierwszym zapytaniu i zamykana w stop()
+        self._scan_pool = None
+        self._scan_pool_workers = 0
+        self._scan_pool_lock = threading.Lock()
+        self._archive_cache = ArchiveCache(int(self.archive_cache_mb * 1024 * 1024)) if self.archive_cache_mb else None
+        self._queue = queue.Queue(maxsize=self.queue_size) if self.async_writer else None
+        self._writer_thread = None
+        # Producenci w trakcie put() - stop() czeka na nich, żeby nic nie zostało w kolejce
+        self._producers = 0
+        self._producers_cv = threading.Condition()
+        self._closing = False
+        self._failed_writes = 0
+        self.dropped = 0
+        self.write_errors = 0
 
     def start(self):
         with self._lock:
@@ -41,130 +375,758 @@ class Logger:
                 return
             self._open_new_log_file()
             self._is_running = True
+            self._resume_archiving()
+            with self._producers_cv:
+                self._closing = False
+            if self._queue is not None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+                self._writer_thread.start()
 
     def stop(self):
+        self._shutdown_scan_pool()
+        with self._producers_cv:
+            self._closing = True
+        if self._writer_thread is not None:
+            self._queue.put(_STOP)
+            self._writer_thread.join()
+            self._writer_thread = None
         with self._lock:
             if not self._is_running:
                 return
+            # Producenci zablokowani w put() dokładają odczyty już po zakończeniu wątku zapisującego -
+            # kolejka opróżniana, dopóki wszyscy nie wyjdą z put()
+            while True:
+                self._drain_queue()
+                with self._producers_cv:
+                    if not self._producers:
+                        break
+                    self._producers_cv.wait(0.01)
+            self._drain_queue()
             self._flush_buffer()
+            self._save_index()
+            self._save_rollups()
+            if self.fsync_policy != 'never' and self._file:
+                os.fsync(self._file.fileno())
             if self._file:
                 self._file.close()
                 self._file = None
+            if self._segment:
+                self._segment.close()
+                self._segment = None
             self._is_running = False
+        self.wait_for_archives()
+
+    def wait_for_archives(self):
+        for thread in list(self._archive_threads):
+            thread.join()
 
     def log_reading(self, sensor_id: str, timestamp: datetime, value: float, unit: str):
-        entry = {
-            'timestamp': timestamp.isoformat(),
-            'sensor_id': sensor_id,
-            'value': value,
-            'unit': unit
-        }
+        self.log(Reading(sensor_id, value, unit, timestamp.timestamp()))
+
+    def log(self, reading: Reading):
+        if not self._is_running:
+            self.start()
+        if self._queue is not None:
+            self._enqueue(reading, 1)
+            return
         with self._lock:
-            if not self._is_running:
-                self.start()
-            self._buffer.append(entry)
+            self._buffer.append(reading)
             if len(self._buffer) >= self.buffer_size:
                 self._flush_buffer()
             self._check_rotation()
 
+    def log_readings(self, readings: Union[Iterable[Reading], np.ndarray, None] = None, *,
+                     sensor_ids=None, values=None, units=None, timestamps=None):
+        if readings is None:
+            fields = {'sensor_ids': sensor_ids, 'values': values, 'units': units}
+            missing = [name for name, field in fields.items() if field is None]
+            if missing:
+                raise ValueError(f"Missing reading fields: {', '.join(missing)}")
+            # Brak znaczników czasu - cała partia dostaje bieżący czas
+            if timestamps is None:
+                timestamps = time.time()
+            readings = reading_array(sensor_ids, values, units, timestamps)
+        elif not isinstance(readings, np.ndarray):
+            readings = [r if isinstance(r, Reading) else Reading(*r) for r in readings]
+        if len(readings) == 0:
+            return
+        if not self._is_running:
+            self.start()
+        if self._queue is not None:
+            self._enqueue(readings, len(readings))
+            return
+        with self._lock:
+            self._add_item(readings)
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_buffer()
+            self._check_rotation()
+
+    def _enqueue(self, item, rows: int):
+        with self._producers_cv:
+            closing = self._closing
+            if not closing:
+                self._producers += 1
+        if closing:
+            # Logger jest właśnie zatrzymywany - zapis bezpośrednio, o ile plik jest jeszcze otwarty
+            with self._lock:
+                if self._is_running:
+                    self._add_item(item)
+                    return
+            self.dropped += rows
+            return
+        try:
+            if self.queue_full_policy == 'drop':
+                try:
+                    self._queue.put_nowait(item)
+                except queue.Full:
+                    self.dropped += rows
+            else:
+                self._queue.put(item)
+        finally:
+            with self._producers_cv:
+                self._producers -= 1
+                self._producers_cv.notify_all()
+
+    def _add_item(self, item):
+        if isinstance(item, Reading):
+            self._buffer.append(item)
+        elif isinstance(item, np.ndarray):
+            if len(item) < self.buffer_size:
+                self._buffer.extend(readings_from_array(item))
+                return
+            # Duża paczka tablicowa zapisywana od razu jednym blokiem, po odczytach z bufora
+            self._flush_buffer()
+            self._write_array(item)
+        else:
+            self._buffer.extend(item)
+
+    def flush(self):
+        thread = self._writer_thread
+        if thread is not None:
+            # Znacznik w kolejce: czekamy tylko na odczyty dodane przed wywołaniem flush,
+            # a nie na opróżnienie kolejki (przy ciągłym zapisie mogłoby nie nastąpić nigdy)
+            marker = threading.Event()
+            self._queue.put(marker)
+            while not marker.wait(0.1) and thread.is_alive():
+                pass
+        with self._lock:
+            if not self._is_running:
+                return
+            self._flush_buffer()
+            if self.fsync_policy != 'never' and self._file:
+                os.fsync(self._file.fileno())
+
+    def stats(self) -> Dict:
+        return {
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'buffered': len(self._buffer),
+            'dropped': self.dropped,
+            'write_errors': self.write_errors,
+            'rows_written': self._rows_written,
+            'bytes_written': self._bytes_written,
+            'archive_cache': self._archive_cache.stats() if self._archive_cache is not None else None
+        }
+
+    def _writer_loop(self):
+        # Group commit: zbieramy odczyty z kolejki aż do max_batch_size lub max_latency_ms
+        # i zapisujemy je jednym flushem
+        max_latency = self.max_latency_ms / 1000
+        while True:
+            item = self._queue.get()
+            batch, markers, rows = [], [], 0
+            stopping = False
+            deadline = time.monotonic() + max_latency
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                if isinstance(item, threading.Event):
+                    # flush(): paczka zapisywana od razu, bez czekania na max_latency_ms
+                    markers.append(item)
+                    break
+                batch.append(item)
+                rows += 1 if isinstance(item, Reading) else len(item)
+                if rows >= self.max_batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+            self._write_batch(batch)
+            for marker in markers:
+                marker.set()
+            if stopping:
+                return
+
+    def _write_batch(self, batch: list):
+        try:
+            with self._lock:
+                for item in batch:
+                    self._add_item(item)
+                self._flush_buffer()
+                self._check_rotation()
+            self._failed_writes = 0
+        except Exception:
+            self.write_errors += 1
+            self._failed_writes += 1
+            # Niezapisane odczyty zostają w buforze i idą ponownie z następną paczką; po
+            # max_write_retries nieudanych próbach z rzędu są porzucane (liczone w dropped)
+            if self._failed_writes >= self.max_write_retries:
+                with self._lock:
+                    self.dropped += len(self._buffer)
+                    self._buffer.clear()
+                self._failed_writes = 0
+
+    def _drain_queue(self):
+        if self._queue is None:
+            return
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not _STOP:
+                self._add_item(item)
+
     def read_logs(self, start: datetime, end: datetime, sensor_id: Optional[str] = None) -> Iterator[Dict]:
-        files = glob.glob(os.path.join(self.log_dir, '*.csv'))
+        for file_path, index in self._query_files(start, end, sensor_id):
+            if self._archive_cache is not None and self._is_cacheable(file_path):
+                # Archiwa są niezmienne - dekodowane raz i obsługiwane z pamięci przy kolejnych zapytaniach
+                try:
+                    archive = self._archive_cache.get(file_path, _decode_archive)
+                except FileNotFoundError:
+                    continue
+                yield from _array_rows(archive.select(start.timestamp(), end.timestamp(), sensor_id))
+                continue
+            yield from _read_file(file_path, start, end, sensor_id, index)
+
+    def read_logs_array(self, start: datetime, end: datetime,
+                        sensor_ids: Union[str, Iterable[str], None] = None) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        # Wynik: sensor_id -> (czas w s od epoki, wartości), posortowane po czasie, bez obiektów na wiersz
+        if isinstance(sensor_ids, str):
+            sensor_ids = [sensor_ids]
+        wanted = None if sensor_ids is None else set(sensor_ids)
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        parts: Dict[str, list] = {}
+        for file_path, index in self._query_files(start, end, None):
+            if index is not None and wanted is not None and not index.sensor_ids & wanted:
+                continue
+            for timestamps, codes, labels, values in self._file_columns(file_path, index, start_ts, end_ts, wanted):
+                # Jedno sortowanie kodów zamiast osobnej maski na każdy czujnik
+                order = np.argsort(codes, kind='stable')
+                ends = np.cumsum(np.bincount(codes, minlength=len(labels))).tolist()
+                for code, label in enumerate(labels):
+                    begin = ends[code - 1] if code else 0
+                    if begin == ends[code] or (wanted is not None and label not in wanted):
+                        continue
+                    rows = order[begin:ends[code]]
+                    parts.setdefault(label, []).append((timestamps[rows], values[rows]))
+
+        result = {}
+        for sid in sorted(parts if wanted is None else wanted):
+            chunks = parts.get(sid)
+            if not chunks:
+                result[sid] = (np.empty(0), np.empty(0))
+                continue
+            timestamps = np.concatenate([c[0] for c in chunks])
+            values = np.concatenate([c[1] for c in chunks])
+            order = np.argsort(timestamps, kind='stable')
+            result[sid] = (timestamps[order], values[order])
+        return result
+
+    def _file_columns(self, file_path: str, index: Optional[LogIndex], start_ts: float, end_ts: float,
+                      wanted: Optional[set] = None):
+        try:
+            if file_path.endswith(SEGMENT_SUFFIX):
+                segment = Segment(file_path)
+                rows = segment.select(start_ts, end_ts)
+                yield (segment.column('timestamp')[rows] / 1e9, segment.column('sensor')[rows],
+                       segment.sensor_ids, segment.column('value')[rows])
+            elif self._archive_cache is not None and self._is_cacheable(file_path):
+                archive = self._archive_cache.get(file_path, _decode_archive)
+                rows = archive.select_rows(start_ts, end_ts)
+                yield archive.timestamps[rows], archive.sensor_codes[rows], archive.sensor_ids, archive.values[rows]
+            else:
+                chunks = _file_chunks(file_path, index, start_ts)
+                yield from _text_columns(chunks, start_ts, end_ts, index is not None and index.sorted, wanted)
+        except FileNotFoundError:
+            # Plik przeniesiony lub usunięty (rotacja, retencja) w trakcie odczytu
+            return
+
+    def read_logs_parallel(self, start: datetime, end: datetime, sensor_id: Optional[str] = None,
+                           workers: Optional[int] = None, ordered: bool = True) -> Iterator[Dict]:
+        # Pliki rozdzielane między procesy robocze; ordered=False zwraca wiersze pliku,
+        # który skończył się jako pierwszy (w obrębie pliku posortowane po czasie)
+        tasks = self._query_files(start, end, sensor_id)
+        if not tasks:
+            return
+        pool = self._scan_executor(workers or os.cpu_count() or 1)
+        if not ordered:
+            futures = [pool.submit(_scan_file, path, start, end, sensor_id, index) for path, index in tasks]
+            for future in as_completed(futures):
+                yield from _array_rows(future.result())
+            return
+        # Pliki w kolejności początku zakresu czasu (segmenty bez indeksu - na początku);
+        # wyniki plików są już posortowane, więc wystarczy scalanie
+        tasks.sort(key=lambda task: task[1].min_ts if task[1] is not None else float('-inf'))
+        futures = [pool.submit(_scan_file, path, start, end, sensor_id, index) for path, index in tasks]
+        for group in _overlapping_groups(tasks, futures):
+            if len(group) == 1:
+                yield from _array_rows(group[0].result())
+                continue
+            streams = [_timed_rows(future) for future in group]
+            for _, row in heapq.merge(*streams, key=operator.itemgetter(0)):
+                yield row
+
+    def _scan_executor(self, workers: int) -> ProcessPoolExecutor:
+        with self._scan_pool_lock:
+            if self._scan_pool is None or self._scan_pool_workers < workers:
+                if self._scan_pool is not None:
+                    self._scan_pool.shutdown()
+                context = multiprocessing.get_context('spawn')
+                self._scan_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+                self._scan_pool_workers = workers
+            return self._scan_pool
+
+    def _shutdown_scan_pool(self):
+        with self._scan_pool_lock:
+            if self._scan_pool is not None:
+                self._scan_pool.shutdown()
+                self._scan_pool = None
+                self._scan_pool_workers = 0
+
+    def _query_files(self, start: datetime, end: datetime, sensor_id: Optional[str]) -> list:
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        tasks = []
+        for file_path in self._data_files():
+            index = None if file_path.endswith(SEGMENT_SUFFIX) else self._active_index(file_path)
+            if index is None and not file_path.endswith(SEGMENT_SUFFIX):
+                index = self._get_index(file_path)
+            # Pliki, których zakres czasu lub zbiór czujników nie pasuje do zapytania, są pomijane
+            if index is not None and not index.overlaps(start_ts, end_ts, sensor_id):
+                continue
+            tasks.append((file_path, index))
+        return tasks
+
+    def _segment_dirs(self):
+        return (glob.glob(os.path.join(self.log_dir, '*' + SEGMENT_SUFFIX)) +
+                glob.glob(os.path.join(self.archive_dir, '*' + SEGMENT_SUFFIX)))
+
+    def read_rollups(self, start: datetime, end: datetime, sensor_id: Optional[str] = None,
+                     resolution: str = 'hour') -> list:
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown rollup resolution: {resolution}")
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        total = Rollup(resolution)
+        with self._lock:
+            current = self._current_filename if self._is_running else None
+            if current is not None:
+                total.merge(self._rollups[resolution].query(start_ts, end_ts, sensor_id))
+        for file_path in self._data_files():
+            if current is not None and os.path.splitext(file_path)[0] == os.path.splitext(current)[0]:
+                continue
+            rollup = self._get_rollup(file_path, resolution)
+            if rollup is not None:
+                total.merge(rollup.query(start_ts, end_ts, sensor_id))
+
+        result = []
+        for sid, buckets in total.buckets.items():
+            for bucket, (count, value_sum, low, high) in buckets.items():
+                result.append({
+                    'timestamp': datetime.fromtimestamp(bucket),
+                    'sensor_id': sid,
+                    'count': int(count),
+                    'mean': value_sum / count,
+                    'min': low,
+                    'max': high
+                })
+        result.sort(key=lambda r: (r['timestamp'], r['sensor_id']))
+        return result
+
+    def _data_files(self) -> list:
+        # Jeden plik na nazwę bazową: archiwum .zip ma pierwszeństwo przed plikiem czekającym na kompresję.
+        # Pliki oczekujące listowane przed archiwami - kompresja kończąca się między dwoma globami
+        # nie może ukryć pliku w obu listach
+        pending = glob.glob(os.path.join(self.archive_dir, '*.csv'))
         zip_files = glob.glob(os.path.join(self.archive_dir, '*.zip'))
-        all_files = files + zip_files
-
-        for file_path in all_files:
-            if file_path.endswith('.zip'):
-                with zipfile.ZipFile(file_path, 'r') as zipf:
-                    for name in zipf.namelist():
-                        with zipf.open(name) as f:
-                            reader = csv.DictReader(line.decode('utf-8') for line in f)
-                            for row in reader:
-                                yield self._parse_log_row(row, start, end, sensor_id)
+        pending = [p for p in pending if p[:-4] + '.zip' not in zip_files]
+        return (glob.glob(os.path.join(self.log_dir, '*.csv')) + pending + zip_files +
+                self._compressed_files(self.log_dir, self.archive_dir) + self._segment_dirs())
+
+    def _compressed_files(self, *directories: str) -> list:
+        return [path for directory in directories for suffix in COMPRESSION_SUFFIXES.values()
+                for path in glob.glob(os.path.join(directory, '*.csv' + suffix))]
+
+    def _get_rollup(self, file_path: str, resolution: str) -> Optional[Rollup]:
+        rollup = Rollup.load(rollup_path(file_path, resolution))
+        # Zarchiwizowane pliki się nie zmieniają - sprawdzanie liczby wierszy tylko dla plików w log_dir
+        if rollup is not None and (self._is_archived(file_path) or rollup.rows == self._raw_rows(file_path)):
+            return rollup
+        try:
+            rollups = self._build_rollups(file_path)
+        except (OSError, zipfile.BadZipFile):
+            return None
+        for res, built in rollups.items():
+            built.save(rollup_path(file_path, res))
+        return rollups[resolution]
+
+    def _is_archived(self, file_path: str) -> bool:
+        # Pliki .csv w archive/ czekają jeszcze na kompresję i mogą zniknąć
+        return (os.path.normpath(os.path.dirname(file_path)) == os.path.normpath(self.archive_dir)
+                and not file_path.endswith('.csv'))
+
+    def _is_cacheable(self, file_path: str) -> bool:
+        # Segmenty są czytane przez memmap i nie wymagają dekodowania
+        return self._is_archived(file_path) and not file_path.endswith(SEGMENT_SUFFIX)
+
+    def _raw_rows(self, file_path: str) -> Optional[int]:
+        if file_path.endswith(SEGMENT_SUFFIX):
+            return Segment(file_path).rows
+        index = self._get_index(file_path)
+        return index.rows if index is not None else None
+
+    def _build_rollups(self, file_path: str) -> Dict[str, Rollup]:
+        # Odbudowa agregatów z surowych danych (pliki sprzed tej funkcji lub nieaktualne agregaty)
+        rollups = {res: Rollup(res) for res in RESOLUTIONS}
+        if file_path.endswith(SEGMENT_SUFFIX):
+            batch = Segment(file_path).to_array()
+            timestamps, sensor_ids, values = batch['timestamp'], batch['sensor_id'], batch['value']
+        else:
+            rows = list(_read_file(file_path, datetime.min, datetime.max, None))
+            timestamps = [r['timestamp'].timestamp() for r in rows]
+            sensor_ids = [r['sensor_id'] for r in rows]
+            values = [r['value'] for r in rows]
+        for rollup in rollups.values():
+            rollup.add(timestamps, sensor_ids, values)
+        return rollups
+
+    def _update_rollups(self, timestamps, sensor_ids, values):
+        for rollup in self._rollups.values():
+            rollup.add(timestamps, sensor_ids, values)
+        if time.monotonic() - self._rollups_saved_at >= self.rollup_save_interval:
+            self._save_rollups()
+
+    def _save_rollups(self):
+        # Agregaty zapisywane okresowo - po awarii nieaktualny plik zostanie odbudowany z danych
+        if self._current_filename is None:
+            return
+        for res, rollup in self._rollups.items():
+            rollup.save(rollup_path(self._current_filename, res))
+        self._rollups_saved_at = time.monotonic()
+
+    def _open_rollups(self):
+        if self._rows_written:
+            loaded = {res: Rollup.load(rollup_path(self._current_filename, res)) for res in RESOLUTIONS}
+            if all(r is not None and r.rows == self._rows_written for r in loaded.values()):
+                self._rollups = loaded
             else:
-                with open(file_path, 'r', newline='') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        yield self._parse_log_row(row, start, end, sensor_id)
+                self._rollups = self._build_rollups(self._current_filename)
+        else:
+            self._rollups = {res: Rollup(res) for res in RESOLUTIONS}
 
-    def _parse_log_row(self, row: Dict, start: datetime, end: datetime, sensor_id: Optional[str]):
+    def export_csv(self, path: str, output_path: str):
+        # Eksport segmentu kolumnowego do formatu CSV zgodnego z backendem tekstowym
+        batch = Segment(path).to_array()
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(_FIELDS)
+            if len(batch):
+                f.write(_format_rows(batch))
+
+    def _active_index(self, file_path: str) -> Optional[LogIndex]:
+        # Indeks aktywnego pliku z pamięci - wersja na dysku bywa starsza o kilka bloków
+        with self._lock:
+            if (not self._is_running or self._index is None or
+                    os.path.normpath(file_path) != os.path.normpath(self._current_filename)):
+                return None
+            return LogIndex.from_dict(self._index.to_dict())
+
+    def _save_index(self):
+        if self._index is not None and self._index_unsaved:
+            self._index.save(index_path(self._current_filename))
+        self._index_unsaved = 0
+
+    def _get_index(self, file_path: str) -> Optional[LogIndex]:
+        path = index_path(file_path)
+        index = LogIndex.load(path)
         try:
-            timestamp = datetime.fromisoformat(row['timestamp'])
-        except Exception:
+            # Brak indeksu (pliki sprzed tej funkcji) lub nieaktualny indeks - odbudowa z pliku
+            if index is None or (not file_path.endswith('.zip') and index.size != os.path.getsize(file_path)):
+                index = LogIndex.build(file_path, self.index_interval)
+                index.save(path)
+        except (OSError, zipfile.BadZipFile):
             return None
-        if start <= timestamp <= end:
-            if sensor_id is None or row['sensor_id'] == sensor_id:
-                return {
-                    'timestamp': timestamp,
-                    'sensor_id': row['sensor_id'],
-                    'value': float(row['value']),
-                    'unit': row['unit']
-                }
-        return None
+        return index
+
+    def rebuild_indexes(self) -> int:
+        # Wszystkie pliki zwracane przez _query_files poza segmentami (bez indeksu); aktywny plik
+        # pomijany - jego indeks w pamięci jest aktualny i trafia na dysk przy rotacji i stop
+        with self._lock:
+            current = os.path.normpath(self._current_filename) if self._is_running else None
+        files = [file_path for file_path in self._data_files()
+                 if not file_path.endswith(SEGMENT_SUFFIX) and os.path.normpath(file_path) != current]
+        for file_path in files:
+            LogIndex.build(file_path, self.index_interval).save(index_path(file_path))
+        return len(files)
 
     def _open_new_log_file(self):
         filename = datetime.now().strftime(self.filename_pattern)
         filepath = os.path.join(self.log_dir, filename)
         self._current_filename = filepath
+        self._index_unsaved = 0
         self._file_start_time = datetime.now()
         self._last_rotation_time = datetime.now()
+        if self.compression is not None:
+            self._open_compressed_file(filepath + COMPRESSION_SUFFIXES[self.compression])
+            return
+        if self.storage == 'columnar':
+            self._current_filename = segment_path(filepath)
+            self._segment = SegmentWriter(self._current_filename)
+            self._rows_written = self._segment.rows
+            self._bytes_written = self._segment.nbytes
+            self._open_rollups()
+            return
         self._file = open(filepath, 'a', newline='', encoding='utf-8')
         self._csv_writer = csv.writer(self._file)
         if self._file.tell() == 0:
-            self._csv_writer.writerow(['timestamp', 'sensor_id', 'value', 'unit'])
+            self._csv_writer.writerow(_FIELDS)
+            self._file.flush()
+            self._index = LogIndex(self.index_interval)
+        else:
+            # Dopisywanie do istniejącego pliku: indeks (i liczba wierszy) wczytywany jednorazowo przy otwarciu
+            self._index = self._get_index(filepath) or LogIndex.build(filepath, self.index_interval)
+        self._rows_written = self._index.rows
+        self._bytes_written = self._file.tell()
+        self._open_rollups()
+
+    def _open_compressed_file(self, filepath: str):
+        self._current_filename = filepath
+        self._file = open(filepath, 'ab')
+        self._csv_writer = None
+        if self._file.tell() == 0:
+            self._file.write(compress_block(','.join(_FIELDS).encode('utf-8') + b'\r\n', self.compression,
+                                            self.compression_level))
+            self._file.flush()
+            self._index = LogIndex(self.index_interval)
+            self._index.size = self._file.tell()
+        else:
+            self._index = self._get_index(filepath) or LogIndex.build(filepath, self.index_interval)
+            # Obcięcie niedokończonego bloku po przerwanym zapisie - dalsze bloki byłyby nieosiągalne
+            if self._file.tell() > self._index.size:
+                self._file.truncate(self._index.size)
+                self._file.seek(self._index.size)
+        self._rows_written = self._index.rows
+        self._bytes_written = self._file.tell()
+        self._open_rollups()
 
     def _flush_buffer(self):
         if not self._buffer:
             return
-        for entry in self._buffer:
-            self._csv_writer.writerow([
-                entry['timestamp'],
-                entry['sensor_id'],
-                entry['value'],
-                entry['unit']
-            ])
-        self._file.flush()
+        if self._segment is not None:
+            self._write_segment(readings_to_array(self._buffer))
+            self._buffer.clear()
+            return
+        out = io.StringIO()
+        csv.writer(out).writerows(
+            (datetime.fromtimestamp(r.timestamp).isoformat(), r.sensor_id, r.value, r.unit)
+            for r in self._buffer
+        )
+        timestamps = [r.timestamp for r in self._buffer]
+        self._write_block(out.getvalue(), timestamps, {r.sensor_id for r in self._buffer})
+        self._update_rollups(timestamps, [r.sensor_id for r in self._buffer], [r.value for r in self._buffer])
         self._buffer.clear()
 
+    def _write_array(self, batch: np.ndarray):
+        if len(batch) == 0:
+            return
+        if self._segment is not None:
+            self._write_segment(batch)
+            return
+        self._write_block(_format_rows(batch), batch['timestamp'].tolist(),
+                          set(np.unique(batch['sensor_id']).tolist()))
+        self._update_rollups(batch['timestamp'], batch['sensor_id'], batch['value'])
+
+    def _write_block(self, text: str, timestamps, sensor_ids):
+        offset = self._bytes_written
+        if self.compression is not None:
+            self._file.write(compress_block(text.encode('utf-8'), self.compression, self.compression_level))
+        else:
+            self._file.write(text)
+        self._file.flush()
+        if self.fsync_policy == 'batch':
+            os.fsync(self._file.fileno())
+        self._rows_written += len(timestamps)
+        self._bytes_written = self._file.tell()
+        self._index.add_rows(offset, timestamps, sensor_ids, self._bytes_written)
+        # Zapis całego indeksu przy każdym bloku kosztowałby tyle, ile rozmiar indeksu; nieaktualny
+        # indeks na dysku (np. po awarii) jest wykrywany po rozmiarze pliku i odbudowywany
+        self._index_unsaved += 1
+        if self._index_unsaved >= self.index_save_interval:
+            self._save_index()
+
+    def _write_segment(self, batch: np.ndarray):
+        self._segment.append(batch, fsync=self.fsync_policy == 'batch')
+        self._rows_written = self._segment.rows
+        self._bytes_written = self._segment.nbytes
+        self._update_rollups(batch['timestamp'], batch['sensor_id'], batch['value'])
+
     def _check_rotation(self):
         now = datetime.now()
         if (now - self._last_rotation_time).total_seconds() >= self.rotate_every_hours * 3600:
             self._rotate_log()
 
-        if self._file and os.path.getsize(self._current_filename) >= self.max_size_mb * 1024 * 1024:
+        if (self._file or self._segment) and self._bytes_written >= self.max_size_mb * 1024 * 1024:
             self._rotate_log()
 
         if self.rotate_after_lines is not None:
-            if os.path.exists(self._current_filename):
-                with open(self._current_filename, 'r', encoding='utf-8') as f:
-                    line_count = sum(1 for line in f) - 1
-                if line_count >= self.rotate_after_lines:
-                    self._rotate_log()
+            if self._rows_written + len(self._buffer) >= self.rotate_after_lines:
+                self._rotate_log()
 
     def _rotate_log(self):
+        if self._segment:
+            self._rotate_segment()
+            return
+        if self.compression is not None:
+            self._rotate_compressed()
+            return
         if self._file:
             self._flush_buffer()
+            self._save_index()
             self._file.close()
             self._file = None
-        timestamp_str = self._file_start_time.strftime('%Y%m%d_%H%M%S')
-        archive_name = f"{os.path.basename(self._current_filename).replace('.csv', '')}_{timestamp_str}.zip"
-        archive_path = os.path.join(self.archive_dir, archive_name)
+        archive_path = self._archive_path(os.path.basename(self._current_filename).replace('.csv', ''), '.zip')
+        pending_path = archive_path[:-4] + '.csv'
+        if os.path.exists(index_path(self._current_filename)):
+            os.replace(index_path(self._current_filename), index_path(archive_path))
+        self._archive_rollups(archive_path)
+        os.replace(self._current_filename, pending_path)
 
-        with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED) as zipf:
-            zipf.write(self._current_filename, arcname=os.path.basename(self._current_filename))
-        os.remove(self._current_filename)
+        self._start_archiving(pending_path, archive_path, os.path.basename(self._current_filename))
+        self._open_new_log_file()
+        self._last_rotation_time = datetime.now()
 
+    def _rotate_segment(self):
+        self._flush_buffer()
+        self._segment.close()
+        self._segment = None
+        # Segmenty nie są kompresowane (odczyt przez memmap) - rotacja to tylko przeniesienie katalogu
+        base = os.path.splitext(os.path.basename(self._current_filename))[0]
+        archive_path = self._archive_path(base, SEGMENT_SUFFIX)
+        self._archive_rollups(archive_path)
+        os.replace(self._current_filename, archive_path)
         self._clean_old_archives()
+        self._open_new_log_file()
+        self._last_rotation_time = datetime.now()
 
+    def _rotate_compressed(self):
+        self._flush_buffer()
+        self._save_index()
+        self._file.close()
+        self._file = None
+        # Plik jest już skompresowany - rotacja to tylko przeniesienie do archiwum
+        name = os.path.basename(self._current_filename)
+        suffix = COMPRESSION_SUFFIXES[self.compression]
+        archive_path = self._archive_path(name[:-len('.csv' + suffix)], '.csv' + suffix)
+        if os.path.exists(index_path(self._current_filename)):
+            os.replace(index_path(self._current_filename), index_path(archive_path))
+        self._archive_rollups(archive_path)
+        os.replace(self._current_filename, archive_path)
+        self._clean_old_archives()
         self._open_new_log_file()
         self._last_rotation_time = datetime.now()
 
+    def _archive_path(self, base: str, suffix: str) -> str:
+        # Nazwa z czasem otwarcia pliku; kolejna rotacja w tej samej sekundzie dostaje licznik,
+        # żeby nie nadpisać poprzedniego archiwum (ani jego indeksu i agregatów)
+        stem = os.path.join(self.archive_dir, f"{base}_{self._file_start_time.strftime('%Y%m%d_%H%M%S')}")
+        candidate, counter = stem, 0
+        while glob.glob(glob.escape(candidate) + '.*'):
+            counter += 1
+            candidate = f"{stem}_{counter}"
+        return candidate + suffix
+
+    def _archive_rollups(self, archive_path: str):
+        self._save_rollups()
+        for res in RESOLUTIONS:
+            os.replace(rollup_path(self._current_filename, res), rollup_path(archive_path, res))
+
+    def _start_archiving(self, pending_path: str, archive_path: str, arcname: str):
+        # Kompresja odbywa się w tle, żeby nie blokować wątków logujących
+        thread = threading.Thread(
+            target=self._archive_file,
+            args=(pending_path, archive_path, arcname),
+            daemon=True
+        )
+        self._archive_threads.append(thread)
+        thread.start()
+
+    def _resume_archiving(self):
+        # Pliki, których kompresja wcześniej się nie powiodła (np. brak miejsca na dysku),
+        # kompresowane ponownie przy starcie; pozostałości .tmp po przerwanych próbach usuwane
+        if self._archive_threads:
+            return
+        for tmp_path in glob.glob(os.path.join(self.archive_dir, '*.zip.tmp')):
+            os.remove(tmp_path)
+        for pending_path in glob.glob(os.path.join(self.archive_dir, '*.csv')):
+            archive_path = pending_path[:-4] + '.zip'
+            if os.path.exists(archive_path):
+                os.remove(pending_path)
+                continue
+            self._start_archiving(pending_path, archive_path, os.path.basename(pending_path))
+
+    def _archive_file(self, pending_path: str, archive_path: str, arcname: str):
+        tmp_path = archive_path + '.tmp'
+        try:
+            with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as zipf:
+                zipf.write(pending_path, arcname=arcname)
+            os.replace(tmp_path, archive_path)
+            os.remove(pending_path)
+            self._clean_old_archives()
+        except Exception:
+            # Plik .csv zostaje w archiwum (nadal czytelny) i jest kompresowany ponownie przy starcie
+            _log.exception("Archiving %s failed", pending_path)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        finally:
+            self._archive_threads.remove(threading.current_thread())
+
     def _clean_old_archives(self):
         cutoff = datetime.now() - timedelta(days=self.retention_days)
-        for zip_path in glob.glob(os.path.join(self.archive_dir, '*.zip')):
+        archives = glob.glob(os.path.join(self.archive_dir, '*.zip'))
+        archives += self._compressed_files(self.archive_dir)
+        for zip_path in archives:
             try:
                 mtime = datetime.fromtimestamp(os.path.getmtime(zip_path))
                 if mtime < cutoff:
                     os.remove(zip_path)
+                    self._remove_sidecars(zip_path)
+            except Exception:
+                continue
+        # Pliki czekające na kompresję (np. po nieudanej próbie) także podlegają retencji
+        for pending_path in glob.glob(os.path.join(self.archive_dir, '*.csv')):
+            try:
+                if datetime.fromtimestamp(os.path.getmtime(pending_path)) < cutoff:
+                    os.remove(pending_path)
+                    if not os.path.exists(pending_path[:-4] + '.zip'):
+                        self._remove_sidecars(pending_path[:-4] + '.zip')
+            except Exception:
+                continue
+        for segment_dir in glob.glob(os.path.join(self.archive_dir, '*' + SEGMENT_SUFFIX)):
+            try:
+                if datetime.fromtimestamp(os.path.getmtime(segment_dir)) < cutoff:
+                    shutil.rmtree(segment_dir)
+                    self._remove_sidecars(segment_dir)
             except Exception:
                 continue
 
+    def _remove_sidecars(self, file_path: str):
+        for path in [index_path(file_path)] + [rollup_path(file_path, res) for res in RESOLUTIONS]:
+            if os.path.exists(path):
+                os.remove(path)
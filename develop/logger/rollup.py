@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+RESOLUTIONS = {'minute': 60, 'hour': 3600}
+
+
+def rollup_path(file_path: str, resolution: str) -> str:
+    # Agregaty leżą obok pliku z danymi (.csv/.zip/.seg) i przenoszone są razem z nim do archiwum
+    return f"{os.path.splitext(file_path)[0]}.{resolution}.rollup"
+
+
+class Rollup:
+    def __init__(self, resolution: str = 'hour'):
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown rollup resolution: {resolution}")
+        self.resolution = resolution
+        self.seconds = RESOLUTIONS[resolution]
+        # sensor_id -> {początek kubełka (s od epoki, wyrównany do UTC): [count, sum, min, max]}
+        self.buckets: Dict[str, Dict[int, List[float]]] = {}
+        self.rows = 0
+
+    def add(self, timestamps, sensor_ids, values) -> None:
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        sensor_ids = np.asarray(sensor_ids)
+        self.rows += len(timestamps)
+        # Wartości NaN (nieaktywne czujniki) nie wchodzą do agregatów
+        valid = ~np.isnan(values)
+        if not valid.all():
+            timestamps, values, sensor_ids = timestamps[valid], values[valid], sensor_ids[valid]
+        if len(values) == 0:
+            return
+        # Jeden klucz całkowity (czujnik, kubełek) - grupowanie jednym np.unique na int64
+        labels, codes = np.unique(sensor_ids, return_inverse=True)
+        buckets = np.floor(timestamps / self.seconds).astype(np.int64)
+        first = buckets.min()
+        span = int(buckets.max() - first) + 1
+        keys, inverse = np.unique(codes.reshape(-1) * span + (buckets - first), return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=values)
+        mins = np.full(len(keys), np.inf)
+        maxs = np.full(len(keys), -np.inf)
+        np.minimum.at(mins, inverse, values)
+        np.maximum.at(maxs, inverse, values)
+        labels = labels.tolist()
+        for key, count, total, low, high in zip(keys.tolist(), counts.tolist(), sums.tolist(),
+                                                mins.tolist(), maxs.tolist()):
+            code, offset = divmod(key, span)
+            target = self.buckets.setdefault(labels[code], {})
+            self._merge_bucket(target, (int(first) + offset) * self.seconds, [count, total, low, high])
+
+    def merge(self, buckets: Dict[str, Dict[int, List[float]]]) -> None:
+        for sensor_id, sensor_buckets in buckets.items():
+            target = self.buckets.setdefault(sensor_id, {})
+            for bucket, stats in sensor_buckets.items():
+                self._merge_bucket(target, bucket, list(stats))
+
+    @staticmethod
+    def _merge_bucket(buckets: Dict[int, List[float]], bucket: int, stats: List[float]) -> None:
+        current = buckets.get(bucket)
+        if current is None:
+            buckets[bucket] = stats
+            return
+        current[0] += stats[0]
+        current[1] += stats[1]
+        current[2] = min(current[2], stats[2])
+        current[3] = max(current[3], stats[3])
+
+    def query(self, start: float, end: float, sensor_id: Optional[str] = None) -> Dict[str, Dict[int, List[float]]]:
+        first = int(start // self.seconds * self.seconds)
+        result = {}
+        for sid, buckets in self.buckets.items():
+            if sensor_id is not None and sid != sensor_id:
+                continue
+            selected = {b: stats for b, stats in buckets.items() if first <= b <= end}
+            if selected:
+                result[sid] = selected
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            'resolution': self.resolution,
+            'rows': self.rows,
+            'sensors': {sid: [[b] + stats for b, stats in sorted(buckets.items())]
+                        for sid, buckets in self.buckets.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Rollup':
+        rollup = cls(data['resolution'])
+        rollup.rows = data['rows']
+        rollup.buckets = {sid: {int(entry[0]): list(entry[1:]) for entry in entries}
+                          for sid, entries in data['sensors'].items()}
+        return rollup
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            # json.dumps korzysta z enkodera w C, json.dump do pliku - z wolnego iterencode
+            f.write(json.dumps(self.to_dict()))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['Rollup']:
+        try:
+            with open(path, 'r') as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
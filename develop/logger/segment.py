@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from symulacja_czujnikow.reading import READING_DTYPE
+
+SEGMENT_SUFFIX = '.seg'
+META_FILE = 'meta.json'
+
+# Kolumny o stałej szerokości, każda w osobnym pliku: czas w ns od epoki, wartość,
+# oraz kody słownikowe identyfikatora czujnika i jednostki
+COLUMNS = {
+    'timestamp': np.dtype(np.int64),
+    'value': np.dtype(np.float64),
+    'sensor': np.dtype(np.uint16),
+    'unit': np.dtype(np.uint16),
+}
+_MAX_CODES = np.iinfo(np.uint16).max + 1
+
+
+def segment_path(file_path: str) -> str:
+    return os.path.splitext(file_path)[0] + SEGMENT_SUFFIX
+
+
+def _column_path(path: str, name: str) -> str:
+    return os.path.join(path, name + '.bin')
+
+
+def _load_meta(path: str) -> Dict:
+    try:
+        with open(os.path.join(path, META_FILE), 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'rows': 0, 'sensor_ids': [], 'units': [], 'min_ts': None, 'max_ts': None, 'sorted': True}
+
+
+class SegmentWriter:
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        meta = _load_meta(path)
+        self.rows = meta['rows']
+        self.sensor_ids: List[str] = meta['sensor_ids']
+        self.units: List[str] = meta['units']
+        self.min_ts: Optional[float] = meta['min_ts']
+        self.max_ts: Optional[float] = meta['max_ts']
+        self.sorted: bool = meta['sorted']
+        self._sensor_codes = {s: i for i, s in enumerate(self.sensor_ids)}
+        self._unit_codes = {u: i for i, u in enumerate(self.units)}
+        self._files = {}
+        for name, dtype in COLUMNS.items():
+            f = open(_column_path(path, name), 'ab')
+            # Obcięcie niezatwierdzonego ogona po przerwanym zapisie - meta.json jest źródłem prawdy
+            f.truncate(self.rows * dtype.itemsize)
+            f.seek(0, os.SEEK_END)
+            self._files[name] = f
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows * sum(dtype.itemsize for dtype in COLUMNS.values())
+
+    def append(self, batch: np.ndarray, fsync: bool = False) -> None:
+        if len(batch) == 0:
+            return
+        timestamps = batch['timestamp']
+        columns = {
+            'timestamp': np.round(timestamps * 1e9).astype(np.int64),
+            'value': batch['value'].astype(np.float64),
+            'sensor': self._encode(batch['sensor_id'], self.sensor_ids, self._sensor_codes),
+            'unit': self._encode(batch['unit'], self.units, self._unit_codes),
+        }
+        for name, column in columns.items():
+            f = self._files[name]
+            f.write(column.astype(COLUMNS[name], copy=False).tobytes())
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+
+        batch_min, batch_max = float(timestamps.min()), float(timestamps.max())
+        if self.sorted:
+            if self.max_ts is not None and timestamps[0] < self.max_ts:
+                self.sorted = False
+            elif len(timestamps) > 1 and np.any(timestamps[1:] < timestamps[:-1]):
+                self.sorted = False
+        self.min_ts = batch_min if self.min_ts is None else min(self.min_ts, batch_min)
+        self.max_ts = batch_max if self.max_ts is None else max(self.max_ts, batch_max)
+        self.rows += len(batch)
+        # Metadane zapisywane po danych: czytelnik widzi tylko w pełni zapisane wiersze
+        self._save_meta()
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def _encode(self, labels: np.ndarray, dictionary: List[str], codes: Dict[str, int]) -> np.ndarray:
+        unique, inverse = np.unique(labels, return_inverse=True)
+        mapping = np.empty(len(unique), dtype=np.uint16)
+        for i, label in enumerate(unique.tolist()):
+            code = codes.get(label)
+            if code is None:
+                if len(dictionary) >= _MAX_CODES:
+                    raise ValueError(f"Too many distinct labels in segment {self.path}")
+                code = codes[label] = len(dictionary)
+                dictionary.append(label)
+            mapping[i] = code
+        return mapping[inverse.reshape(-1)]
+
+    def _save_meta(self) -> None:
+        meta = {
+            'rows': self.rows,
+            'sensor_ids': self.sensor_ids,
+            'units': self.units,
+            'min_ts': self.min_ts,
+            'max_ts': self.max_ts,
+            'sorted': self.sorted
+        }
+        path = os.path.join(self.path, META_FILE)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+
+class Segment:
+    def __init__(self, path: str):
+        self.path = path
+        meta = _load_meta(path)
+        self.rows: int = meta['rows']
+        self.sensor_ids: List[str] = meta['sensor_ids']
+        self.units: List[str] = meta['units']
+        self.min_ts: Optional[float] = meta['min_ts']
+        self.max_ts: Optional[float] = meta['max_ts']
+        self.sorted: bool = meta['sorted']
+
+    def column(self, name: str) -> np.ndarray:
+        dtype = COLUMNS[name]
+        if self.rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(_column_path(self.path, name), dtype=dtype, mode='r', shape=(self.rows,))
+
+    def overlaps(self, start: float, end: float, sensor_id: Optional[str] = None) -> bool:
+        if self.rows == 0:
+            return False
+        if self.max_ts < start or self.min_ts > end:
+            return False
+        return sensor_id is None or sensor_id in self.sensor_ids
+
+    def select(self, start: float, end: float, sensor_id: Optional[str] = None) -> np.ndarray:
+        # Indeksy wierszy z zakresu [start, end] - przy posortowanym segmencie wyszukiwanie binarne
+        if not self.overlaps(start, end, sensor_id):
+            return np.empty(0, dtype=np.intp)
+        timestamps = self.column('timestamp')
+        start_ns, end_ns = round(start * 1e9), round(end * 1e9)
+        if self.sorted:
+            lo = np.searchsorted(timestamps, start_ns, side='left')
+            hi = np.searchsorted(timestamps, end_ns, side='right')
+            rows = np.arange(lo, hi)
+        else:
+            rows = np.flatnonzero((timestamps >= start_ns) & (timestamps <= end_ns))
+        if sensor_id is not None:
+            code = self.sensor_ids.index(sensor_id)
+            rows = rows[self.column('sensor')[rows] == code]
+        return rows
+
+    def read(self, start: float, end: float, sensor_id: Optional[str] = None) -> np.ndarray:
+        rows = self.select(start, end, sensor_id)
+        return self.take(rows)
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        batch = np.empty(len(rows), dtype=READING_DTYPE)
+        if len(rows) == 0:
+            return batch
+        batch['timestamp'] = self.column('timestamp')[rows] / 1e9
+        batch['value'] = self.column('value')[rows]
+        # Słowniki jako tablice obiektów - np.array(list_str) miałby typ '<U' i kopiował napisy
+        batch['sensor_id'] = np.array(self.sensor_ids, dtype=object)[self.column('sensor')[rows]]
+        batch['unit'] = np.array(self.units, dtype=object)[self.column('unit')[rows]]
+        return batch
+
+    def to_array(self) -> np.ndarray:
+        return self.take(np.arange(self.rows))
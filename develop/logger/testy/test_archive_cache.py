@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+
+from logger.archive_cache import ArchiveCache, DecodedArchive
+
+
+def _archive(n, start=0.0):
+    return DecodedArchive(start + np.arange(n, dtype=float), ['a', 'b'] * (n // 2), np.arange(n, dtype=float),
+                          ['u'] * n)
+
+
+def test_decoded_archive_select():
+    archive = _archive(10, 100.0)
+    assert archive.sensor_ids == ['a', 'b']
+    batch = archive.select(102.0, 106.0, 'b')
+    assert batch['timestamp'].tolist() == [103.0, 105.0]
+    assert batch['sensor_id'].tolist() == ['b', 'b']
+    assert len(archive.select(0.0, 1000.0, 'missing')) == 0
+
+
+def test_decoded_archive_keeps_long_labels():
+    long_id, long_unit = 'building_A/floor_3/room_301/temperature_north', 'readings/s'
+    archive = DecodedArchive([1.0, 2.0], [long_id, 'b'], [1.0, 2.0], [long_unit, 'u'])
+    batch = archive.select(0.0, 10.0, long_id)
+    assert batch['sensor_id'].tolist() == [long_id]
+    assert batch['unit'].tolist() == [long_unit]
+
+
+def test_cache_hits_misses_and_lru_eviction(tmp_path):
+    paths = []
+    for name in ('a.zip', 'b.zip', 'c.zip'):
+        path = tmp_path / name
+        path.write_bytes(b'')
+        paths.append(str(path))
+    loads = []
+
+    def loader(path):
+        loads.append(path)
+        return _archive(100)
+
+    cache = ArchiveCache(max_bytes=2 * _archive(100).nbytes)
+    cache.get(paths[0], loader)
+    cache.get(paths[1], loader)
+    cache.get(paths[0], loader)
+    cache.get(paths[2], loader)
+    cache.get(paths[0], loader)
+    cache.get(paths[1], loader)
+
+    assert loads == [paths[0], paths[1], paths[2], paths[1]]
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (2, 4, 2, 2)
+    assert stats['bytes'] <= stats['max_bytes']
+
+
+def test_cache_key_includes_mtime(tmp_path):
+    path = tmp_path / 'a.zip'
+    path.write_bytes(b'')
+    cache = ArchiveCache(max_bytes=10 ** 6)
+    cache.get(str(path), lambda p: _archive(4))
+    os.utime(path, (0, 12345))
+    assert len(cache.get(str(path), lambda p: _archive(6))) == 6
+    assert cache.stats()['misses'] == 2
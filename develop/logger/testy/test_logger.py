@@ -0,0 +1,662 @@
+import glob
+import json
+import os
+import threading
+import time
+import zipfile
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from logger.logger import Logger, _split_columns
+from logger.log_index import LogIndex, index_path
+from symulacja_czujnikow.reading import Reading, reading_array
+
+
+@pytest.fixture
+def make_logger(tmp_path):
+    def factory(**overrides):
+        config = {
+            'log_dir': str(tmp_path / 'logs'),
+            'filename_pattern': 'sensors_%Y%m%d_%H%M%S_%f.csv',
+            'buffer_size': 10,
+            'rotate_every_hours': 24,
+            'max_size_mb': 5,
+            'rotate_after_lines': None,
+            'retention_days': 30
+        }
+        config.update(overrides)
+        config_path = tmp_path / 'config.json'
+        config_path.write_text(json.dumps(config))
+        return Logger(str(config_path))
+    return factory
+
+
+def _rows(logger, start, end, sensor_id=None):
+    return [row for row in logger.read_logs(start, end, sensor_id) if row is not None]
+
+
+def test_log_and_read_back(make_logger):
+    logger = make_logger()
+    logger.start()
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(25):
+        logger.log_reading('temp_1' if i % 2 else 'hum_1', start + timedelta(seconds=i), float(i), 'u')
+    logger.stop()
+
+    rows = _rows(logger, start, start + timedelta(minutes=1), 'temp_1')
+    assert [row['value'] for row in rows] == [float(i) for i in range(1, 25, 2)]
+    assert rows[0]['timestamp'] == start + timedelta(seconds=1)
+
+
+def test_rotation_by_lines_uses_counters(make_logger):
+    logger = make_logger(rotate_after_lines=30)
+    logger.start()
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(100):
+        logger.log_reading('temp_1', start + timedelta(seconds=i), float(i), 'u')
+    logger.stop()
+
+    archives = glob.glob(os.path.join(logger.archive_dir, '*.zip'))
+    assert len(archives) == 3
+    assert not glob.glob(os.path.join(logger.archive_dir, '*.csv'))
+    rows = _rows(logger, start, start + timedelta(hours=1))
+    assert sorted(row['value'] for row in rows) == [float(i) for i in range(100)]
+
+
+def test_reopening_existing_file_counts_rows(make_logger):
+    logger = make_logger(filename_pattern='fixed.csv', rotate_after_lines=15)
+    logger.start()
+    for i in range(10):
+        logger.log_reading('temp_1', datetime(2025, 6, 10, 12, 0, i), float(i), 'u')
+    logger.stop()
+
+    logger.start()
+    assert logger._rows_written == 10
+    assert logger._bytes_written == os.path.getsize(logger._current_filename)
+    logger.stop()
+
+
+def test_async_writer_flush_makes_rows_visible(make_logger):
+    logger = make_logger(async_writer=True, max_batch_size=50, max_latency_ms=20, fsync_policy='flush')
+    logger.start()
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(500):
+        logger.log_reading('press_1', start + timedelta(seconds=i), float(i), 'hPa')
+    logger.flush()
+    assert logger.stats()['rows_written'] == 500
+    assert len(_rows(logger, start, start + timedelta(hours=1))) == 500
+    logger.stop()
+
+
+def test_async_writer_stop_drains_queue(make_logger):
+    logger = make_logger(async_writer=True, max_latency_ms=1000)
+    logger.start()
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(1234):
+        logger.log_reading('press_1', start + timedelta(seconds=i), float(i), 'hPa')
+    logger.stop()
+    assert len(_rows(logger, start, start + timedelta(hours=1))) == 1234
+
+
+def test_async_writer_flush_returns_under_continuous_load(make_logger):
+    logger = make_logger(async_writer=True, max_batch_size=20, max_latency_ms=5)
+    logger.start()
+    start = datetime(2025, 6, 10, 12, 0)
+    running = threading.Event()
+    running.set()
+
+    def produce():
+        i = 0
+        while running.is_set():
+            logger.log_reading('noise', start + timedelta(seconds=i), float(i), 'u')
+            i += 1
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    try:
+        for i in range(50):
+            logger.log_reading('press_1', start + timedelta(seconds=i), float(i), 'hPa')
+        began = time.monotonic()
+        logger.flush()
+        assert time.monotonic() - began < 5
+        assert len(_rows(logger, start, start + timedelta(hours=1), 'press_1')) == 50
+    finally:
+        running.clear()
+        producer.join()
+        logger.stop()
+
+
+def test_async_writer_stop_waits_for_blocked_producers(make_logger):
+    logger = make_logger(async_writer=True, queue_size=1)
+    logger.start()
+    start = datetime(2025, 6, 10, 12, 0)
+    batches = [reading_array(f'sensor_{p}', np.arange(100.0), 'u', start.timestamp() + np.arange(100.0))
+               for p in range(4)]
+    # Wątek zapisujący wstrzymany na blokadzie - producenci utykają w put() na pełnej kolejce
+    with logger._lock:
+        producers = [threading.Thread(target=logger.log_readings, args=(batch,)) for batch in batches]
+        for producer in producers:
+            producer.start()
+        stopper = threading.Thread(target=logger.stop)
+        time.sleep(0.1)
+        stopper.start()
+        time.sleep(0.1)
+    stopper.join()
+    for producer in producers:
+        producer.join()
+
+    assert logger._queue.empty()
+    assert logger.stats()['rows_written'] + logger.dropped == 400
+    assert len(_rows(logger, start, start + timedelta(hours=1))) == logger.stats()['rows_written']
+
+
+def test_async_writer_caps_retries_of_failed_writes(make_logger, monkeypatch):
+    logger = make_logger(async_writer=True, max_latency_ms=1, max_write_retries=2)
+    logger.start()
+    start = datetime(2025, 6, 10, 12, 0)
+
+    def wait_for(condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(logger, '_write_block', fail)
+    logger.log_reading('temp_1', start, 1.0, 'C')
+    wait_for(lambda: logger.write_errors == 1)
+    # Pierwsza porażka: odczyt zostaje w buforze do ponownej próby
+    assert logger.stats()['buffered'] == 1
+    logger.log_reading('temp_1', start + timedelta(seconds=1), 2.0, 'C')
+    wait_for(lambda: logger.write_errors == 2)
+    assert (logger.stats()['buffered'], logger.dropped) == (0, 2)
+
+    monkeypatch.undo()
+    logger.log_reading('temp_1', start + timedelta(seconds=2), 3.0, 'C')
+    logger.stop()
+    assert [r['value'] for r in _rows(logger, start, start + timedelta(minutes=1))] == [3.0]
+
+
+def test_async_writer_drop_policy(make_logger):
+    logger = make_logger(async_writer=True, queue_size=10, queue_full_policy='drop')
+    logger.start()
+    with logger._lock:
+        for i in range(100):
+            logger.log_reading('press_1', datetime(2025, 6, 10, 12, 0), float(i), 'hPa')
+    logger.stop()
+    assert logger.dropped > 0
+    assert logger.stats()['rows_written'] + logger.dropped == 100
+
+
+def test_read_logs_window_with_index(make_logger):
+    logger = make_logger(rotate_after_lines=1000, index_interval=100, buffer_size=50)
+    logger.start()
+    start = datetime(2025, 6, 10, 0, 0)
+    for i in range(5000):
+        logger.log_reading(f'sensor_{i % 3}', start + timedelta(seconds=i), float(i), 'u')
+    logger.stop()
+
+    archives = glob.glob(os.path.join(logger.archive_dir, '*.zip'))
+    assert all(os.path.exists(index_path(path)) for path in archives)
+
+    window_start = start + timedelta(seconds=2345)
+    window_end = start + timedelta(seconds=2644)
+    rows = list(logger.read_logs(window_start, window_end, 'sensor_1'))
+    expected = [float(i) for i in range(2345, 2645) if i % 3 == 1]
+    assert sorted(row['value'] for row in rows) == expected
+    assert list(logger.read_logs(start - timedelta(days=1), start - timedelta(hours=1))) == []
+
+
+def test_index_is_saved_every_n_flushes_and_on_stop(make_logger):
+    logger = make_logger(buffer_size=10, index_save_interval=5)
+    logger.start()
+    start = datetime(2025, 6, 10, 12, 0)
+    path = index_path(logger._current_filename)
+    for i in range(30):
+        logger.log_reading('temp_1', start + timedelta(seconds=i), float(i), 'u')
+    assert not os.path.exists(path)
+    # Odczyt aktywnego pliku korzysta z indeksu w pamięci, bez odbudowy i zapisu na dysk
+    assert len(_rows(logger, start + timedelta(seconds=5), start + timedelta(minutes=1))) == 25
+    assert not os.path.exists(path)
+
+    for i in range(30, 57):
+        logger.log_reading('temp_1', start + timedelta(seconds=i), float(i), 'u')
+    assert LogIndex.load(path).rows == 50
+    logger.stop()
+    index = LogIndex.load(path)
+    assert index.rows == 57
+    assert index.size == os.path.getsize(logger._current_filename)
+
+
+@pytest.mark.parametrize('options', [{}, {'compression': 'gzip'}, {'compression': 'lzma'}])
+def test_rebuild_indexes_covers_every_format(make_logger, monkeypatch, options):
+    logger = make_logger(rotate_after_lines=100, **options)
+    start = datetime(2025, 6, 10, 12, 0)
+    # Przy archiwach .zip pierwsze zostaje nieskompresowane - plik .csv czekający w archive/
+    monkeypatch.setattr(logger, '_start_archiving', lambda *args: None)
+    for i in range(100):
+        logger.log_reading('temp_1', start + timedelta(seconds=i), float(i), 'u')
+    monkeypatch.undo()
+    for i in range(100, 250):
+        logger.log_reading('temp_1', start + timedelta(seconds=i), float(i), 'u')
+    logger.stop()
+
+    files = logger._data_files()
+    assert len(files) == 3
+    for file_path in files:
+        if os.path.exists(index_path(file_path)):
+            os.remove(index_path(file_path))
+    assert logger.rebuild_indexes() == 3
+    assert all(os.path.exists(index_path(file_path)) for file_path in files)
+
+    query_start, query_end = start + timedelta(seconds=120), start + timedelta(seconds=129)
+    assert len(logger._query_files(query_start, query_end, None)) == 1
+    assert [r['value'] for r in _rows(logger, query_start, query_end)] == [float(i) for i in range(120, 130)]
+
+
+def test_index_is_rebuilt_for_files_without_one(make_logger):
+    logger = make_logger()
+    legacy = os.path.join(logger.log_dir, 'sensors_20250610.csv')
+    with open(legacy, 'w', newline='', encoding='utf-8') as f:
+        f.write('timestamp,sensor_id,value,unit\r\n')
+        for i in range(10):
+            f.write(f'2025-06-10T00:29:{30 + i}.343207,temp_1,{20 + i},°C\r\n')
+
+    rows = list(logger.read_logs(datetime(2025, 6, 10, 0, 29, 35), datetime(2025, 6, 10, 1, 0)))
+    assert [row['value'] for row in rows] == [25.0, 26.0, 27.0, 28.0, 29.0]
+    index = LogIndex.load(index_path(legacy))
+    assert index.rows == 10
+    assert index.sensor_ids == {'temp_1'}
+    assert index.size == os.path.getsize(legacy)
+
+
+def test_log_readings_accepts_reading_list(make_logger):
+    logger = make_logger(rotate_after_lines=1000)
+    start = datetime(2025, 6, 10, 12, 0)
+    logger.log_readings([Reading('temp_1', float(i), 'C', (start + timedelta(seconds=i)).timestamp())
+                         for i in range(15)])
+    logger.stop()
+    rows = _rows(logger, start, start + timedelta(minutes=1))
+    assert [float(r['value']) for r in rows] == [float(i) for i in range(15)]
+
+
+def test_log_readings_writes_structured_array_as_one_block(make_logger):
+    logger = make_logger(rotate_after_lines=1000)
+    start = datetime(2025, 6, 10, 12, 0)
+    timestamps = start.timestamp() + np.arange(50) * 0.5
+    batch = reading_array(np.where(np.arange(50) % 2, 'temp_1', 'hum_1'), np.arange(50) / 3, 'u', timestamps)
+    logger.log_readings(batch)
+    assert logger.stats()['rows_written'] == 50
+    logger.stop()
+
+    rows = _rows(logger, start, start + timedelta(minutes=1), 'temp_1')
+    assert len(rows) == 25
+    assert rows[0]['timestamp'] == datetime.fromtimestamp(timestamps[1])
+    assert float(rows[0]['value']) == 1 / 3
+
+
+def test_array_and_reading_paths_write_same_timestamp_text(make_logger):
+    logger = make_logger(buffer_size=5)
+    start = datetime(2025, 6, 10, 12, 0)
+    timestamps = [start + timedelta(seconds=i, microseconds=250 * (i % 2)) for i in range(10)]
+    for t in timestamps:
+        logger.log_reading('a', t, 1.0, 'u')
+    logger.log_readings(reading_array('b', np.ones(10), 'u', [t.timestamp() for t in timestamps]))
+    logger.stop()
+
+    with open(logger._current_filename, encoding='utf-8') as f:
+        lines = f.read().splitlines()[1:]
+    written = {}
+    for line in lines:
+        timestamp, sensor_id, _, _ = line.split(',')
+        written.setdefault(sensor_id, []).append(timestamp)
+    assert written['a'] == written['b'] == [t.isoformat() for t in timestamps]
+
+
+def test_log_readings_keeps_long_sensor_ids(make_logger):
+    long_id, long_unit = 'building_A/floor_3/room_301/temperature_north', 'readings/s'
+    logger = make_logger(buffer_size=5)
+    start = datetime(2025, 6, 10, 12, 0)
+    timestamps = [(start + timedelta(seconds=i)).timestamp() for i in range(20)]
+    # Mała paczka trafia do bufora, duża zapisywana jest od razu blokiem
+    logger.log_readings(reading_array(long_id, np.arange(3.0), long_unit, timestamps[:3]))
+    logger.log_readings(reading_array(long_id, np.arange(3.0, 20.0), long_unit, timestamps[3:]))
+    logger.stop()
+
+    rows = _rows(logger, start, start + timedelta(minutes=1), long_id)
+    assert [row['value'] for row in rows] == [float(i) for i in range(20)]
+    assert {(row['sensor_id'], row['unit']) for row in rows} == {(long_id, long_unit)}
+
+
+def test_log_readings_keyword_arrays_and_async(make_logger):
+    logger = make_logger(async_writer=True, rotate_after_lines=1000)
+    logger.start()
+    start = datetime(2025, 6, 10, 12, 0)
+    logger.log_readings(sensor_ids='press_1', values=np.linspace(990, 1010, 30), units='hPa',
+                        timestamps=start.timestamp() + np.arange(30))
+    logger.log_readings(sensor_ids=['a,b'], values=[1.5], units=['"x"'], timestamps=[start.timestamp()])
+    logger.flush()
+    rows = _rows(logger, start, start + timedelta(minutes=1))
+    logger.stop()
+    assert len(rows) == 31
+    assert {'a,b', 'press_1'} == {r['sensor_id'] for r in rows}
+    assert [r['unit'] for r in rows if r['sensor_id'] == 'a,b'] == ['"x"']
+
+
+def test_log_readings_keyword_arrays_require_units(make_logger):
+    logger = make_logger()
+    with pytest.raises(ValueError, match='units'):
+        logger.log_readings(sensor_ids='t', values=[0.0])
+    with pytest.raises(ValueError, match='sensor_ids'):
+        logger.log_readings(values=[0.0], units='C')
+    assert not logger._is_running
+
+
+def test_log_readings_keyword_arrays_default_to_current_time(make_logger):
+    logger = make_logger()
+    before = datetime.now().replace(microsecond=0)
+    logger.log_readings(sensor_ids='t', values=[1.0, 2.0], units='C')
+    logger.stop()
+    rows = _rows(logger, before, datetime.now() + timedelta(seconds=1))
+    assert [r['value'] for r in rows] == [1.0, 2.0]
+    assert {r['unit'] for r in rows} == {'C'}
+
+
+def test_columnar_storage_reads_rotates_and_exports(make_logger, tmp_path):
+    logger = make_logger(storage='columnar', rotate_after_lines=20)
+    logger.start()
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(45):
+        logger.log_reading('temp_1' if i % 2 else 'hum_1', start + timedelta(seconds=i), float(i), 'u')
+    logger.stop()
+
+    assert not glob.glob(os.path.join(logger.log_dir, '*.csv'))
+    archived = sorted(glob.glob(os.path.join(logger.archive_dir, '*.seg')))
+    assert len(archived) == 2
+    rows = sorted(_rows(logger, start, start + timedelta(seconds=30), 'temp_1'), key=lambda r: r['timestamp'])
+    assert [r['value'] for r in rows] == [float(i) for i in range(1, 31, 2)]
+    assert rows[0]['timestamp'] == start + timedelta(seconds=1)
+
+    out = tmp_path / 'export.csv'
+    logger.export_csv(archived[0], str(out))
+    lines = out.read_text().splitlines()
+    assert lines[0] == 'timestamp,sensor_id,value,unit'
+    assert len(lines) == 21
+    assert lines[1] == f"{start.isoformat()},hum_1,0.0,u"
+
+
+@pytest.mark.parametrize('options, suffix', [({}, '.zip'), ({'storage': 'columnar'}, '.seg'),
+                                             ({'compression': 'gzip'}, '.csv.gz'), ({'compression': 'lzma'}, '.csv.xz')])
+def test_fast_rotation_keeps_every_archive(make_logger, options, suffix):
+    # Kilka rotacji w tej samej sekundzie - nazwy plików i archiwów mają rozdzielczość 1 s
+    logger = make_logger(rotate_after_lines=300, filename_pattern='sensors_%Y%m%d_%H%M%S.csv', **options)
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(1000):
+        logger.log_reading('temp_1', start + timedelta(seconds=i), float(i), 'u')
+    logger.stop()
+
+    assert len(glob.glob(os.path.join(logger.archive_dir, '*' + suffix))) == 3
+    rows = sorted(_rows(logger, start, start + timedelta(hours=1)), key=lambda r: r['timestamp'])
+    assert [r['value'] for r in rows] == [float(i) for i in range(1000)]
+    hourly = logger.read_rollups(start, start + timedelta(hours=1), 'temp_1')
+    assert sum(r['count'] for r in hourly) == 1000
+
+
+def test_columnar_storage_keeps_long_sensor_ids(make_logger):
+    long_id, long_unit = 'long_sensor_identifier_exceeding_thirty_two', 'readings/s'
+    logger = make_logger(storage='columnar', buffer_size=4)
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(10):
+        logger.log_reading(long_id, start + timedelta(seconds=i), float(i), long_unit)
+    logger.stop()
+
+    rows = _rows(logger, start, start + timedelta(minutes=1), long_id)
+    assert len(rows) == 10
+    assert {(r['sensor_id'], r['unit']) for r in rows} == {(long_id, long_unit)}
+
+
+@pytest.mark.parametrize('storage', ['csv', 'columnar'])
+def test_read_rollups_across_rotated_files(make_logger, storage):
+    logger = make_logger(storage=storage, rotate_after_lines=50)
+    # Kubełki wyrównane do pełnych godzin UTC
+    start = datetime.fromtimestamp(1749556800)
+    for i in range(120):
+        logger.log_reading('temp_1', start + timedelta(minutes=i), float(i), 'C')
+    logger.flush()
+
+    hourly = logger.read_rollups(start, start + timedelta(hours=2), 'temp_1', 'hour')
+    assert [(r['timestamp'], r['count'], r['min'], r['max']) for r in hourly] == [
+        (start, 60, 0.0, 59.0), (start + timedelta(hours=1), 60, 60.0, 119.0)]
+    assert hourly[0]['mean'] == 29.5
+    logger.stop()
+
+    minutes = logger.read_rollups(start + timedelta(minutes=48), start + timedelta(minutes=52), resolution='minute')
+    assert [r['mean'] for r in minutes] == [48.0, 49.0, 50.0, 51.0, 52.0]
+    assert logger.read_rollups(start, start + timedelta(hours=2), 'hum_1') == []
+
+
+def test_failed_archiving_is_retried_on_start(make_logger, tmp_path, monkeypatch):
+    logger = make_logger(rotate_after_lines=20)
+    archive_dir = tmp_path / 'logs' / 'archive'
+    start = datetime(2025, 6, 10, 12, 0)
+
+    class FullDisk(zipfile.ZipFile):
+        def write(self, *args, **kwargs):
+            raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr(zipfile, 'ZipFile', FullDisk)
+    for i in range(25):
+        logger.log_reading('temp_1', start + timedelta(seconds=i), float(i), 'u')
+    logger.stop()
+    # Nieudana kompresja: bez pozostałości .tmp, plik .csv czeka w archiwum i jest czytelny
+    assert list(archive_dir.glob('*.tmp')) == []
+    assert len(list(archive_dir.glob('*.csv'))) == 1
+    assert len(_rows(logger, start, start + timedelta(minutes=1))) == 25
+
+    monkeypatch.undo()
+    logger.start()
+    logger.stop()
+    assert list(archive_dir.glob('*.csv')) == []
+    assert len(list(archive_dir.glob('*.zip'))) == 1
+    assert len(_rows(logger, start, start + timedelta(minutes=1))) == 25
+
+
+def test_retention_removes_old_pending_archives(make_logger, tmp_path):
+    logger = make_logger()
+    archive_dir = tmp_path / 'logs' / 'archive'
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    pending = archive_dir / 'sensors_old.csv'
+    pending.write_text('timestamp,sensor_id,value,unit\n')
+    old = time.time() - 40 * 86400
+    os.utime(pending, (old, old))
+    logger._clean_old_archives()
+    assert not pending.exists()
+
+
+def test_archived_rollups_are_trusted_with_relative_log_dir(make_logger, tmp_path, monkeypatch):
+    # Domyślny log_dir './logs': ścieżki z glob trzeba porównywać po normalizacji
+    monkeypatch.chdir(tmp_path)
+    logger = make_logger(log_dir='./logs', rotate_after_lines=20)
+    start = datetime.fromtimestamp(1749556800)
+    for i in range(50):
+        logger.log_reading('temp_1', start + timedelta(minutes=i), float(i), 'C')
+    logger.stop()
+
+    checked = []
+    raw_rows = logger._raw_rows
+    monkeypatch.setattr(logger, '_raw_rows', lambda path: checked.append(path) or raw_rows(path))
+    hourly = logger.read_rollups(start, start + timedelta(hours=1), 'temp_1')
+    assert [r['count'] for r in hourly] == [50]
+    # Tylko aktywny plik jest sprawdzany, agregaty archiwów .zip przyjmowane bez weryfikacji
+    assert len(glob.glob(os.path.join(logger.archive_dir, '*.zip'))) == 2
+    assert [os.path.dirname(path) for path in checked] == ['./logs']
+
+
+def test_rollups_are_rebuilt_when_missing(make_logger):
+    logger = make_logger()
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(30):
+        logger.log_reading('temp_1', start + timedelta(minutes=i), float(i), 'C')
+    logger.stop()
+    for path in glob.glob(os.path.join(logger.log_dir, '*.rollup')):
+        os.remove(path)
+
+    hourly = logger.read_rollups(start, start + timedelta(hours=1), 'temp_1')
+    assert [(r['count'], r['mean']) for r in hourly] == [(30, 14.5)]
+    assert len(glob.glob(os.path.join(logger.log_dir, '*.rollup'))) == 2
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_read_logs_parallel_matches_sequential(make_logger, ordered):
+    long_id = 'building_A/floor_3/room_301/temperature_north'
+    logger = make_logger(rotate_after_lines=40)
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(130):
+        sensor = ('temp_1', 'hum_1', long_id)[i % 3]
+        logger.log_reading(sensor, start + timedelta(seconds=i), float(i), 'readings/s' if sensor == long_id else 'u')
+    logger.stop()
+    assert len(glob.glob(os.path.join(logger.archive_dir, '*.zip'))) == 3
+
+    window = (start + timedelta(seconds=20), start + timedelta(seconds=110))
+    for sensor_id in ('temp_1', long_id, None):
+        expected = sorted(_rows(logger, *window, sensor_id), key=lambda r: r['timestamp'])
+        rows = list(logger.read_logs_parallel(*window, sensor_id, workers=2, ordered=ordered))
+        if not ordered:
+            rows.sort(key=lambda r: r['timestamp'])
+        assert rows == expected
+    assert {r['sensor_id'] for r in rows} == {'temp_1', 'hum_1', long_id}
+    assert list(logger.read_logs_parallel(start - timedelta(days=1), start - timedelta(hours=1))) == []
+
+
+def test_read_logs_parallel_merges_overlapping_files_with_one_pool(make_logger):
+    logger = make_logger(rotate_after_lines=40)
+    start = datetime(2025, 6, 10, 12, 0)
+    # Zakresy czasu kolejnych plików nakładają się - wyniki plików muszą zostać scalone
+    for i in range(130):
+        logger.log_reading('temp_1', start + timedelta(seconds=(i * 7) % 130), float(i), 'u')
+    logger.flush()
+
+    window = (start, start + timedelta(minutes=5))
+    expected = sorted(_rows(logger, *window), key=lambda r: r['timestamp'])
+    assert list(logger.read_logs_parallel(*window, workers=2)) == expected
+    pool = logger._scan_pool
+    assert list(logger.read_logs_parallel(*window, 'temp_1', workers=2)) == expected
+    assert logger._scan_pool is pool
+    logger.stop()
+    assert logger._scan_pool is None
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'lzma'])
+def test_compressed_segments_rotate_by_rename(make_logger, compression):
+    logger = make_logger(compression=compression, rotate_after_lines=40, index_interval=10)
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(100):
+        logger.log_reading('temp_1' if i % 2 else 'hum_1', start + timedelta(seconds=i), float(i), 'u')
+    logger.flush()
+
+    suffix = '.csv.gz' if compression == 'gzip' else '.csv.xz'
+    assert len(glob.glob(os.path.join(logger.archive_dir, '*' + suffix))) == 2
+    assert not glob.glob(os.path.join(logger.archive_dir, '*.zip'))
+    # Aktywny plik czytany w trakcie zapisu, razem z archiwum
+    rows = sorted(_rows(logger, start + timedelta(seconds=35), start + timedelta(seconds=95), 'temp_1'),
+                  key=lambda r: r['timestamp'])
+    assert [r['value'] for r in rows] == [float(i) for i in range(35, 96, 2)]
+    logger.stop()
+
+    for path in glob.glob(os.path.join(logger.log_dir, '**', '*.idx'), recursive=True):
+        os.remove(path)
+    assert len(_rows(logger, start, start + timedelta(minutes=5))) == 100
+
+
+def test_compressed_file_truncates_torn_block_on_reopen(make_logger):
+    logger = make_logger(compression='gzip', filename_pattern='sensors.csv')
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(20):
+        logger.log_reading('temp_1', start + timedelta(seconds=i), float(i), 'u')
+    logger.stop()
+    path = os.path.join(logger.log_dir, 'sensors.csv.gz')
+    with open(path, 'ab') as f:
+        f.write(b'\x1f\x8b\x08\x00torn')
+
+    logger = make_logger(compression='gzip', filename_pattern='sensors.csv')
+    logger.log_reading('temp_1', start + timedelta(seconds=20), 20.0, 'u')
+    logger.stop()
+    assert [r['value'] for r in _rows(logger, start, start + timedelta(minutes=1))] == [float(i) for i in range(21)]
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip'])
+def test_archive_cache_serves_repeated_queries(make_logger, compression):
+    logger = make_logger(compression=compression, rotate_after_lines=30)
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(70):
+        logger.log_reading('temp_1' if i % 2 else 'hum_1', start + timedelta(seconds=i, microseconds=250), float(i), 'u')
+    logger.stop()
+
+    window = (start + timedelta(seconds=5), start + timedelta(seconds=65))
+    first = sorted(_rows(logger, *window, 'temp_1'), key=lambda r: r['timestamp'])
+    assert logger.stats()['archive_cache']['misses'] == 2
+    second = sorted(_rows(logger, *window, 'temp_1'), key=lambda r: r['timestamp'])
+    assert second == first
+    assert [r['value'] for r in first] == [float(i) for i in range(5, 65) if i % 2]
+    assert first[0]['timestamp'] == start + timedelta(seconds=5, microseconds=250)
+    stats = logger.stats()['archive_cache']
+    assert (stats['hits'], stats['misses']) == (2, 2)
+
+
+def test_archive_cache_and_active_file_agree_on_long_ids(make_logger):
+    long_id = 'building_A/floor_3/room_301/temperature_north'
+    logger = make_logger(rotate_after_lines=30)
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(50):
+        logger.log_reading(long_id, start + timedelta(seconds=i), float(i), 'readings/s')
+    logger.stop()
+
+    # Pierwsze 30 wierszy w archiwum (z pamięci podręcznej), pozostałe w aktywnym pliku
+    rows = _rows(logger, start, start + timedelta(minutes=1), long_id)
+    assert logger.stats()['archive_cache']['misses'] == 1
+    assert sorted(r['value'] for r in rows) == [float(i) for i in range(50)]
+    assert {(r['sensor_id'], r['unit']) for r in rows} == {(long_id, 'readings/s')}
+
+
+@pytest.mark.parametrize('options', [{}, {'compression': 'gzip'}, {'storage': 'columnar'}, {'archive_cache_mb': 0}])
+def test_read_logs_array_matches_read_logs(make_logger, options):
+    logger = make_logger(rotate_after_lines=45, **options)
+    start = datetime(2025, 6, 10, 12, 0)
+    for i in range(120):
+        logger.log_reading(('temp_1', 'hum_1', 'press_1')[i % 3], start + timedelta(seconds=i, microseconds=10),
+                           i / 7, 'u')
+    logger.flush()
+
+    window = (start + timedelta(seconds=10), start + timedelta(seconds=100))
+    arrays = logger.read_logs_array(*window, ['temp_1', 'hum_1', 'light_1'])
+    logger.stop()
+    assert sorted(arrays) == ['hum_1', 'light_1', 'temp_1']
+    for sensor_id in ('temp_1', 'hum_1'):
+        timestamps, values = arrays[sensor_id]
+        expected = sorted(_rows(logger, *window, sensor_id), key=lambda r: r['timestamp'])
+        assert timestamps.dtype == np.float64 and values.dtype == np.float64
+        assert values.tolist() == [r['value'] for r in expected]
+        assert np.allclose(timestamps, [r['timestamp'].timestamp() for r in expected], rtol=0, atol=1e-6)
+    assert len(arrays['light_1'][0]) == 0
+    assert sorted(logger.read_logs_array(*window)) == ['hum_1', 'press_1', 'temp_1']
+
+
+def test_split_columns_falls_back_on_ragged_lines():
+    # 3 + 5 pól daje łącznie wielokrotność 4 - szybka ścieżka przesunęłaby kolumny
+    block = ("timestamp,sensor_id,value,unit\r\n"
+             "2025-06-10T12:00:00,temp_1,1.0,u\r\n"
+             "2025-06-10T12:00:01,temp_1,2.0\r\n"
+             "2025-06-10T12:00:02,temp_1,3.0,u,extra\r\n"
+             "2025-06-10T12:00:03,hum_1,4.0,u\r\n")
+    timestamps, sensor_ids, values = _split_columns(block)
+    assert timestamps == ['2025-06-10T12:00:00', '2025-06-10T12:00:03']
+    assert sensor_ids == ['temp_1', 'hum_1']
+    assert values == ['1.0', '4.0']
+    assert _split_columns(block.replace('\r\n', '\n').replace(',extra', '').replace(',2.0', ',2.0,u')) == (
+        [f'2025-06-10T12:00:0{i}' for i in range(4)], ['temp_1', 'temp_1', 'temp_1', 'hum_1'],
+        ['1.0', '2.0', '3.0', '4.0'])
+
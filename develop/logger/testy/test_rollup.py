@@ -0,0 +1,26 @@
+import numpy as np
+
+from logger.rollup import Rollup
+
+
+def test_add_groups_by_sensor_and_bucket():
+    rollup = Rollup('minute')
+    rollup.add([0.0, 30.0, 59.9, 60.0, 10.0], ['a', 'a', 'a', 'a', 'b'], [1.0, 3.0, np.nan, 5.0, 7.0])
+    assert rollup.rows == 5
+    assert rollup.buckets == {'a': {0: [2, 4.0, 1.0, 3.0], 60: [1, 5.0, 5.0, 5.0]}, 'b': {0: [1, 7.0, 7.0, 7.0]}}
+
+    rollup.add([45.0], ['a'], [-1.0])
+    assert rollup.buckets['a'][0] == [3, 3.0, -1.0, 3.0]
+
+
+def test_query_merge_and_round_trip():
+    rollup = Rollup('hour')
+    rollup.add([100.0, 3700.0, 7300.0], ['a', 'a', 'b'], [1.0, 2.0, 3.0])
+    assert rollup.query(3600.0, 7200.0) == {'a': {3600: [1, 2.0, 2.0, 2.0]}, 'b': {7200: [1, 3.0, 3.0, 3.0]}}
+    assert rollup.query(3000.0, 8000.0, 'b') == {'b': {7200: [1, 3.0, 3.0, 3.0]}}
+
+    copy = Rollup.from_dict(rollup.to_dict())
+    copy.merge(rollup.query(0.0, 4000.0, 'a'))
+    assert copy.buckets['a'][0] == [2, 2.0, 1.0, 1.0]
+    assert rollup.buckets['a'][0] == [1, 1.0, 1.0, 1.0]
+    assert copy.rows == 3
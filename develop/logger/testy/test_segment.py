@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+
+from logger.segment import Segment, SegmentWriter, COLUMNS
+from symulacja_czujnikow.reading import reading_array
+
+
+def _batch(start, n, sensor_ids=('temp_1', 'hum_1')):
+    ids = np.array(sensor_ids)[np.arange(n) % len(sensor_ids)]
+    return reading_array(ids, np.arange(n, dtype=float), 'u', start + np.arange(n, dtype=float))
+
+
+def test_segment_round_trip_with_dictionary_encoding(tmp_path):
+    path = str(tmp_path / 'a.seg')
+    writer = SegmentWriter(path)
+    writer.append(_batch(1000.0, 10))
+    writer.append(_batch(1010.0, 5, ('press_1',)))
+    writer.close()
+
+    segment = Segment(path)
+    assert segment.rows == 15
+    assert segment.sensor_ids == ['hum_1', 'temp_1', 'press_1']
+    assert segment.column('sensor').dtype == COLUMNS['sensor']
+    assert isinstance(segment.column('timestamp'), np.memmap)
+
+    batch = segment.read(1002.0, 1011.0, 'temp_1')
+    assert batch['timestamp'].tolist() == [1002.0, 1004.0, 1006.0, 1008.0]
+    assert segment.read(1010.0, 2000.0, 'press_1')['value'].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert not segment.overlaps(0.0, 999.0)
+
+
+def test_unsorted_segment_uses_full_scan(tmp_path):
+    path = str(tmp_path / 'b.seg')
+    writer = SegmentWriter(path)
+    writer.append(_batch(2000.0, 4))
+    writer.append(_batch(1000.0, 4))
+    writer.close()
+
+    segment = Segment(path)
+    assert not segment.sorted
+    assert sorted(segment.read(1001.0, 2001.0)['timestamp'].tolist()) == [1001.0, 1002.0, 1003.0, 2000.0, 2001.0]
+
+
+def test_reopen_truncates_uncommitted_tail(tmp_path):
+    path = str(tmp_path / 'c.seg')
+    writer = SegmentWriter(path)
+    writer.append(_batch(1000.0, 3))
+    writer.close()
+    # Symulacja przerwanego zapisu: dane kolumny bez aktualizacji meta.json
+    with open(os.path.join(path, 'value.bin'), 'ab') as f:
+        f.write(b'\0' * 12)
+
+    writer = SegmentWriter(path)
+    writer.append(_batch(1003.0, 2))
+    writer.close()
+    segment = Segment(path)
+    assert segment.rows == 5
+    assert segment.to_array()['value'].tolist() == [0.0, 1.0, 2.0, 0.0, 1.0]
@@ -1,23 +1,39 @@
+import argparse
 import tkinter as tk
-from typing import List
-from datetime import datetime
+from typing import List, Optional
 import threading
 import time
+from symulacja_czujnikow.reading import Reading
+from symulacja_czujnikow.scheduler import SensorScheduler
+from symulacja_czujnikow.sharded import ShardedSimulation
 from symulacja_czujnikow.temperature_sensor import TemperatureSensor
 from symulacja_czujnikow.humidity_sensor import HumiditySensor
 from symulacja_czujnikow.pressure_sensor import PressureSensor
 from symulacja_czujnikow.light_sensor import LightSensor
 from logger.logger import Logger
 from komunikacja_sieciowa.siec.client import NetworkClient
+from komunikacja_sieciowa.siec.pool import ClientPool
 from gui.main_window import SensorGUI
 
 class MonitoringSystem:
-    def __init__(self):
+    def __init__(self, workers: int = 1, network_config: Optional[str] = None):
+        self.workers = workers
         self.sensors = self.initialize_sensors()
         self.logger = Logger("logger/config.json")
-        self.network_client = NetworkClient(host="127.0.0.1", port=5000)
+        if network_config:
+            # Kilka serwerów z pliku YAML: czujniki rozdzielane między nie, z przełączaniem przy awarii
+            self.network_client = ClientPool.from_config(network_config, window=256, batch_size=32)
+        else:
+            # Wysyłanie potokowe w wątku w tle: odczyty w ramkach po 32, bez czekania na ACK;
+            # przy niedostępnym serwerze odczyty czekają w kolejce i spoolu na dysku
+            self.network_client = NetworkClient(host="127.0.0.1", port=5000, window=256, batch_size=32,
+                                                background=True, spool_path="spool/network.spool")
         self.running = False
+        self.scheduler = None
+        self.sharded = None
+        self.simulation_thread = None
         self.sensor_data = {s.sensor_id: [] for s in self.sensors}
+        self._last_gui_update = 0.0
         
     def initialize_sensors(self) -> List:
         return [
@@ -43,6 +59,9 @@ class MonitoringSystem:
             self.running = True
             self.logger.start()
             self.network_client.connect()
+            # Harmonogram tworzony przed startem wątku, żeby stop_simulation zawsze mógł go zatrzymać
+            if self.workers <= 1:
+                self.scheduler = SensorScheduler(self.sensors)
             
             self.simulation_thread = threading.Thread(
                 target=self.run_simulation,
@@ -52,45 +71,69 @@ class MonitoringSystem:
     
     def stop_simulation(self):
         self.running = False
+        if self.scheduler:
+            self.scheduler.stop()
+        # Logger i klient zamykane dopiero, gdy wątek symulacji przestał publikować odczyty
+        if self.simulation_thread is not None:
+            self.simulation_thread.join(timeout=5)
+            self.simulation_thread = None
         self.logger.stop()
         self.network_client.close()
     
     def run_simulation(self):
-        while self.running:
-            current_time = datetime.now()
-            
-            for sensor in self.sensors:
-                try:
-                    value = sensor.read_value()
+        if self.workers > 1:
+            self.run_sharded_simulation()
+            return
+        # Każdy czujnik odczytywany jest z własną częstotliwością (sensor.frequency, Hz)
+        self.scheduler.run(self.handle_reading, on_batch=self.request_gui_update)
+
+    def run_sharded_simulation(self):
+        # Czujniki podzielone między procesy robocze, odczyty zbierane z pamięci współdzielonej
+        self.sharded = ShardedSimulation([s.to_dict() for s in self.sensors], workers=self.workers)
+        self.sharded.start()
+        try:
+            while self.running:
+                self.publish_records(self.sharded.drain())
+                self.request_gui_update()
+                time.sleep(0.1)
+        finally:
+            # Odczyty pozostałe w buforach przy zatrzymaniu też trafiają do loggera i sieci
+            self.publish_records(self.sharded.stop())
+
+    def publish_records(self, records):
+        for reading in self.sharded.readings(records):
+            try:
+                self.publish_reading(reading)
+            except Exception as e:
+                print(f"Błąd czujnika {reading.sensor_id}: {str(e)}")
 
-                    self.logger.log_reading(
-                        sensor.sensor_id,
-                        current_time,
-                        value,
-                        sensor.unit
-                    )
-                    
+    def handle_reading(self, sensor, scheduled_time: float):
+        try:
+            value = float(sensor.read_value())
+            self.publish_reading(Reading(sensor.sensor_id, value, sensor.unit, scheduled_time))
+        except Exception as e:
+            print(f"Błąd czujnika {sensor.sensor_id}: {str(e)}")
 
-                    data = {
-                        "sensor_id": sensor.sensor_id,
-                        "value": value,
-                        "unit": sensor.unit,
-                        "timestamp": current_time.isoformat()
-                    }
-                    self.network_client.send(data)
-                    
-                    # Aktualizacja danych dla wykresu
-                    self.sensor_data[sensor.sensor_id].append(
-                        (current_time, value)
-                    )
-                    if len(self.sensor_data[sensor.sensor_id]) > 100:
-                        self.sensor_data[sensor.sensor_id].pop(0)
-                    
-                except Exception as e:
-                    print(f"Błąd czujnika {sensor.sensor_id}: {str(e)}")
+    def publish_reading(self, reading: Reading):
+        # Jeden rekord trafia do loggera, klienta sieciowego i wykresu
+        self.logger.log(reading)
+        self.network_client.send(reading)
+        
+        # Aktualizacja danych dla wykresu
+        self.sensor_data[reading.sensor_id].append(
+            (reading.datetime, reading.value)
+        )
+        if len(self.sensor_data[reading.sensor_id]) > 100:
+            self.sensor_data[reading.sensor_id].pop(0)
 
+    def request_gui_update(self):
+        # Odświeżanie GUI najwyżej raz na sekundę, niezależnie od liczby odczytów
+        if not self.running:
+            return
+        now = time.monotonic()
+        if now - self._last_gui_update >= 1.0:
+            self._last_gui_update = now
             self.root.after(0, self.update_gui)
-            time.sleep(1)
     
     def update_gui(self):
         self.gui.update_sensor_table()
@@ -101,5 +144,11 @@ class MonitoringSystem:
         self.root.destroy()
 
 if __name__ == "__main__":
-    system = MonitoringSystem()
+    parser = argparse.ArgumentParser(description="System monitoringu czujników")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="liczba procesów symulacji (>1 włącza tryb shardowany)")
+    parser.add_argument('--network-config',
+                        help="plik YAML z listą serwerów (network.endpoints) - włącza pulę połączeń")
+    args = parser.parse_args()
+    system = MonitoringSystem(workers=args.workers, network_config=args.network_config)
     system.start()
@@ -1,11 +1,17 @@
 import abc
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from symulacja_czujnikow.clock import SystemClock
+from symulacja_czujnikow.reading import Reading
+from symulacja_czujnikow.reading_history import ReadingHistory
 
 
 class BaseSensor(abc.ABC):
     def __init__(self, sensor_id: str, name: str, unit: str,
-                 min_value: float, max_value: float, frequency: float = 1.0):
+                 min_value: float, max_value: float, frequency: float = 1.0,
+                 history_size: int = 1000, clock=None, seed: Optional[int] = None):
         self.sensor_id = sensor_id
         self.name = name
         self.unit = unit
@@ -14,24 +20,32 @@ class BaseSensor(abc.ABC):
         self.frequency = frequency
         self._is_active = True
         self._last_value: Optional[float] = None
-        self._history: List[Dict[str, Any]] = []
+        self._history = ReadingHistory(history_size)
         self._calibration_factor = 1.0
+        self._clock = clock or SystemClock()
+        self._rng = np.random.default_rng(seed)
 
     @abc.abstractmethod
     def read_value(self) -> float:
         pass
 
+    def read(self) -> Reading:
+        value = float(self.read_value())
+        timestamp = self._clock.time()
+        self._history.append(timestamp, value)
+        return Reading(self.sensor_id, value, self.unit, timestamp)
+
     def get_reading(self) -> Dict[str, Any]:
-        reading = {
-            'sensor_id': self.sensor_id,
-            'name': self.name,
-            'value': self.read_value(),
-            'unit': self.unit,
-            'timestamp': datetime.now().isoformat()
-        }
-        self._history.append(reading)
+        reading = self.read().to_dict()
+        reading['name'] = self.name
         return reading
 
+    def set_clock(self, clock) -> None:
+        self._clock = clock
+
+    def seed(self, seed: Optional[int]) -> None:
+        self._rng = np.random.default_rng(seed)
+
     def calibrate(self, calibration_factor: float) -> None:
         self._calibration_factor = calibration_factor
 
@@ -40,8 +54,12 @@ class BaseSensor(abc.ABC):
             self._last_value = self.read_value()
         return self._last_value * self._calibration_factor
 
-    def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
-        return self._history[-limit:]
+    def get_history(self, limit: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        return self._history.view(limit)
+
+    @property
+    def history_size(self) -> int:
+        return self._history.capacity
 
     def start(self) -> None:
         self._is_active = True
@@ -63,7 +81,8 @@ class BaseSensor(abc.ABC):
             'max_value': self.max_value,
             'frequency': self.frequency,
             'is_active': self._is_active,
-            'calibration_factor': self._calibration_factor
+            'calibration_factor': self._calibration_factor,
+            'history_size': self._history.capacity
         }
 
     @classmethod
@@ -74,7 +93,8 @@ class BaseSensor(abc.ABC):
             unit=config['unit'],
             min_value=config['min_value'],
             max_value=config['max_value'],
-            frequency=config.get('frequency', 1.0)
+            frequency=config.get('frequency', 1.0),
+            history_size=config.get('history_size', 1000)
         )
         sensor._is_active = config['is_active']
         sensor._calibration_factor = config.get('calibration_factor', 1.0)
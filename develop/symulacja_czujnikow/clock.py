@@ -0,0 +1,42 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class SystemClock:
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float, interrupt: Optional[threading.Event] = None) -> None:
+        if seconds <= 0:
+            return
+        if interrupt is not None:
+            interrupt.wait(seconds)
+        else:
+            time.sleep(seconds)
+
+
+class VirtualClock:
+    def __init__(self, start: Optional[datetime] = None):
+        self._start = start or datetime.now()
+        self._offset = 0.0
+        self._epoch = self._start.timestamp()
+
+    def now(self) -> datetime:
+        return self._start + timedelta(seconds=self._offset)
+
+    def time(self) -> float:
+        return self._epoch + self._offset
+
+    def advance(self, seconds: float) -> None:
+        if seconds < 0:
+            raise ValueError("Virtual clock cannot go backwards")
+        self._offset += seconds
+
+    def sleep(self, seconds: float, interrupt: Optional[threading.Event] = None) -> None:
+        if seconds > 0:
+            self.advance(seconds)
@@ -0,0 +1,158 @@
+import argparse
+import csv
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from symulacja_czujnikow.base_sensor import BaseSensor
+from symulacja_czujnikow.clock import VirtualClock
+from symulacja_czujnikow.reading import reading_array
+from symulacja_czujnikow.sensor_bank import SensorBank, SENSOR_CLASSES
+
+ReadingSink = Callable[[str, datetime, float, str], None]
+
+
+class CsvFileSink:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(['timestamp', 'sensor_id', 'value', 'unit'])
+
+    def __call__(self, sensor_id: str, timestamp: datetime, value: float, unit: str) -> None:
+        self._writer.writerow([timestamp.isoformat(), sensor_id, value, unit])
+
+    def write_tick(self, timestamp: datetime, sensor_ids: List[str], values: List[float],
+                   units: List[str]) -> None:
+        iso = timestamp.isoformat()
+        self._writer.writerows(zip([iso] * len(sensor_ids), sensor_ids, values, units))
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class LoggerSink:
+    # Przekazuje cały tick do Logger.log_readings zamiast zapisywać odczyty pojedynczo
+    def __init__(self, logger):
+        self.logger = logger
+
+    def __call__(self, sensor_id: str, timestamp: datetime, value: float, unit: str) -> None:
+        self.logger.log_reading(sensor_id, timestamp, value, unit)
+
+    def write_tick(self, timestamp: datetime, sensor_ids: List[str], values: List[float],
+                   units: List[str]) -> None:
+        self.logger.log_readings(reading_array(sensor_ids, values, units, timestamp.timestamp()))
+
+
+def fast_forward(source: Union[List[BaseSensor], SensorBank], start: datetime, end: datetime,
+                 step: float = 1.0, sink: Optional[ReadingSink] = None,
+                 seed: Optional[int] = None) -> Dict[str, float]:
+    if step <= 0:
+        raise ValueError("Step must be positive")
+
+    clock = VirtualClock(start)
+    is_bank = isinstance(source, SensorBank)
+    sensors = [] if is_bank else [s for s in source if s.is_active]
+    if is_bank:
+        source.set_clock(clock)
+        if seed is not None:
+            source.seed(seed)
+    else:
+        children = np.random.SeedSequence(seed).spawn(len(sensors)) if seed is not None else None
+        for i, sensor in enumerate(sensors):
+            sensor.set_clock(clock)
+            if children is not None:
+                sensor.seed(children[i])
+
+    steps = int((end - start).total_seconds() // step) + 1
+    readings = 0
+    started = time.perf_counter()
+    for _ in range(steps):
+        timestamp = clock.now()
+        if is_bank:
+            values = source.read_values(timestamp)
+            if sink is not None:
+                active = np.flatnonzero(source.active)
+                ids = [source.sensor_ids[i] for i in active]
+                units = [source.units[i] for i in active]
+                active_values = values[active].tolist()
+                if hasattr(sink, 'write_tick'):
+                    sink.write_tick(timestamp, ids, active_values, units)
+                else:
+                    for sensor_id, value, unit in zip(ids, active_values, units):
+                        sink(sensor_id, timestamp, value, unit)
+            readings += int(source.active.sum())
+        else:
+            for sensor in sensors:
+                value = sensor.read_value()
+                if sink is not None:
+                    sink(sensor.sensor_id, timestamp, float(value), sensor.unit)
+            readings += len(sensors)
+        clock.advance(step)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'readings': readings,
+        'simulated_seconds': (steps - 1) * step,
+        'elapsed_seconds': elapsed,
+        'readings_per_second': readings / elapsed if elapsed > 0 else float('inf')
+    }
+
+
+def _load_sensors(config_path: Optional[str]) -> List[BaseSensor]:
+    if config_path is None:
+        return [cls() for cls in SENSOR_CLASSES.values()]
+    with open(config_path, 'r') as f:
+        configs = json.load(f)
+    return [SENSOR_CLASSES[config['type']].from_dict(config) for config in configs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate sensor history on a virtual clock")
+    parser.add_argument('--sensors', help="JSON file with a list of sensor configs (BaseSensor.to_dict)")
+    parser.add_argument('--start', type=datetime.fromisoformat, default=None)
+    parser.add_argument('--days', type=float, default=1.0)
+    parser.add_argument('--step', type=float, default=1.0, help="seconds between readings")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--bank', action='store_true', help="use the vectorized SensorBank")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--out', help="write readings to this CSV file")
+    output.add_argument('--logger-config', help="stream readings into Logger with this config")
+    args = parser.parse_args()
+
+    start = args.start or datetime.now() - timedelta(days=args.days)
+    end = start + timedelta(days=args.days)
+    sensors = _load_sensors(args.sensors)
+    source = SensorBank(sensors) if args.bank else sensors
+
+    if args.logger_config:
+        from logger.logger import Logger
+        logger = Logger(args.logger_config)
+        logger.start()
+        try:
+            stats = fast_forward(source, start, end, args.step, LoggerSink(logger), args.seed)
+        finally:
+            logger.stop()
+    elif args.out:
+        with CsvFileSink(args.out) as sink:
+            stats = fast_forward(source, start, end, args.step, sink, args.seed)
+    else:
+        stats = fast_forward(source, start, end, args.step, None, args.seed)
+
+    print(f"{stats['readings']:,} readings over {stats['simulated_seconds'] / 86400:.2f} days "
+          f"in {stats['elapsed_seconds']:.2f}s ({stats['readings_per_second']:,.0f} readings/s)")
+
+
+if __name__ == "__main__":
+    main()
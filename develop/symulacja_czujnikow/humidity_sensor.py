@@ -1,7 +1,8 @@
 
 import numpy as np
 
-from datetime import datetime
+from typing import Optional
+
 from symulacja_czujnikow.base_sensor import BaseSensor
 
 class HumiditySensor(BaseSensor):
@@ -10,15 +11,19 @@ class HumiditySensor(BaseSensor):
                  min_value: float = 20.0,
                  max_value: float = 100.0,
                  unit: str = "%",
-                 frequency: float = 1.0):
-        super().__init__(sensor_id, name, unit, min_value, max_value, frequency)
+                 frequency: float = 1.0,
+                 history_size: int = 1000,
+                 clock=None,
+                 seed: Optional[int] = None):
+        super().__init__(sensor_id, name, unit, min_value, max_value, frequency, history_size,
+                         clock, seed)
 
     def read_value(self) -> float:
         if not self._is_active:
             raise ValueError("Sensor is not active")
 
-        hour = datetime.now().hour
+        hour = self._clock.now().hour
         daily_pattern = 15 * np.sin(2 * np.pi * (hour - 6) / 24)
-        humidity = (np.random.normal(loc=60, scale=5) + daily_pattern) * self._calibration_factor
+        humidity = (self._rng.normal(loc=60, scale=5) + daily_pattern) * self._calibration_factor
         self._last_value = np.clip(humidity, self.min_value, self.max_value)
         return self._last_value
@@ -1,6 +1,6 @@
 import numpy as np
 
-from datetime import datetime
+from typing import Optional
 
 from symulacja_czujnikow.base_sensor import BaseSensor
 class LightSensor(BaseSensor):
@@ -9,19 +9,23 @@ class LightSensor(BaseSensor):
                  min_value: float = 0.0,
                  max_value: float = 10000.0,
                  unit: str = "lux",
-                 frequency: float = 1.0):
-        super().__init__(sensor_id, name, unit, min_value, max_value, frequency)
+                 frequency: float = 1.0,
+                 history_size: int = 1000,
+                 clock=None,
+                 seed: Optional[int] = None):
+        super().__init__(sensor_id, name, unit, min_value, max_value, frequency, history_size,
+                         clock, seed)
 
     def read_value(self) -> float:
         if not self._is_active:
             raise ValueError("Sensor is not active")
 
-        hour = datetime.now().hour
+        hour = self._clock.now().hour
         if 6 <= hour < 18:
-            base_light = np.random.normal(loc=8000, scale=2000)
+            base_light = self._rng.normal(loc=8000, scale=2000)
             variation = 2000 * np.sin(2 * np.pi * (hour - 6) / 12)
         else:
-            base_light = np.random.normal(loc=100, scale=50)
+            base_light = self._rng.normal(loc=100, scale=50)
             variation = 0
 
         light = (base_light + variation) * self._calibration_factor
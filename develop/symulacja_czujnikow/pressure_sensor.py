@@ -1,6 +1,8 @@
 
 import numpy as np
 
+from typing import Optional
+
 from symulacja_czujnikow.base_sensor import BaseSensor
 class PressureSensor(BaseSensor):
     def __init__(self, sensor_id: str = "press_1",
@@ -8,16 +10,20 @@ class PressureSensor(BaseSensor):
                  min_value: float = 950.0,
                  max_value: float = 1050.0,
                  unit: str = "hPa",
-                 frequency: float = 1.0):
-        super().__init__(sensor_id, name, unit, min_value, max_value, frequency)
+                 frequency: float = 1.0,
+                 history_size: int = 1000,
+                 clock=None,
+                 seed: Optional[int] = None):
+        super().__init__(sensor_id, name, unit, min_value, max_value, frequency, history_size,
+                         clock, seed)
         self._pressure_trend = 0
 
     def read_value(self) -> float:
         if not self._is_active:
             raise ValueError("Sensor is not active")
 
-        self._pressure_trend += np.random.normal(scale=0.3)
+        self._pressure_trend += self._rng.normal(scale=0.3)
         self._pressure_trend = np.clip(self._pressure_trend, -5, 5)
-        pressure = (np.random.normal(loc=1013, scale=2) + self._pressure_trend) * self._calibration_factor
+        pressure = (self._rng.normal(loc=1013, scale=2) + self._pressure_trend) * self._calibration_factor
         self._last_value = np.clip(pressure, self.min_value, self.max_value)
         return self._last_value
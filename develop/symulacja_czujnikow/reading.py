@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import NamedTuple, Dict, Any, Iterable, List
+
+import numpy as np
+
+# Identyfikator i jednostka jako obiekty str - bez limitu długości (typ '<U' o stałej
+# szerokości ucinałby dłuższe nazwy)
+READING_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('sensor_id', object),
+    ('value', '<f8'),
+    ('unit', object)
+])
+
+
+class Reading(NamedTuple):
+    sensor_id: str
+    value: float
+    unit: str
+    timestamp: float
+
+    @property
+    def datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'sensor_id': self.sensor_id,
+            'value': float(self.value),
+            'unit': self.unit,
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Reading':
+        timestamp = data.get('timestamp')
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp).timestamp()
+        elif isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+        elif timestamp is None:
+            timestamp = datetime.now().timestamp()
+        return cls(data['sensor_id'], float(data['value']), data.get('unit', ''), float(timestamp))
+
+
+def readings_to_array(readings: Iterable[Reading]) -> np.ndarray:
+    readings = list(readings)
+    batch = np.empty(len(readings), dtype=READING_DTYPE)
+    if readings:
+        sensor_ids, values, units, timestamps = zip(*readings)
+        batch['timestamp'] = timestamps
+        batch['sensor_id'] = [str(s) for s in sensor_ids]
+        batch['value'] = values
+        batch['unit'] = [str(u) for u in units]
+    return batch
+
+
+def reading_array(sensor_ids, values, units, timestamps) -> np.ndarray:
+    # Pola mogą być skalarami (np. jeden czujnik, wiele wartości) - rozgłaszane do wspólnej długości
+    values = np.asarray(values, dtype=np.float64)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    sensor_ids = np.asarray(sensor_ids, dtype=str)
+    units = np.asarray(units, dtype=str)
+    n = np.broadcast(sensor_ids, values, units, timestamps).size
+    batch = np.empty(n, dtype=READING_DTYPE)
+    batch['timestamp'] = timestamps
+    batch['sensor_id'] = sensor_ids
+    batch['value'] = values
+    batch['unit'] = units
+    return batch
+
+
+def readings_from_array(batch: np.ndarray) -> List[Reading]:
+    return [Reading(sensor_id, value, unit, timestamp)
+            for timestamp, sensor_id, value, unit in batch.tolist()]
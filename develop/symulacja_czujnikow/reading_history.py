@@ -0,0 +1,66 @@
+import numpy as np
+
+from typing import Optional, Tuple
+
+
+class ReadingHistory:
+    # Każdy wpis zapisywany jest dwukrotnie (pod i oraz i + capacity), dzięki czemu
+    # ostatnie N odczytów zawsze leży w ciągłym fragmencie tablicy i można je
+    # zwrócić jako widok bez kopiowania.
+    def __init__(self, capacity: int = 1000, channels: Optional[int] = None):
+        if capacity <= 0:
+            raise ValueError("History capacity must be positive")
+        self.capacity = capacity
+        self.channels = channels
+        shape = (2 * capacity,) if channels is None else (2 * capacity, channels)
+        self._timestamps = np.zeros(2 * capacity, dtype=np.float64)
+        self._values = np.full(shape, np.nan, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+
+    def append(self, timestamp: float, value) -> None:
+        i = self._head
+        mirror = i + self.capacity
+        self._timestamps[i] = self._timestamps[mirror] = timestamp
+        self._values[i] = self._values[mirror] = value
+        self._head = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def extend(self, timestamps, values) -> None:
+        # Wiele wpisów naraz - zapis wektorowy do obu połówek bufora
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        n = len(timestamps)
+        if n >= self.capacity:
+            timestamps, values = timestamps[-self.capacity:], values[-self.capacity:]
+            self._timestamps[:self.capacity] = self._timestamps[self.capacity:] = timestamps
+            self._values[:self.capacity] = self._values[self.capacity:] = values
+            self._head = 0
+            self._count = self.capacity
+            return
+        index = (self._head + np.arange(n)) % self.capacity
+        self._timestamps[index] = self._timestamps[index + self.capacity] = timestamps
+        self._values[index] = self._values[index + self.capacity] = values
+        self._head = (self._head + n) % self.capacity
+        self._count = min(self._count + n, self.capacity)
+
+    def view(self, limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        n = self._count if limit is None else max(0, min(limit, self._count))
+        end = self._head + self.capacity
+        timestamps = self._timestamps[end - n:end]
+        values = self._values[end - n:end]
+        timestamps.flags.writeable = False
+        values.flags.writeable = False
+        return timestamps, values
+
+    def clear(self) -> None:
+        self._head = 0
+        self._count = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._timestamps.nbytes + self._values.nbytes
+
+    def __len__(self) -> int:
+        return self._count
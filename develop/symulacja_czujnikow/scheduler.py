@@ -0,0 +1,78 @@
+import heapq
+import threading
+from typing import Callable, List, Optional
+
+from symulacja_czujnikow.base_sensor import BaseSensor
+from symulacja_czujnikow.clock import SystemClock
+
+# Tolerancja porównań czasu (błędy zaokrągleń przy czasie epoch w float)
+_EPSILON = 1e-6
+
+
+class SensorScheduler:
+    # Kolejka priorytetowa terminów (deadline, indeks czujnika). Kolejny termin
+    # liczony jest od poprzedniego terminu, a nie od chwili obsłużenia, więc czas
+    # obsługi nie przesuwa harmonogramu; terminy, których nie zdążono obsłużyć,
+    # są pomijane i zliczane w `missed`.
+    def __init__(self, sensors: List[BaseSensor], clock=None):
+        self.sensors = sensors
+        self._clock = clock or SystemClock()
+        self._periods = [1.0 / s.frequency if s.frequency > 0 else None for s in sensors]
+        self._heap = []
+        self._stop_event = threading.Event()
+        self.fired = 0
+        self.missed = 0
+        self.max_lateness = 0.0
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._heap) and not self._stop_event.is_set()
+
+    def stats(self) -> dict:
+        return {
+            'sensors': len(self._heap),
+            'fired': self.fired,
+            'missed': self.missed,
+            'max_lateness': self.max_lateness
+        }
+
+    def run(self, on_due: Callable[[BaseSensor, float], None],
+            on_batch: Optional[Callable[[], None]] = None,
+            until: Optional[float] = None) -> None:
+        self._stop_event.clear()
+        start = self._clock.time()
+        self._heap = [(start, i) for i, period in enumerate(self._periods) if period is not None]
+        heapq.heapify(self._heap)
+        heap = self._heap
+
+        while heap and not self._stop_event.is_set():
+            deadline = heap[0][0]
+            if until is not None and deadline > until:
+                break
+            now = self._clock.time()
+            if deadline - now > _EPSILON:
+                self._clock.sleep(deadline - now, self._stop_event)
+                continue
+            now = max(now, deadline)
+
+            while heap and heap[0][0] <= now:
+                deadline, index = heap[0]
+                sensor = self.sensors[index]
+                if sensor.is_active:
+                    on_due(sensor, deadline)
+                    self.fired += 1
+                    self.max_lateness = max(self.max_lateness, now - deadline)
+
+                period = self._periods[index]
+                next_deadline = deadline + period
+                if next_deadline < now:
+                    skipped = int((now - next_deadline) // period) + 1
+                    self.missed += skipped
+                    next_deadline += skipped * period
+                heapq.heapreplace(heap, (next_deadline, index))
+
+            if on_batch is not None:
+                on_batch()
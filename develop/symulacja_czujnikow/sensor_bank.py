@@ -0,0 +1,154 @@
+import numpy as np
+
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+from symulacja_czujnikow.base_sensor import BaseSensor
+from symulacja_czujnikow.clock import SystemClock
+from symulacja_czujnikow.reading_history import ReadingHistory
+from symulacja_czujnikow.temperature_sensor import TemperatureSensor
+from symulacja_czujnikow.humidity_sensor import HumiditySensor
+from symulacja_czujnikow.pressure_sensor import PressureSensor
+from symulacja_czujnikow.light_sensor import LightSensor
+
+TEMPERATURE, HUMIDITY, PRESSURE, LIGHT = range(4)
+
+SENSOR_KINDS = {
+    'TemperatureSensor': TEMPERATURE,
+    'HumiditySensor': HUMIDITY,
+    'PressureSensor': PRESSURE,
+    'LightSensor': LIGHT,
+}
+
+SENSOR_CLASSES = {
+    'TemperatureSensor': TemperatureSensor,
+    'HumiditySensor': HumiditySensor,
+    'PressureSensor': PressureSensor,
+    'LightSensor': LightSensor,
+}
+
+# Odchylenie kroku błądzenia losowego trendu dla każdego typu czujnika
+_TREND_SCALE = np.array([0.1, 0.0, 0.3, 0.0])
+
+
+def _kind_params(hour: int):
+    loc = np.array([20.0, 60.0, 1013.0, 100.0])
+    scale = np.array([5.0, 5.0, 2.0, 50.0])
+    pattern = np.array([
+        10 * np.sin(2 * np.pi * hour / 24),
+        15 * np.sin(2 * np.pi * (hour - 6) / 24),
+        0.0,
+        0.0,
+    ])
+    if 6 <= hour < 18:
+        loc[LIGHT] = 8000.0
+        scale[LIGHT] = 2000.0
+        pattern[LIGHT] = 2000 * np.sin(2 * np.pi * (hour - 6) / 12)
+    return loc, scale, pattern
+
+
+class SensorBank:
+    def __init__(self, sensors: List[BaseSensor], history_size: Optional[int] = None,
+                 clock=None, seed: Optional[int] = None):
+        kinds = []
+        for sensor in sensors:
+            kind = SENSOR_KINDS.get(sensor.__class__.__name__)
+            if kind is None:
+                raise ValueError(f"Unsupported sensor type: {sensor.__class__.__name__}")
+            kinds.append(kind)
+
+        self.sensor_ids = [s.sensor_id for s in sensors]
+        self.names = [s.name for s in sensors]
+        self.units = [s.unit for s in sensors]
+        self.kinds = np.array(kinds, dtype=np.int8)
+        self.min_values = np.array([s.min_value for s in sensors], dtype=float)
+        self.max_values = np.array([s.max_value for s in sensors], dtype=float)
+        self.frequencies = np.array([s.frequency for s in sensors], dtype=float)
+        self.history_sizes = [s.history_size for s in sensors]
+        self.calibration = np.array([s._calibration_factor for s in sensors], dtype=float)
+        self.active = np.array([s.is_active for s in sensors], dtype=bool)
+        self.trend = np.array([float(getattr(s, '_trend', getattr(s, '_pressure_trend', 0.0)))
+                               for s in sensors])
+        self.last_values = np.full(len(sensors), np.nan)
+        self._trend_scale = _TREND_SCALE[self.kinds]
+        self._has_trend = self._trend_scale > 0
+        self.history = ReadingHistory(history_size, channels=len(sensors)) if history_size else None
+        self._clock = clock or SystemClock()
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_configs(cls, configs: List[Dict[str, Any]], history_size: Optional[int] = None,
+                     clock=None, seed: Optional[int] = None):
+        sensors = []
+        for config in configs:
+            sensor_cls = SENSOR_CLASSES.get(config['type'])
+            if sensor_cls is None:
+                raise ValueError(f"Unsupported sensor type: {config['type']}")
+            sensors.append(sensor_cls.from_dict(config))
+        return cls(sensors, history_size, clock, seed)
+
+    def __len__(self) -> int:
+        return len(self.sensor_ids)
+
+    def index_of(self, sensor_id: str) -> int:
+        return self.sensor_ids.index(sensor_id)
+
+    def calibrate(self, index: int, calibration_factor: float) -> None:
+        self.calibration[index] = calibration_factor
+
+    def set_clock(self, clock) -> None:
+        self._clock = clock
+
+    def seed(self, seed: Optional[int]) -> None:
+        self._rng = np.random.default_rng(seed)
+
+    def start(self, index: int) -> None:
+        self.active[index] = True
+
+    def stop(self, index: int) -> None:
+        self.active[index] = False
+
+    def read_values(self, timestamp: Optional[datetime] = None,
+                    due: Optional[np.ndarray] = None) -> np.ndarray:
+        # `due` (maska) ogranicza odczyt do czujników, których termin właśnie minął
+        timestamp = timestamp or self._clock.now()
+        loc, scale, pattern = _kind_params(timestamp.hour)
+        n = len(self.kinds)
+
+        noise = self._rng.normal(size=n)
+        trend_step = self._rng.normal(size=n) * self._trend_scale
+        active = self.active if due is None else self.active & due
+        self.trend = np.where(active & self._has_trend,
+                              np.clip(self.trend + trend_step, -5, 5),
+                              self.trend)
+
+        raw = loc[self.kinds] + scale[self.kinds] * noise + pattern[self.kinds] + self.trend
+        values = np.clip(raw * self.calibration, self.min_values, self.max_values)
+        values[~active] = np.nan
+        self.last_values = np.where(active, values, self.last_values)
+        if self.history is not None:
+            self.history.append(timestamp.timestamp(), values)
+        return values
+
+    def get_history(self, limit: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        if self.history is None:
+            raise ValueError("SensorBank was created without history")
+        return self.history.view(limit)
+
+    def to_configs(self) -> List[Dict[str, Any]]:
+        kind_names = {kind: name for name, kind in SENSOR_KINDS.items()}
+        return [{
+            'sensor_id': self.sensor_ids[i],
+            'name': self.names[i],
+            'type': kind_names[int(self.kinds[i])],
+            'unit': self.units[i],
+            'min_value': float(self.min_values[i]),
+            'max_value': float(self.max_values[i]),
+            'frequency': float(self.frequencies[i]),
+            'is_active': bool(self.active[i]),
+            'calibration_factor': float(self.calibration[i]),
+            'history_size': self.history_sizes[i]
+        } for i in range(len(self))]
+
+    def __str__(self):
+        return f"SensorBank(sensors={len(self)}, active={int(self.active.sum())})"
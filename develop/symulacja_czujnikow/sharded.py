@@ -0,0 +1,215 @@
+import multiprocessing as mp
+import os
+import threading
+import time
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import List, Dict, Any, Optional, Iterator
+
+import numpy as np
+
+from symulacja_czujnikow.reading import Reading
+from symulacja_czujnikow.scheduler import SensorScheduler
+from symulacja_czujnikow.sensor_bank import SensorBank, SENSOR_CLASSES
+
+RECORD_DTYPE = np.dtype([('timestamp', '<f8'), ('sensor', '<i4'), ('value', '<f8')])
+
+_HEADER_BYTES = 64
+_WRITE, _READ, _DROPPED = range(3)
+
+
+class SharedRing:
+    # Bufor cykliczny jeden producent / jeden konsument w pamięci współdzielonej.
+    # Nagłówek przechowuje rosnące liczniki zapisu i odczytu oraz liczbę odrzuconych
+    # rekordów; producent publikuje rekordy dopiero po ich zapisaniu.
+    def __init__(self, capacity: int, name: Optional[str] = None):
+        self.capacity = capacity
+        size = _HEADER_BYTES + capacity * RECORD_DTYPE.itemsize
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=size)
+        self._header = np.ndarray((3,), dtype=np.int64, buffer=self._shm.buf)
+        self._records = np.ndarray((capacity,), dtype=RECORD_DTYPE, buffer=self._shm.buf,
+                                   offset=_HEADER_BYTES)
+        if self._owner:
+            self._header[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def dropped(self) -> int:
+        return int(self._header[_DROPPED])
+
+    def __len__(self) -> int:
+        return int(self._header[_WRITE] - self._header[_READ])
+
+    def push(self, records: np.ndarray) -> bool:
+        n = len(records)
+        write = int(self._header[_WRITE])
+        if n > self.capacity - (write - int(self._header[_READ])):
+            self._header[_DROPPED] += n
+            return False
+        start = write % self.capacity
+        first = min(n, self.capacity - start)
+        self._records[start:start + first] = records[:first]
+        self._records[:n - first] = records[first:]
+        self._header[_WRITE] = write + n
+        return True
+
+    def pop_all(self) -> np.ndarray:
+        write = int(self._header[_WRITE])
+        read = int(self._header[_READ])
+        n = write - read
+        out = np.empty(n, dtype=RECORD_DTYPE)
+        start = read % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._records[start:start + first]
+        out[first:] = self._records[:n - first]
+        self._header[_READ] = write
+        return out
+
+    def close(self) -> None:
+        del self._header
+        del self._records
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _run_scheduled(sensors, bank: SensorBank, indices: np.ndarray, ring: SharedRing, stop_event) -> None:
+    # Każdy czujnik shardu odczytywany z własną częstotliwością, jak w trybie jednoprocesowym;
+    # czujniki z tym samym terminem odczytywane są jednym wektorowym wywołaniem banku
+    positions = {id(sensor): i for i, sensor in enumerate(sensors)}
+    scheduler = SensorScheduler(sensors)
+    due = np.zeros(len(sensors), dtype=bool)
+    deadlines = np.zeros(len(sensors))
+
+    def on_due(sensor, deadline: float) -> None:
+        i = positions[id(sensor)]
+        due[i] = True
+        deadlines[i] = deadline
+
+    def on_batch() -> None:
+        selected = due & bank.active
+        if not selected.any():
+            return
+        values = bank.read_values(datetime.fromtimestamp(deadlines[selected].max()), due=due)
+        batch = np.empty(int(selected.sum()), dtype=RECORD_DTYPE)
+        batch['timestamp'] = deadlines[selected]
+        batch['sensor'] = indices[selected]
+        batch['value'] = values[selected]
+        ring.push(batch)
+        due[:] = False
+
+    # Zdarzenie procesu nadrzędnego przerywa oczekiwanie harmonogramu
+    watcher = threading.Thread(target=lambda: (stop_event.wait(), scheduler.stop()), daemon=True)
+    watcher.start()
+    scheduler.run(on_due, on_batch=on_batch)
+
+
+def _run_shard(configs: List[Dict[str, Any]], offset: int, ring_name: str, capacity: int,
+               interval: Optional[float], seed, stop_event) -> None:
+    ring = SharedRing(capacity, name=ring_name)
+    sensors = [SENSOR_CLASSES[c['type']].from_dict(c) for c in configs]
+    bank = SensorBank(sensors, seed=seed)
+    indices = np.arange(offset, offset + len(bank), dtype=np.int32)
+    next_tick = time.time()
+    try:
+        if interval is None:
+            _run_scheduled(sensors, bank, indices, ring, stop_event)
+            return
+        # Stały takt wspólny dla wszystkich czujników (0 = bez przerw, do pomiarów przepustowości)
+        while not stop_event.is_set():
+            now = time.time()
+            values = bank.read_values(datetime.fromtimestamp(now))
+            active = bank.active
+            batch = np.empty(int(active.sum()), dtype=RECORD_DTYPE)
+            batch['timestamp'] = now
+            batch['sensor'] = indices[active]
+            batch['value'] = values[active]
+            ring.push(batch)
+            if interval > 0:
+                next_tick += interval
+                stop_event.wait(max(0.0, next_tick - time.time()))
+    finally:
+        ring.close()
+
+
+class ShardedSimulation:
+    def __init__(self, configs: List[Dict[str, Any]], workers: Optional[int] = None,
+                 interval: Optional[float] = None, ring_capacity: Optional[int] = None,
+                 seed: Optional[int] = None):
+        self.configs = configs
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(configs)))
+        self.interval = interval
+        self.sensor_ids = [c['sensor_id'] for c in configs]
+        self.units = [c['unit'] for c in configs]
+        shard_size = -(-len(configs) // self.workers)
+        self._shards = [(i, configs[i:i + shard_size]) for i in range(0, len(configs), shard_size)]
+        # Domyślnie miejsce na ok. 100 taktów lub 10 s odczytów najszybszego shardu
+        rate = max(sum(c.get('frequency', 1.0) for c in shard) for _, shard in self._shards)
+        self.ring_capacity = ring_capacity or max(1024, 100 * shard_size, int(10 * rate))
+        self._seeds = np.random.SeedSequence(seed).spawn(len(self._shards))
+        self._ctx = mp.get_context('spawn')
+        self._stop_event = None
+        self._rings: List[SharedRing] = []
+        self._processes = []
+        self.drained = 0
+        self._dropped = 0
+
+    def start(self) -> None:
+        if self._processes:
+            return
+        self._stop_event = self._ctx.Event()
+        for (offset, shard), seed in zip(self._shards, self._seeds):
+            ring = SharedRing(self.ring_capacity)
+            process = self._ctx.Process(
+                target=_run_shard,
+                args=(shard, offset, ring.name, self.ring_capacity, self.interval, seed, self._stop_event),
+                daemon=True
+            )
+            process.start()
+            self._rings.append(ring)
+            self._processes.append(process)
+
+    def drain(self) -> np.ndarray:
+        batches = [ring.pop_all() for ring in self._rings]
+        records = np.concatenate(batches) if batches else np.empty(0, dtype=RECORD_DTYPE)
+        self.drained += len(records)
+        return records
+
+    def readings(self, records: np.ndarray) -> Iterator[Reading]:
+        for timestamp, sensor, value in records.tolist():
+            yield Reading(self.sensor_ids[sensor], value, self.units[sensor], timestamp)
+
+    def stop(self) -> np.ndarray:
+        if not self._processes:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        remaining = self.drain()
+        for ring in self._rings:
+            self._dropped += ring.dropped
+            ring.close()
+        self._rings = []
+        self._processes = []
+        return remaining
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'workers': len(self._processes),
+            'drained': self.drained,
+            'pending': sum(len(ring) for ring in self._rings),
+            'dropped': self._dropped + sum(ring.dropped for ring in self._rings)
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
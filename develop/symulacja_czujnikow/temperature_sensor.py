@@ -1,7 +1,7 @@
 
 import numpy as np
 
-from datetime import datetime
+from typing import Optional
 
 from symulacja_czujnikow.base_sensor import BaseSensor
 class TemperatureSensor(BaseSensor):
@@ -10,18 +10,22 @@ class TemperatureSensor(BaseSensor):
                  min_value: float = -20.0,
                  max_value: float = 50.0,
                  unit: str = "°C",
-                 frequency: float = 1.0):
-        super().__init__(sensor_id, name, unit, min_value, max_value, frequency)
+                 frequency: float = 1.0,
+                 history_size: int = 1000,
+                 clock=None,
+                 seed: Optional[int] = None):
+        super().__init__(sensor_id, name, unit, min_value, max_value, frequency, history_size,
+                         clock, seed)
         self._trend = 0
 
     def read_value(self) -> float:
         if not self._is_active:
             raise ValueError("Sensor is not active")
 
-        base_temp = np.random.normal(loc=20, scale=5)
-        hour = datetime.now().hour
+        base_temp = self._rng.normal(loc=20, scale=5)
+        hour = self._clock.now().hour
         daily_variation = 10 * np.sin(2 * np.pi * hour / 24)
-        self._trend += np.random.normal(scale=0.1)
+        self._trend += self._rng.normal(scale=0.1)
         self._trend = np.clip(self._trend, -5, 5)
 
         temp = (base_temp + daily_variation + self._trend) * self._calibration_factor
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from symulacja_czujnikow.clock import VirtualClock
+from symulacja_czujnikow.light_sensor import LightSensor
+from symulacja_czujnikow.pressure_sensor import PressureSensor
+from symulacja_czujnikow.sensor_bank import SensorBank
+from symulacja_czujnikow.fast_forward import fast_forward
+
+
+def test_virtual_clock_drives_daily_pattern():
+    clock = VirtualClock(datetime(2025, 6, 1, 2, 0))
+    sensor = LightSensor(clock=clock, seed=1)
+    night = [sensor.read_value() for _ in range(50)]
+    clock.advance(10 * 3600)
+    day = [sensor.read_value() for _ in range(50)]
+    assert max(night) < min(day)
+
+
+def test_seeded_sensors_are_reproducible():
+    first = PressureSensor(seed=42)
+    second = PressureSensor(seed=42)
+    assert [first.read_value() for _ in range(10)] == [second.read_value() for _ in range(10)]
+
+
+def test_fast_forward_generates_whole_range():
+    start = datetime(2025, 6, 1)
+    rows = []
+    sink = lambda sensor_id, timestamp, value, unit: rows.append((timestamp, sensor_id, value))
+    stats = fast_forward([PressureSensor("p_1"), LightSensor("l_1")], start,
+                         start + timedelta(hours=1), step=60, sink=sink, seed=7)
+    assert stats['readings'] == 122
+    assert len(rows) == 122
+    assert rows[-1][0] == start + timedelta(hours=1)
+    assert stats['readings_per_second'] > 0
+
+    again = []
+    fast_forward([PressureSensor("p_1"), LightSensor("l_1")], start, start + timedelta(hours=1),
+                 step=60, sink=lambda *args: again.append((args[1], args[0], args[2])), seed=7)
+    assert again == rows
+
+
+def test_fast_forward_with_bank():
+    start = datetime(2025, 6, 1)
+    bank = SensorBank([PressureSensor(f"p_{i}") for i in range(10)])
+    stats = fast_forward(bank, start, start + timedelta(minutes=10), step=1, seed=3)
+    assert stats['readings'] == 601 * 10
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from symulacja_czujnikow.humidity_sensor import HumiditySensor
+from symulacja_czujnikow.reading import (
+    Reading, READING_DTYPE, reading_array, readings_to_array, readings_from_array
+)
+
+LONG_ID = "building_A/floor_3/room_301/temperature_north"
+LONG_UNIT = "readings/s"
+
+
+def test_reading_dict_round_trip():
+    reading = Reading("temp_1", 21.5, "°C", datetime(2025, 6, 10, 12, 30, 0, 123456).timestamp())
+    data = reading.to_dict()
+    assert data['timestamp'] == "2025-06-10T12:30:00.123456"
+    assert Reading.from_dict(data) == reading
+
+
+def test_reading_array_round_trip():
+    readings = [Reading(f"s_{i}", float(i), "hPa", 1000.0 + i) for i in range(5)]
+    batch = readings_to_array(readings)
+    assert batch.dtype == READING_DTYPE
+    assert batch['value'].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert readings_from_array(batch) == readings
+
+
+def test_reading_array_keeps_long_labels():
+    readings = [Reading(LONG_ID, 1.0, LONG_UNIT, 1000.0), Reading("t", 2.0, "C", 1001.0)]
+    assert readings_from_array(readings_to_array(readings)) == readings
+    batch = reading_array(LONG_ID, [1.0, 2.0], LONG_UNIT, [1000.0, 1001.0])
+    assert batch['sensor_id'].tolist() == [LONG_ID, LONG_ID]
+    assert batch['unit'].tolist() == [LONG_UNIT, LONG_UNIT]
+
+
+def test_sensor_read_returns_reading():
+    sensor = HumiditySensor("hum_7")
+    reading = sensor.read()
+    assert isinstance(reading, Reading)
+    assert reading.sensor_id == "hum_7"
+    assert reading.unit == "%"
+    assert sensor.get_history(1)[1][0] == reading.value
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from symulacja_czujnikow.reading_history import ReadingHistory
+from symulacja_czujnikow.humidity_sensor import HumiditySensor
+from symulacja_czujnikow.sensor_bank import SensorBank
+
+
+def test_history_keeps_only_capacity_entries():
+    history = ReadingHistory(capacity=5)
+    for i in range(12):
+        history.append(float(i), i * 10.0)
+    timestamps, values = history.view()
+    assert len(history) == 5
+    assert timestamps.tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert values.tolist() == [70.0, 80.0, 90.0, 100.0, 110.0]
+
+
+def test_history_extend_matches_append():
+    appended = ReadingHistory(capacity=5)
+    extended = ReadingHistory(capacity=5)
+    for i in range(3):
+        appended.append(float(i), i * 10.0)
+    extended.extend([0.0, 1.0, 2.0], [0.0, 10.0, 20.0])
+    for chunk in ([3.0, 4.0, 5.0, 6.0], list(range(7, 20))):
+        for t in chunk:
+            appended.append(float(t), t * 10.0)
+        extended.extend(chunk, [t * 10.0 for t in chunk])
+        assert extended.view()[0].tolist() == appended.view()[0].tolist()
+        assert extended.view()[1].tolist() == appended.view()[1].tolist()
+    assert len(extended) == 5
+
+
+def test_history_view_is_read_only_and_not_copied():
+    history = ReadingHistory(capacity=4)
+    for i in range(6):
+        history.append(float(i), float(i))
+    timestamps, values = history.view(3)
+    assert timestamps.tolist() == [3.0, 4.0, 5.0]
+    assert np.shares_memory(timestamps, history._timestamps)
+    with pytest.raises(ValueError):
+        values[0] = 1.0
+
+
+def test_sensor_history_memory_is_bounded():
+    sensor = HumiditySensor(history_size=100)
+    nbytes = sensor._history.nbytes
+    for _ in range(1000):
+        sensor.get_reading()
+    timestamps, values = sensor.get_history(limit=500)
+    assert len(values) == 100
+    assert sensor._history.nbytes == nbytes
+    assert np.all(np.diff(timestamps) >= 0)
+
+
+def test_sensor_bank_shared_history():
+    bank = SensorBank([HumiditySensor(f"h_{i}") for i in range(3)], history_size=10)
+    for _ in range(15):
+        bank.read_values()
+    timestamps, values = bank.get_history(limit=4)
+    assert timestamps.shape == (4,)
+    assert values.shape == (4, 3)
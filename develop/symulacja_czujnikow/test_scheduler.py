@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from symulacja_czujnikow.clock import VirtualClock
+from symulacja_czujnikow.light_sensor import LightSensor
+from symulacja_czujnikow.pressure_sensor import PressureSensor
+from symulacja_czujnikow.scheduler import SensorScheduler
+
+
+def test_scheduler_fires_each_sensor_at_its_frequency():
+    clock = VirtualClock(datetime(2025, 6, 1))
+    fast = PressureSensor("p_1", frequency=10.0)
+    slow = LightSensor("l_1", frequency=0.1)
+    counts = {"p_1": 0, "l_1": 0}
+
+    def on_due(sensor, deadline):
+        counts[sensor.sensor_id] += 1
+
+    scheduler = SensorScheduler([fast, slow], clock=clock)
+    scheduler.run(on_due, until=clock.time() + 100)
+    assert counts == {"p_1": 1001, "l_1": 11}
+    assert scheduler.missed == 0
+
+
+def test_scheduler_has_no_drift():
+    clock = VirtualClock(datetime(2025, 6, 1))
+    start = clock.time()
+    deadlines = []
+
+    def on_due(sensor, deadline):
+        deadlines.append(deadline)
+        clock.advance(0.3)
+
+    SensorScheduler([PressureSensor(frequency=1.0)], clock=clock).run(on_due, until=start + 10)
+    assert [round(d - start, 6) for d in deadlines] == list(range(11))
+
+
+def test_scheduler_counts_missed_deadlines():
+    clock = VirtualClock(datetime(2025, 6, 1))
+    start = clock.time()
+
+    def on_due(sensor, deadline):
+        clock.advance(3.5)
+
+    scheduler = SensorScheduler([PressureSensor(frequency=1.0)], clock=clock)
+    scheduler.run(on_due, until=start + 20)
+    assert scheduler.missed > 0
+    assert scheduler.fired + scheduler.missed >= 20
+
+
+def test_scheduler_skips_inactive_sensors():
+    clock = VirtualClock(datetime(2025, 6, 1))
+    sensor = PressureSensor(frequency=1.0)
+    sensor.stop()
+    fired = []
+    SensorScheduler([sensor], clock=clock).run(lambda s, d: fired.append(d), until=clock.time() + 5)
+    assert fired == []
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from datetime import datetime
+
+from symulacja_czujnikow.temperature_sensor import TemperatureSensor
+from symulacja_czujnikow.humidity_sensor import HumiditySensor
+from symulacja_czujnikow.pressure_sensor import PressureSensor
+from symulacja_czujnikow.light_sensor import LightSensor
+from symulacja_czujnikow.sensor_bank import SensorBank
+
+
+def test_bank_values_within_bounds():
+    sensors = [PressureSensor(f"p_{i}", min_value=1000.0, max_value=1020.0) for i in range(50)]
+    bank = SensorBank(sensors)
+    for _ in range(20):
+        values = bank.read_values()
+        assert np.all((values >= 1000.0) & (values <= 1020.0))
+
+
+def test_bank_matches_scalar_distribution():
+    now = datetime.now()
+    scalar = HumiditySensor()
+    scalar_values = np.array([scalar.read_value() for _ in range(5000)])
+    bank = SensorBank([HumiditySensor(f"h_{i}") for i in range(5000)])
+    bank_values = bank.read_values(now)
+    assert bank_values.mean() == pytest.approx(scalar_values.mean(), abs=0.5)
+    assert bank_values.std() == pytest.approx(scalar_values.std(), abs=0.5)
+
+
+def test_bank_inactive_sensor_yields_nan():
+    bank = SensorBank([TemperatureSensor("t_1"), LightSensor("l_1")])
+    bank.stop(bank.index_of("l_1"))
+    values = bank.read_values()
+    assert not np.isnan(values[0])
+    assert np.isnan(values[1])
+
+
+def test_bank_reads_only_due_sensors():
+    bank = SensorBank([TemperatureSensor("t_1"), TemperatureSensor("t_2")], seed=1)
+    trend = bank.trend.copy()
+    values = bank.read_values(due=np.array([True, False]))
+    assert not np.isnan(values[0])
+    assert np.isnan(values[1])
+    assert bank.trend[1] == trend[1]
+    assert np.isnan(bank.last_values[1])
+
+
+def test_bank_from_configs_round_trip():
+    sensors = [TemperatureSensor("t_1"), HumiditySensor("h_1"), PressureSensor("p_1"), LightSensor("l_1")]
+    sensors[2].calibrate(1.01)
+    configs = [s.to_dict() for s in sensors]
+    bank = SensorBank.from_configs(configs)
+    assert bank.sensor_ids == ["t_1", "h_1", "p_1", "l_1"]
+    assert bank.to_configs() == configs
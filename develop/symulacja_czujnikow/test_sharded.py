@@ -0,0 +1,78 @@
+import time
+
+import numpy as np
+
+from symulacja_czujnikow.pressure_sensor import PressureSensor
+from symulacja_czujnikow.humidity_sensor import HumiditySensor
+from symulacja_czujnikow.sharded import SharedRing, ShardedSimulation, RECORD_DTYPE
+
+
+def _records(start, n):
+    records = np.zeros(n, dtype=RECORD_DTYPE)
+    records['sensor'] = np.arange(start, start + n)
+    return records
+
+
+def test_shared_ring_wraps_around():
+    ring = SharedRing(capacity=8)
+    try:
+        assert ring.push(_records(0, 6))
+        assert ring.pop_all()['sensor'].tolist() == list(range(6))
+        assert ring.push(_records(6, 5))
+        assert ring.pop_all()['sensor'].tolist() == list(range(6, 11))
+    finally:
+        ring.close()
+
+
+def test_shared_ring_counts_dropped_records():
+    ring = SharedRing(capacity=4)
+    try:
+        assert ring.push(_records(0, 3))
+        assert not ring.push(_records(3, 2))
+        assert ring.dropped == 2
+        assert len(ring) == 3
+    finally:
+        ring.close()
+
+
+def test_sharded_simulation_reads_every_sensor():
+    configs = [PressureSensor(f"p_{i}", frequency=20.0).to_dict() for i in range(6)]
+    configs += [HumiditySensor(f"h_{i}", frequency=20.0).to_dict() for i in range(6)]
+    sim = ShardedSimulation(configs, workers=2, seed=1)
+    sim.start()
+    try:
+        deadline = time.time() + 30
+        seen = set()
+        while len(seen) < len(configs) and time.time() < deadline:
+            records = sim.drain()
+            seen.update(reading.sensor_id for reading in sim.readings(records))
+            time.sleep(0.05)
+    finally:
+        sim.stop()
+    assert seen == {c['sensor_id'] for c in configs}
+    assert sim.stats()['workers'] == 0
+
+
+def test_sharded_simulation_uses_each_sensor_frequency():
+    configs = [PressureSensor("fast", frequency=20.0).to_dict(),
+               HumiditySensor("slow", frequency=2.0).to_dict()]
+    sim = ShardedSimulation(configs, workers=1, seed=1)
+    sim.start()
+    try:
+        deadline = time.time() + 30
+        batches = []
+        while time.time() < deadline:
+            batches.append(sim.drain())
+            if np.count_nonzero(np.concatenate(batches)['sensor'] == 1) >= 3:
+                break
+            time.sleep(0.05)
+    finally:
+        sim.stop()
+    records = np.concatenate(batches)
+    fast = records['timestamp'][records['sensor'] == 0]
+    slow = records['timestamp'][records['sensor'] == 1]
+    assert len(slow) >= 3
+    assert len(fast) > 4 * len(slow)
+    # Terminy kolejnych odczytów odległe o okres czujnika, bez dryfu
+    assert np.diff(fast).min() >= 0.05 - 1e-6
+    assert np.diff(slow).min() >= 0.5 - 1e-6